@@ -27,6 +27,16 @@ async_session = async_sessionmaker(
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+
+
+def _create_missing_indexes(sync_conn):
+    """
+    create_all은 이미 존재하는 테이블의 새 인덱스를 만들지 않으므로 따로 생성
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, Any]:
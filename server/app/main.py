@@ -2,10 +2,16 @@ import asyncio
 import os
 from contextlib import asynccontextmanager
 
-from app.db import get_db, init_db
+from app.db import async_session, get_db, init_db
 from app.middleware.auth import AuthMiddleware
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.exception_handler import ExceptionHandlerMiddleware
 from app.router import router
+from app.services.search import SearchService
+from app.util.backoff import host_backoff, url_backoff
+from app.util.fetcher import url_fetcher
+from app.util.metadata_cache import redirect_cache, url_metadata_cache
+from app.util.youtube import youtube_client
 from config import get_settings
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.responses import FileResponse
@@ -17,7 +23,12 @@ from sqlalchemy.sql import text
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    if get_settings().SEARCH_BACKFILL_ON_STARTUP:
+        async with async_session() as db:
+            await SearchService.backfill_documents(db)
     yield
+    await url_fetcher.aclose()
+    await youtube_client.aclose()
 
 
 app = FastAPI(title="tagify backend server", lifespan=lifespan)
@@ -32,6 +43,7 @@ app.include_router(router=router)
 
 app.add_middleware(AuthMiddleware, settings=get_settings())
 app.add_middleware(ExceptionHandlerMiddleware)
+app.add_middleware(CompressionMiddleware, settings=get_settings())
 # app.add_middleware(QueryTimeMiddleware)
 
 @app.get("/")
@@ -48,6 +60,27 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
+@app.get("/health/fetcher")
+async def fetcher_stats():
+    """
+    외부 URL 조회 connection 재사용률, host별 대기 시간, DNS 캐시 상태 (워커 프로세스 기준)
+    """
+    return url_fetcher.stats()
+
+
+@app.get("/health/cache")
+async def cache_stats():
+    """
+    링크 분석 결과 캐시 상태 (워커 프로세스 기준)
+    """
+    return {
+        "url_metadata": url_metadata_cache.stats(),
+        "redirect": redirect_cache.stats(),
+        "url_backoff": url_backoff.stats(),
+        "host_backoff": host_backoff.stats(),
+    }
+
+
 HTML_MEDIA_TYPE = "text/html"
 
 @app.get("/home", response_class=FileResponse)
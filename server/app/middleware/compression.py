@@ -0,0 +1,247 @@
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from config import Settings
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 미설치 시 gzip만 사용
+    brotli = None
+
+# 동적 응답용 압축 레벨 (압축률보다 CPU 시간 우선)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+# 서버 선호 순서 (q값이 같으면 앞쪽 우선), 설치된 라이브러리만 사용
+ENCODERS = {
+    name: encoder
+    for name, encoder, available in (
+        ("br", _BrotliEncoder, brotli is not None),
+        ("gzip", _GzipEncoder, True),
+    )
+    if available
+}
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding(q값 포함)에서 사용할 인코딩 선택, 없으면 None
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name.strip()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(name, wildcard), -index, name)
+        for index, name in enumerate(ENCODERS)
+    ]
+    quality, _, name = max(candidates)
+    return name if quality > 0 else None
+
+
+class CompressedCache:
+    """
+    (strong ETag, 인코딩) -> 압축된 body LRU 캐시
+    같은 ETag 응답이 다시 나가면 압축을 다시 하지 않고 저장된 bytes 재사용
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        key = (etag, encoding)
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+
+        key = (etag, encoding)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """
+    gzip/br 응답 압축 ASGI middleware
+    minimum_size 미만인 단일 body는 그대로, 스트리밍(chunked) 응답은 chunk 단위로 압축해 flush
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE
+        self.cache = CompressedCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.start_message is not None:
+            await self._send_first_body(message)
+        elif self.passthrough:
+            await self.downstream(message)
+        else:
+            more_body = message.get("more_body", False)
+            body = self.encoder.compress(message.get("body", b""))
+            body += self.encoder.flush() if more_body else self.encoder.finish()
+            await self.downstream(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+
+    async def _send_first_body(self, message: Message) -> None:
+        start, self.start_message = self.start_message, None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(scope=start)
+
+        if start["status"] == 304 and "etag" in headers:
+            # 클라이언트가 가진 건 압축본일 수 있으므로 200 응답과 같은 weak ETag로 맞춤
+            headers["ETag"] = self._weak(headers["etag"])
+
+        if not self._compressible(start, headers) or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            self.passthrough = True
+            await self.downstream(start)
+            await self.downstream(message)
+            return
+
+        etag = headers.get("etag")
+        cacheable = etag is not None and not etag.startswith("W/")
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if etag is not None:
+            # 압축본은 byte가 달라지므로 weak ETag로 변경 (If-None-Match는 weak 비교)
+            headers["ETag"] = self._weak(etag)
+
+        if not more_body:
+            compressed = (
+                self.middleware.cache.get(etag, self.encoding) if cacheable else None
+            )
+            if compressed is None:
+                encoder = ENCODERS[self.encoding]()
+                compressed = encoder.compress(body) + encoder.finish()
+                if cacheable:
+                    self.middleware.cache.put(etag, self.encoding, compressed)
+
+            headers["Content-Length"] = str(len(compressed))
+            await self.downstream(start)
+            await self.downstream({"type": "http.response.body", "body": compressed})
+            return
+
+        del headers["Content-Length"]
+        self.encoder = ENCODERS[self.encoding]()
+        await self.downstream(start)
+        await self.downstream(
+            {
+                "type": "http.response.body",
+                "body": self.encoder.compress(body) + self.encoder.flush(),
+                "more_body": True,
+            }
+        )
+
+    @staticmethod
+    def _weak(etag: str) -> str:
+        return etag if etag.startswith("W/") else f"W/{etag}"
+
+    @staticmethod
+    def _compressible(start: Message, headers: MutableHeaders) -> bool:
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
@@ -1,8 +1,12 @@
 from app.models.article import Article
 from app.models.base import Base
 from app.models.comment import Comment
+from app.models.content_search import ContentSearchDocument
 from app.models.content_tag import content_tag_association
+from app.models.library_change import LibraryChange
+from app.models.library_version import LibraryVersion
 from app.models.post_metadata import PostMetadata
 from app.models.tag import Tag
+from app.models.url_metadata import UrlMetadata
 from app.models.user import User
 from app.models.video_metadata import VideoMetadata
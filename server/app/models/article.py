@@ -2,12 +2,30 @@ from datetime import datetime, timezone
 
 from app.models.article_tag import article_tag_association
 from app.models.base import Base
-from sqlalchemy import BIGINT, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    BIGINT,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # 커뮤니티 피드 keyset pagination (정렬 컬럼, id) 용
+        Index("idx_articles_created_at_id", "created_at", "id"),
+        Index("idx_articles_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(BIGINT, primary_key=True, index=True)
     title = Column(String, nullable=False, default="")
@@ -16,6 +34,25 @@ class Article(Base):
     up_count = Column(Integer, default=0)
     down_count = Column(Integer, default=0)  # 다운로드 횟수
 
+    # 카운트 피드 cursor 키: nullable 컬럼이라 NULL은 0으로 정렬 (NULL은 tuple 비교에서 빠짐)
+    @hybrid_property
+    def up_count_or_zero(self) -> int:
+        return self.up_count or 0
+
+    @up_count_or_zero.inplace.expression
+    @classmethod
+    def _up_count_or_zero_expression(cls):
+        return _or_zero(cls.up_count).label("up_count_or_zero")
+
+    @hybrid_property
+    def down_count_or_zero(self) -> int:
+        return self.down_count or 0
+
+    @down_count_or_zero.inplace.expression
+    @classmethod
+    def _down_count_or_zero_expression(cls):
+        return _or_zero(cls.down_count).label("down_count_or_zero")
+
     user_id = Column(BIGINT, ForeignKey("users.id", ondelete="CASCADE"))
 
     created_at = Column(
@@ -42,3 +79,33 @@ class Article(Base):
         back_populates="articles",
         lazy="noload",
     )
+
+
+def _or_zero(column):
+    # 식 인덱스와 같은 SQL이 되도록 0은 bind 없이 literal로 작성
+    return func.coalesce(column, literal_column("0", Integer))
+
+
+def article_document():
+    """
+    게시글 검색 문서 tsvector (title > body 가중치)
+    title/body가 같은 row에 있어 별도 테이블 없이 식 인덱스로 색인
+    인덱스를 타려면 쿼리에서도 이 식을 그대로 사용해야 하므로 상수는 bind 없이 literal로 작성
+    """
+    config = text("'simple'::regconfig")
+
+    def weighted(column, weight: str):
+        return func.setweight(
+            func.to_tsvector(config, func.coalesce(column, text("''"))),
+            text(f"'{weight}'"),
+        )
+
+    return weighted(Article.title, "A").op("||", return_type=TSVECTOR)(
+        weighted(Article.body, "B")
+    )
+
+
+Index("idx_articles_document", article_document(), postgresql_using="gin")
+# 커뮤니티 피드 keyset pagination (카운트, id) 용, 쿼리의 cursor 키와 같은 식
+Index("idx_articles_down_count_or_zero_id", _or_zero(Article.down_count), Article.id)
+Index("idx_articles_up_count_or_zero_id", _or_zero(Article.up_count), Article.id)
@@ -1,3 +1,11 @@
+from sqlalchemy import DDL, event
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# trigram 인덱스(gin_trgm_ops)에 필요한 확장, 테이블/인덱스 생성 전에 설치
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
@@ -3,7 +3,17 @@ from datetime import datetime, timezone
 
 from app.models.base import Base
 from app.models.content_tag import content_tag_association
-from sqlalchemy import BIGINT, Boolean, Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import (
+    BIGINT,
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 
@@ -14,6 +24,23 @@ class ContentTypeEnum(str, enum.Enum):
 
 class Content(Base):
     __tablename__ = "contents"
+    __table_args__ = (
+        # 유저 라이브러리 keyset pagination (created_at, id) 용
+        Index("idx_contents_user_created_at_id", "user_id", "created_at", "id"),
+        # 검색(trgm 유사도, ILIKE 부분 문자열)용 trigram 인덱스
+        Index(
+            "idx_contents_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_contents_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(BIGINT, primary_key=True, index=True)
     url = Column(String, index=True, nullable=False)
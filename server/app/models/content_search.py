@@ -0,0 +1,24 @@
+from app.models.base import Base
+from sqlalchemy import BIGINT, Column, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+class ContentSearchDocument(Base):
+    __tablename__ = "content_search_documents"
+    __table_args__ = (
+        Index(
+            "idx_content_search_documents_document",
+            "document",
+            postgresql_using="gin",
+        ),
+    )
+
+    # 콘텐츠 title, description, 태그 이름, post body로 만든 검색 문서
+    # 태그/본문이 다른 테이블에 있어 generated column 대신 쓰기 시점에 갱신
+    content_id = Column(
+        BIGINT, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        BIGINT, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    document = Column(TSVECTOR, nullable=False)
@@ -0,0 +1,26 @@
+import enum
+
+from app.models.base import Base
+from sqlalchemy import BIGINT, Boolean, Column, Enum, ForeignKey, Index
+
+
+class LibraryEntityEnum(str, enum.Enum):
+    CONTENT = "content"
+    TAG = "tag"
+
+
+class LibraryChange(Base):
+    __tablename__ = "library_changes"
+    __table_args__ = (
+        # delta sync: 유저별 특정 버전 이후 변경 이력 조회용
+        Index("idx_library_changes_user_version", "user_id", "version"),
+    )
+
+    id = Column(BIGINT, primary_key=True)
+    user_id = Column(BIGINT, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # 변경이 반영된 library_versions.version
+    version = Column(BIGINT, nullable=False)
+    entity = Column(Enum(LibraryEntityEnum), nullable=False)
+    # 삭제된 row도 기록하므로 FK 없이 id만 보관
+    entity_id = Column(BIGINT, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
@@ -0,0 +1,12 @@
+from app.models.base import Base
+from sqlalchemy import BIGINT, Column, ForeignKey
+
+
+class LibraryVersion(Base):
+    __tablename__ = "library_versions"
+
+    # 유저 라이브러리(콘텐츠, 태그, 북마크)가 바뀔 때마다 1씩 증가
+    user_id = Column(
+        BIGINT, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(BIGINT, nullable=False, default=0)
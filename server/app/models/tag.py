@@ -1,13 +1,31 @@
 from app.models.article_tag import article_tag_association
 from app.models.base import Base
 from app.models.content_tag import content_tag_association
-from sqlalchemy import BIGINT, Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    BIGINT,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 
 class Tag(Base):
     __tablename__ = "tags"
-    __table_args__ = (UniqueConstraint("user_id", "tagname", name="uq_user_tagname"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "tagname", name="uq_user_tagname"),
+        # 검색(trgm 유사도, ILIKE 부분 문자열)용 trigram 인덱스
+        Index(
+            "idx_tags_tagname_trgm",
+            "tagname",
+            postgresql_using="gin",
+            postgresql_ops={"tagname": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tagname = Column(String, nullable=False)
@@ -27,3 +45,12 @@ class Tag(Base):
         back_populates="tags",
         lazy="noload",
     )
+
+
+# 태그 자동완성(prefix 범위 검색)용, 유저별 lower(tagname) 바이트 순서 정렬
+Index(
+    "idx_tags_user_lower_tagname",
+    Tag.user_id,
+    func.lower(Tag.tagname).label("tagname_lower"),
+    postgresql_ops={"tagname_lower": "text_pattern_ops"},
+)
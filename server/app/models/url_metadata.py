@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from app.models.base import Base
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class UrlMetadata(Base):
+    __tablename__ = "url_metadata"
+
+    # 링크 분석 결과 공유 캐시, 워커/배포와 상관없이 유지
+    # url_hash: 캐시 키(정규화 URL, youtube:<video id>)의 sha256 hex
+    url_hash = Column(String(64), primary_key=True)
+    url = Column(String, nullable=False)
+    data = Column(JSONB, nullable=False)
+
+    # 재검증(conditional GET)용 응답 validator
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+
+    fetched_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from app.db import get_db
 from app.schemas.article import (
     AllArticlesLimitResponse,
@@ -9,12 +11,14 @@ from app.schemas.article import (
     ArticleDownloadResponse,
     ArticleEdit,
     ArticleEditResponse,
-    ArticleModel,
+    ArticleSearchResponse,
     ArticleTagResponse,
     TagArticleResponse,
 )
 from app.services.article import ArticleService
-from fastapi import APIRouter, Depends
+from app.util.pagination import next_cursor
+from app.util.serializer import article_item, json_response
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/articles", tags=["articles"])
@@ -53,86 +57,50 @@ async def delete_article(
 async def get_all_user_articles_limit(
     user_id: int,
     limit: int,
-    offset: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
     articles = await ArticleService.get_all_user_articles_limit(
-        user_id, limit, offset, db
+        user_id, limit, offset, db, cursor
     )
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": next_cursor(articles, limit, ArticleService.NEWEST_ORDER),
+        }
     )
 
 
 @router.get("/all")
 async def get_all_articles_limit(
     limit: int,
-    offset: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
-    articles = await ArticleService.get_all_articles_limit(limit, offset, db)
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    articles = await ArticleService.get_all_articles_limit(limit, offset, db, cursor)
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": next_cursor(articles, limit, ArticleService.NEWEST_ORDER),
+        }
     )
 
 
 @router.get("/popular")
 async def get_popular_articles(
     limit: int,
-    offset: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
-    articles = await ArticleService.get_popular_articles(limit, offset, db)
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    articles = await ArticleService.get_popular_articles(limit, offset, db, cursor)
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": next_cursor(articles, limit, ArticleService.POPULAR_ORDER),
+        }
     )
 
 
@@ -143,80 +111,43 @@ async def get_hot_articles(
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
     articles = await ArticleService.get_hot_articles(limit, offset, db)
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": None,
+        }
     )
 
 
 @router.get("/upvote")
 async def get_hot_articles(
     limit: int,
-    offset: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
-    articles = await ArticleService.get_upvote_articles(limit, offset, db)
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    articles = await ArticleService.get_upvote_articles(limit, offset, db, cursor)
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": next_cursor(articles, limit, ArticleService.UPVOTE_ORDER),
+        }
     )
 
 
 @router.get("/newest")
 async def get_newest_articles(
     limit: int,
-    offset: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
-    articles = await ArticleService.get_newest_articles(limit, offset, db)
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    articles = await ArticleService.get_newest_articles(limit, offset, db, cursor)
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": next_cursor(articles, limit, ArticleService.NEWEST_ORDER),
+        }
     )
 
 
@@ -227,24 +158,34 @@ async def get_random_articles(
     db: AsyncSession = Depends(get_db),
 ) -> AllArticlesLimitResponse:
     articles = await ArticleService.get_random_articles(limit, offset, db)
-    return AllArticlesLimitResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": None,
+        }
+    )
+
+
+@router.get("/search")
+async def search_articles(
+    q: str = Query(min_length=1),
+    tags: List[str] = Query([]),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    facets: int = Query(20, ge=0, le=100),
+    db: AsyncSession = Depends(get_db),
+) -> ArticleSearchResponse:
+    """
+    title/body 전문 검색(websearch 문법), ?tags=a&tags=b 이면 태그를 모두 가진 글만
+    facets: 매칭된 글 전체 기준 태그별 개수 (태그 필터 drill-down용)
+    """
+    result = await ArticleService.search_articles(q, tags, limit, offset, db, facets)
+    return json_response(
+        {
+            "total": result["total"],
+            "facets": result["facets"],
+            "articles": [article_item(article) for article in result["articles"]],
+        }
     )
 
 
@@ -317,26 +258,16 @@ async def get_random_tags(
 async def get_articles_by_tag(
     tag_id: int,
     limit: int,
-    offset: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> TagArticleResponse:
-    articles = await ArticleService.get_articles_by_tag_limit(tag_id, limit, offset, db)
-    return TagArticleResponse(
-        articles=[
-            ArticleModel(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                encoded_content=article.encoded_content,
-                up_count=article.up_count,
-                down_count=article.down_count,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                user_id=article.user.id,
-                user_name=article.user.username,
-                user_profile_image=article.user.profile_image,
-                tags=[tag.tagname for tag in article.tags],
-            )
-            for article in articles
-        ]
+    articles = await ArticleService.get_articles_by_tag_limit(
+        tag_id, limit, offset, db, cursor
+    )
+    return json_response(
+        {
+            "articles": [article_item(article) for article in articles],
+            "next_cursor": next_cursor(articles, limit, ArticleService.TAG_ORDER),
+        }
     )
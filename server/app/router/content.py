@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Union
 
 from app.db import get_db
 from app.schemas.common import (
@@ -8,27 +8,41 @@ from app.schemas.common import (
 )
 from app.schemas.content import (
     ContentAnalyze,
+    ContentAnalyzeBatch,
+    ContentAnalyzeBatchResponse,
     ContentAnalyzeResponse,
     ContentPost,
     ContentPostResponse,
     ContentPutRequest,
     ContentPutResponse,
+    LibrarySyncResponse,
     SearchContentResponse,
     TagResponse,
     UserBookmark,
+    UserBookmarkPageResponse,
     UserBookmarkResponse,
     UserContents,
+    UserContentsPageResponse,
     UserContentsResponse,
 )
 from app.services.content import ContentService
+from app.services.library import LibraryService
 from app.services.post import PostService
+from app.services.search import SearchMode
 from app.services.video import VideoService
+from app.util.etag import etag_headers, library_etag
+from app.util.pagination import next_cursor
+from app.util.projection import ContentView
+from app.util.serializer import content_item, json_response
+from app.util.streaming import ndjson_response, wants_ndjson
 from config import get_settings
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/contents", tags=["contents"])
 
+MAX_PAGE_SIZE = 200
+
 
 @router.get("/endpoint_test")
 def endpoint_test():
@@ -49,6 +63,19 @@ async def analyze(
     raise HTTPException(status_code=400, detail="Invalid content type")
 
 
+@router.post("/analyze/batch")
+async def analyze_batch(
+    request: ContentAnalyzeBatch,
+    db: AsyncSession = Depends(get_db),
+    settings=Depends(get_settings),
+) -> ContentAnalyzeBatchResponse:
+    """
+    여러 URL 한 번에 분석, 입력 순서대로 URL별 result 또는 error 반환
+    """
+    results = await ContentService.analyze_contents(request, db, settings)
+    return json_response({"results": results})
+
+
 @router.post("/save")
 async def save(
     content_type: str,
@@ -81,99 +108,154 @@ async def delete(
 @router.get("/user/{user_id}/all")
 async def contents(
     user_id: int,
+    http_request: Request,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    view: ContentView = "full",
+    etag: str = Depends(library_etag),
     db: AsyncSession = Depends(get_db),
-) -> List[UserContentsResponse]:
+) -> Union[List[UserContentsResponse], UserContentsPageResponse]:
+    """
+    limit이 없으면 기존처럼 전체 목록(list) 반환 (구버전 앱 호환)
+    limit이 있으면 (created_at, id) keyset pagination 결과와 next_cursor 반환
+    ?stream=1 또는 Accept: application/x-ndjson이면 전체 목록을 NDJSON으로 스트리밍
+    view=summary이면 body 없이 목록용 필드만 반환 (body는 GET /contents/{id})
+    If-None-Match가 현재 라이브러리 ETag와 같으면 304 반환
+    """
     request = UserContents(id=user_id)
-    contents = await ContentService.get_user_all_contents(request, db)
-    return [
-        UserContentsResponse(
-            id=content.id,
-            title=content.title,
-            url=content.url,
-            thumbnail=content.thumbnail,
-            favicon=content.favicon,
-            description=content.description,
-            bookmark=content.bookmark,
-            **(
-                {"video_length": content.video_metadata.video_length}
-                if getattr(content, "video_metadata", None)
-                else {}
+    if wants_ndjson(http_request, stream):
+        return ndjson_response(
+            lambda session: ContentService.stream_user_all_contents(
+                request, session, view
             ),
-            **(
-                {"body": content.post_metadata.body}
-                if getattr(content, "post_metadata", None)
-                else {}
-            ),
-            tags=([tag.tagname for tag in content.tags] if content.tags else []),
-            created_at=content.created_at,
-            type="video" if getattr(content, "video_metadata", None) else "post",
+            lambda content: content_item(content, UserContentsResponse, view),
+            etag_headers(etag),
         )
-        for content in contents
-    ]
+
+    contents = await ContentService.get_user_all_contents(
+        request, db, limit, cursor, view
+    )
+    items = [content_item(content, UserContentsResponse, view) for content in contents]
+    if limit is None:
+        return json_response(items, etag_headers(etag))
+
+    return json_response(
+        {
+            "contents": items,
+            "next_cursor": next_cursor(contents, limit, ContentService.LIBRARY_ORDER),
+        },
+        etag_headers(etag),
+    )
 
 
 @router.get("/user/{user_id}/sub")
 async def contents(
     user_id: int,
     content_type: str,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: ContentView = "full",
+    etag: str = Depends(library_etag),
     db: AsyncSession = Depends(get_db),
-) -> List[UserContentsResponse]:
+) -> Union[List[UserContentsResponse], UserContentsPageResponse]:
     request = UserContents(id=user_id)
-    contents = await ContentService.get_user_all_sub_contents(request, content_type, db)
-    return [
-        UserContentsResponse(
-            id=content.id,
-            title=content.title,
-            url=content.url,
-            thumbnail=content.thumbnail,
-            favicon=content.favicon,
-            description=content.description,
-            bookmark=content.bookmark,
-            **(
-                {"video_length": content.video_metadata.video_length}
-                if content_type == "video"
-                else {}
-            ),
-            **({"body": content.post_metadata.body} if content_type == "post" else {}),
-            tags=([tag.tagname for tag in content.tags] if content.tags else []),
-            created_at=content.created_at,
-            type="video" if getattr(content, "video_metadata", None) else "post",
-        )
-        for content in contents
-    ]
+    contents = await ContentService.get_user_all_sub_contents(
+        request, content_type, db, limit, cursor, view
+    )
+    items = [content_item(content, UserContentsResponse, view) for content in contents]
+    if limit is None:
+        return json_response(items, etag_headers(etag))
+
+    return json_response(
+        {
+            "contents": items,
+            "next_cursor": next_cursor(contents, limit, ContentService.LIBRARY_ORDER),
+        },
+        etag_headers(etag),
+    )
 
 
 @router.get("/bookmarks/user/{user_id}")
 async def bookmark(
-    user_id: int, db: AsyncSession = Depends(get_db)
-) -> List[UserBookmarkResponse]:
+    user_id: int,
+    http_request: Request,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    view: ContentView = "full",
+    etag: str = Depends(library_etag),
+    db: AsyncSession = Depends(get_db),
+) -> Union[List[UserBookmarkResponse], UserBookmarkPageResponse]:
     request = UserBookmark(user_id=user_id)
-    contents = await ContentService.get_bookmarked_contents(request, db)
-    return [
-        UserBookmarkResponse(
-            id=content.id,
-            title=content.title,
-            url=content.url,
-            thumbnail=content.thumbnail,
-            favicon=content.favicon,
-            description=content.description,
-            bookmark=content.bookmark,
-            **(
-                {"video_length": content.video_metadata.video_length}
-                if getattr(content, "video_metadata", None)
-                else {}
-            ),
-            **(
-                {"body": content.post_metadata.body}
-                if getattr(content, "post_metadata", None)
-                else {}
+    if wants_ndjson(http_request, stream):
+        return ndjson_response(
+            lambda session: ContentService.stream_bookmarked_contents(
+                request, session, view
             ),
-            tags=([tag.tagname for tag in content.tags] if content.tags else []),
-            created_at=content.created_at,
-            type="video" if getattr(content, "video_metadata", None) else "post",
+            lambda content: content_item(content, UserBookmarkResponse, view),
+            etag_headers(etag),
         )
-        for content in contents
-    ]
+
+    contents = await ContentService.get_bookmarked_contents(
+        request, db, limit, cursor, view
+    )
+    items = [content_item(content, UserBookmarkResponse, view) for content in contents]
+    if limit is None:
+        return json_response(items, etag_headers(etag))
+
+    return json_response(
+        {
+            "contents": items,
+            "next_cursor": next_cursor(contents, limit, ContentService.LIBRARY_ORDER),
+        },
+        etag_headers(etag),
+    )
+
+
+@router.get("/user/{user_id}/sync")
+async def sync(
+    user_id: int,
+    since: Optional[int] = Query(default=None, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> LibrarySyncResponse:
+    """
+    since(이전 응답의 sync_token) 이후 바뀐 콘텐츠, 태그, 콘텐츠-태그 연결과 삭제된 id 반환
+    links는 응답에 포함된 콘텐츠별 전체 태그 연결이므로 클라이언트는 통째로 교체
+    reset=true이면 전체 라이브러리이므로 로컬 데이터를 모두 교체
+    """
+    changes = await LibraryService.get_changes(user_id, since, db)
+    return json_response(
+        {
+            "sync_token": changes["sync_token"],
+            "reset": changes["reset"],
+            "contents": [
+                content_item(content, UserContentsResponse)
+                for content in changes["contents"]
+            ],
+            "tags": [
+                {"id": tag.id, "tagname": tag.tagname, "color": tag.color}
+                for tag in changes["tags"]
+            ],
+            "links": [
+                {"content_id": content_id, "tag_id": tag_id}
+                for content_id, tag_id in changes["links"]
+            ],
+            "deleted_contents": changes["deleted_contents"],
+            "deleted_tags": changes["deleted_tags"],
+        }
+    )
+
+
+@router.get("/{content_id}")
+async def detail(
+    content_id: int, db: AsyncSession = Depends(get_db)
+) -> UserContentsResponse:
+    """
+    콘텐츠 하나의 전체 정보 반환 (view=summary 목록에서 빠진 body 포함)
+    """
+    content = await ContentService.get_content(content_id, db)
+    return json_response(content_item(content, UserContentsResponse))
 
 
 @router.post("/{content_id}/bookmark")
@@ -195,32 +277,39 @@ async def edit(
 
 @router.get("/user/{user_id}/search/{keyword}")
 async def search(
-    user_id: int, keyword: str, db: AsyncSession = Depends(get_db)
+    user_id: int,
+    keyword: str,
+    view: ContentView = "full",
+    mode: Optional[SearchMode] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    threshold: Optional[float] = Query(default=None, ge=0, le=1),
+    db: AsyncSession = Depends(get_db),
+    settings=Depends(get_settings),
 ) -> SearchContentResponse:
-    contents = await ContentService.get_search_contents(user_id, keyword, db)
-    return SearchContentResponse(
-        contents=[
-            ContentResponseModel(
-                id=content.id,
-                url=content.url,
-                title=content.title,
-                thumbnail=content.thumbnail,
-                favicon=content.favicon,
-                description=content.description,
-                bookmark=content.bookmark,
-                **(
-                    {"video_length": content.video_metadata.video_length}
-                    if getattr(content, "video_metadata", None)
-                    else {}
-                ),
-                **(
-                    {"body": content.post_metadata.body}
-                    if getattr(content, "post_metadata", None)
-                    else {}
-                ),
-                tags=([tag.tagname for tag in content.tags] if content.tags else []),
-                created_at=content.created_at,
-            )
-            for content in contents
-        ]
+    """
+    mode=like(기본, SEARCH_DEFAULT_MODE): 기존 부분 문자열 검색, 최신순
+    mode=fts: 전문 검색, websearch 문법 지원("구문", OR, -제외), 관련도 순
+    mode=trgm: 부분 문자열 또는 오타 허용 유사도(threshold, 0~1) 검색, 유사도 순
+    mode=memory: 워커 메모리의 유저별 index로 단어 prefix(한글은 bigram) 검색, 최신순
+      결과는 이 워커의 index 기준, 다른 워커의 변경은 SEARCH_INDEX_CHECK_INTERVAL(초) 안에 반영
+    limit이 없으면 전체 결과 반환 (구버전 앱 호환)
+    """
+    contents = await ContentService.get_search_contents(
+        user_id,
+        keyword,
+        db,
+        view,
+        mode or settings.SEARCH_DEFAULT_MODE,
+        limit,
+        offset,
+        threshold if threshold is not None else settings.SEARCH_TRGM_THRESHOLD,
+    )
+    return json_response(
+        {
+            "contents": [
+                content_item(content, ContentResponseModel, view)
+                for content in contents
+            ]
+        }
     )
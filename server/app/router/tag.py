@@ -1,7 +1,9 @@
 from typing import List
 
 from app.db import get_db
+from app.models.content import ContentTypeEnum
 from app.schemas.tag import (
+    TagCompleteResponse,
     TagContents,
     TagContentsResponse,
     TagDelete,
@@ -14,7 +16,11 @@ from app.schemas.tag import (
     UserTagsResponse,
 )
 from app.services.tag import TagService
-from fastapi import APIRouter, Depends, HTTPException
+from app.util.etag import etag_headers, library_etag
+from app.util.projection import ContentView
+from app.util.serializer import content_item, json_response
+from app.util.streaming import ndjson_response, wants_ndjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/tags", tags=["tags"])
@@ -28,19 +34,31 @@ def endpoint_test():
 @router.get("/user/{user_id}")
 async def tags(
     user_id: int,
+    etag: str = Depends(library_etag),
     db: AsyncSession = Depends(get_db),
 ) -> List[UserTagsResponse]:
     request = UserTags(user_id=user_id)
     tags = await TagService.get_user_tags(request, db)
 
-    return [
-        UserTagsResponse(
-            id=tag.id,
-            tagname=tag.tagname,
-            color=tag.color,
-        )
-        for tag in tags
-    ]
+    return json_response(
+        [{"id": tag.id, "tagname": tag.tagname, "color": tag.color} for tag in tags],
+        etag_headers(etag),
+    )
+
+
+@router.get("/user/{user_id}/complete")
+async def complete(
+    user_id: int,
+    prefix: str = Query(min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    etag: str = Depends(library_etag),
+    db: AsyncSession = Depends(get_db),
+) -> List[TagCompleteResponse]:
+    """
+    태그 입력 자동완성: prefix로 시작하는 태그를 사용 횟수 순으로 limit개 반환
+    """
+    tags = await TagService.complete_tags(user_id, prefix, db, limit)
+    return json_response(tags, etag_headers(etag))
 
 
 @router.post("/user/{user_id}/create")
@@ -77,74 +95,55 @@ async def delete(
 @router.get("/{tag_id}/contents/all")
 async def contents(
     tag_id: int,
+    http_request: Request,
+    stream: bool = False,
+    view: ContentView = "full",
     db: AsyncSession = Depends(get_db),
 ) -> List[TagContentsResponse]:
+    """
+    ?stream=1 또는 Accept: application/x-ndjson이면 NDJSON으로 스트리밍
+    view=summary이면 body 없이 목록용 필드만 반환
+    """
     request = TagContents(tag_id=tag_id)
-    contents = await TagService.get_tag_all_contents(request, db)
-
-    return [
-        TagContentsResponse(
-            id=content.id,
-            url=content.url,
-            title=content.title,
-            thumbnail=content.thumbnail,
-            favicon=content.favicon,
-            description=content.description,
-            bookmark=content.bookmark,
-            **(
-                {"video_length": content.video_metadata.video_length}
-                if content.video_metadata != None and content.content_type == "video"
-                else {}
-            ),
-            **(
-                {"body": content.post_metadata.body}
-                if content.post_metadata != None and content.content_type == "post"
-                else {}
-            ),
-            tags=[tag.tagname for tag in content.tags],
-            created_at=content.created_at,
-            type=content.content_type,
+    if wants_ndjson(http_request, stream):
+        return ndjson_response(
+            lambda session: TagService.stream_tag_contents(request, session, view=view),
+            lambda content: content_item(content, TagContentsResponse, view),
         )
-        for content in contents
-    ]
+
+    contents = await TagService.get_tag_all_contents(request, db, view)
+
+    return json_response(
+        [content_item(content, TagContentsResponse, view) for content in contents]
+    )
 
 
 @router.get("/{tag_id}/contents/sub")
 async def contents(
     tag_id: int,
     content_type: str,
+    http_request: Request,
+    stream: bool = False,
+    view: ContentView = "full",
     db: AsyncSession = Depends(get_db),
 ) -> List[TagContentsResponse]:
     request = TagContents(tag_id=tag_id)
-    if content_type == "video":
-        contents = await TagService.get_tag_videos(request, db)
-    elif content_type == "post":
-        contents = await TagService.get_tag_posts(request, db)
-    else:
+    if content_type not in ("video", "post"):
         raise HTTPException(status_code=400, detail="Invalid content type")
 
-    return [
-        TagContentsResponse(
-            id=content.id,
-            url=content.url,
-            title=content.title,
-            thumbnail=content.thumbnail,
-            favicon=content.favicon,
-            description=content.description,
-            bookmark=content.bookmark,
-            **(
-                {"video_length": content.video_metadata.video_length}
-                if content.video_metadata != None and content.content_type == "video"
-                else {}
-            ),
-            **(
-                {"body": content.post_metadata.body}
-                if content.post_metadata != None and content.content_type == "post"
-                else {}
+    if wants_ndjson(http_request, stream):
+        return ndjson_response(
+            lambda session: TagService.stream_tag_contents(
+                request, session, ContentTypeEnum(content_type), view
             ),
-            tags=[tag.tagname for tag in content.tags],
-            created_at=content.created_at,
-            type=content.content_type,
+            lambda content: content_item(content, TagContentsResponse, view),
         )
-        for content in contents
-    ]
+
+    if content_type == "video":
+        contents = await TagService.get_tag_videos(request, db, view)
+    else:
+        contents = await TagService.get_tag_posts(request, db, view)
+
+    return json_response(
+        [content_item(content, TagContentsResponse, view) for content in contents]
+    )
@@ -24,6 +24,7 @@ class ArticleModel(BaseModel):
 
 class AllArticlesLimitResponse(BaseModel):
     articles: List[ArticleModel]
+    next_cursor: Optional[str] = None
 
     model_config = {"from_attributes": True}
 
@@ -89,5 +90,19 @@ class ArticleTagResponse(BaseModel):
 
 class TagArticleResponse(BaseModel):
     articles: List[ArticleModel]
+    next_cursor: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class ArticleTagFacet(BaseModel):
+    tagname: str
+    count: int
+
+
+class ArticleSearchResponse(BaseModel):
+    total: int
+    facets: List[ArticleTagFacet]
+    articles: List[ArticleModel]
 
     model_config = {"from_attributes": True}
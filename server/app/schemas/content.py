@@ -10,6 +10,7 @@ class ContentAnalyze(BaseModel):
     lang: Literal["en", "ko"] = Field(default="en")  # TODO: 추후 추가
     tag_count: Optional[int] = Field(default=3, ge=1, lt=10)
     detail_degree: Literal[1, 2, 3, 4, 5] = Field(default=3)
+    include_body: bool = True  # False면 title, og 정보만 추출 (</head>까지만 조회)
 
 
 class ContentAnalyzeResponse(BaseModel):
@@ -25,6 +26,32 @@ class ContentAnalyzeResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# 한 번에 분석할 수 있는 최대 URL 수
+ANALYZE_BATCH_MAX_URLS = 300
+
+
+class ContentAnalyzeBatch(BaseModel):
+    user_id: int
+    urls: List[str] = Field(min_length=1, max_length=ANALYZE_BATCH_MAX_URLS)
+    include_body: bool = True
+
+
+class ContentAnalyzeError(BaseModel):
+    status_code: int
+    detail: str
+
+
+class ContentAnalyzeBatchItem(BaseModel):
+    url: str
+    content_type: Literal["video", "post"]
+    result: Optional[ContentAnalyzeResponse] = None
+    error: Optional[ContentAnalyzeError] = None
+
+
+class ContentAnalyzeBatchResponse(BaseModel):
+    results: List[ContentAnalyzeBatchItem]
+
+
 class UserContents(BaseModel):
     id: int
 
@@ -36,6 +63,13 @@ class UserContentsResponse(ContentResponseModel):
     model_config = {"from_attributes": True}
 
 
+class UserContentsPageResponse(BaseModel):
+    contents: List[UserContentsResponse]
+    next_cursor: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
 class UserBookmark(BaseModel):
     user_id: int
 
@@ -47,6 +81,13 @@ class UserBookmarkResponse(ContentResponseModel):
     model_config = {"from_attributes": True}
 
 
+class UserBookmarkPageResponse(BaseModel):
+    contents: List[UserBookmarkResponse]
+    next_cursor: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
 class ContentPost(ContentModel):
     user_id: int
     bookmark: bool
@@ -88,3 +129,20 @@ class SearchContentResponse(BaseModel):
     contents: List[ContentResponseModel]
 
     model_config = {"from_attributes": True}
+
+
+class ContentTagLink(BaseModel):
+    content_id: int
+    tag_id: int
+
+    model_config = {"from_attributes": True}
+
+
+class LibrarySyncResponse(BaseModel):
+    sync_token: int
+    reset: bool
+    contents: List[UserContentsResponse]
+    tags: List[TagResponse]
+    links: List[ContentTagLink]
+    deleted_contents: List[int]
+    deleted_tags: List[int]
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from app.schemas.common import ContentResponseModel
 from pydantic import BaseModel
 
@@ -55,3 +57,10 @@ class TagDeleteResponse(BaseModel):
     id: int
 
     model_config = {"from_attributes": True}
+
+
+class TagCompleteResponse(BaseModel):
+    id: int
+    tagname: str
+    color: Optional[int]
+    count: int
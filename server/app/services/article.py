@@ -2,9 +2,9 @@ import base64
 import gzip
 import json
 from datetime import timedelta
-from typing import List
+from typing import List, Optional, Sequence
 
-from app.models.article import Article
+from app.models.article import Article, article_document
 from app.models.article_tag import article_tag_association
 from app.models.content import Content
 from app.models.content_tag import content_tag_association
@@ -16,14 +16,40 @@ from app.schemas.article import (
     ArticleDownload,
     ArticleEdit,
 )
+from app.services.library import LibraryService
+from app.util.pagination import apply_cursor
 from fastapi import HTTPException
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import and_, desc, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
 
 class ArticleService:
+    # 피드별 정렬 및 cursor 키, 마지막 id로 동점 정렬을 고정
+    # 카운트 피드는 값이 계속 바뀌므로 페이지를 넘기는 사이 카운트가 바뀐 글은
+    # 다음 페이지에서 빠지거나 다시 나올 수 있음 (OFFSET 방식도 마찬가지)
+    # 태그 피드의 updated_at은 글 수정 시에만 바뀜 (카운트 증가는 updated_at 유지)
+    NEWEST_ORDER = (Article.created_at, Article.id)
+    POPULAR_ORDER = (Article.down_count_or_zero, Article.id)
+    UPVOTE_ORDER = (Article.up_count_or_zero, Article.id)
+    TAG_ORDER = (Article.updated_at, Article.id)
+
+    @staticmethod
+    def _paginate(
+        stmt: Select, keys, limit: int, offset: int, cursor: Optional[str]
+    ) -> Select:
+        """
+        cursor가 있거나 첫 페이지면 keyset pagination 적용
+        offset만 보내는 구버전 앱 요청은 기존 LIMIT/OFFSET 방식 유지
+        """
+        if cursor or not offset:
+            return apply_cursor(stmt, keys, cursor, limit)
+
+        return stmt.order_by(*[desc(key) for key in keys]).limit(limit).offset(offset)
+
     @staticmethod
     async def post_article(article: ArticleCreate, db: AsyncSession) -> int:
         """
@@ -53,6 +79,10 @@ class ArticleService:
 
         await db.flush()
         all_tags = list(existing_tags.values()) + new_tags
+        if new_tags:
+            await LibraryService.record_changes(
+                db_user.id, db, tags=[tag.id for tag in new_tags]
+            )
 
         new_article = Article(
             title=article.title,
@@ -178,6 +208,13 @@ class ArticleService:
                 for tag in orphan_tags:
                     await db.delete(tag)
 
+                if orphan_tags:
+                    await LibraryService.record_changes(
+                        article.user_id,
+                        db,
+                        deleted_tags=[tag.id for tag in orphan_tags],
+                    )
+
             await db.commit()
             return db_article.id
 
@@ -195,61 +232,65 @@ class ArticleService:
 
     @staticmethod
     async def get_all_user_articles_limit(
-        user_id: int, limit: int, offset: int, db: AsyncSession
+        user_id: int,
+        limit: int,
+        offset: int,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
     ) -> List[Article]:
         """
         특정 유저의 offset으로부터 limit만큼의 article 반환
         """
-        result = await db.execute(
+        stmt = (
             select(Article)
             .options(
                 selectinload(Article.user),
                 selectinload(Article.tags),
             )
             .where(Article.user_id == user_id)
-            .order_by(desc(Article.created_at))
-            .limit(limit)
-            .offset(offset)
         )
+        stmt = ArticleService._paginate(
+            stmt, ArticleService.NEWEST_ORDER, limit, offset, cursor
+        )
+        result = await db.execute(stmt)
         return result.unique().scalars().all()
 
     @staticmethod
     async def get_all_articles_limit(
-        limit: int, offset: int, db: AsyncSession
+        limit: int, offset: int, db: AsyncSession, cursor: Optional[str] = None
     ) -> List[Article]:
         """
         offset으로부터 limit 개수의 article 반환
         """
-        result = await db.execute(
+        stmt = (
             select(Article)
             .join(User, User.id == Article.user_id)
             .options(
                 selectinload(Article.user),
                 selectinload(Article.tags),
             )
-            .order_by(desc(Article.created_at))
-            .limit(limit)
-            .offset(offset)
         )
+        stmt = ArticleService._paginate(
+            stmt, ArticleService.NEWEST_ORDER, limit, offset, cursor
+        )
+        result = await db.execute(stmt)
         return result.unique().scalars().all()
 
     @staticmethod
     async def get_popular_articles(
-        limit: int, offset: int, db: AsyncSession
+        limit: int, offset: int, db: AsyncSession, cursor: Optional[str] = None
     ) -> List[Article]:
         """
         다운로드 수 내림차순으로 offset부터 limit만큼 articles 반환
         """
-        result = await db.execute(
-            select(Article)
-            .options(
-                selectinload(Article.user),
-                selectinload(Article.tags),
-            )
-            .order_by(desc(Article.down_count))
-            .limit(limit)
-            .offset(offset)
+        stmt = select(Article).options(
+            selectinload(Article.user),
+            selectinload(Article.tags),
+        )
+        stmt = ArticleService._paginate(
+            stmt, ArticleService.POPULAR_ORDER, limit, offset, cursor
         )
+        result = await db.execute(stmt)
         return result.unique().scalars().all()
 
     @staticmethod
@@ -283,40 +324,36 @@ class ArticleService:
 
     @staticmethod
     async def get_upvote_articles(
-        limit: int, offset: int, db: AsyncSession
+        limit: int, offset: int, db: AsyncSession, cursor: Optional[str] = None
     ) -> List[Article]:
         """
         upvote 수 내림차순으로 offset부터 limit만큼 articles 반환
         """
-        result = await db.execute(
-            select(Article)
-            .options(
-                selectinload(Article.user),
-                selectinload(Article.tags),
-            )
-            .order_by(desc(Article.up_count))
-            .limit(limit)
-            .offset(offset)
+        stmt = select(Article).options(
+            selectinload(Article.user),
+            selectinload(Article.tags),
+        )
+        stmt = ArticleService._paginate(
+            stmt, ArticleService.UPVOTE_ORDER, limit, offset, cursor
         )
+        result = await db.execute(stmt)
         return result.unique().scalars().all()
 
     @staticmethod
     async def get_newest_articles(
-        limit: int, offset: int, db: AsyncSession
+        limit: int, offset: int, db: AsyncSession, cursor: Optional[str] = None
     ) -> List[Article]:
         """
         created_at 내림차순 offset부터 limit만큼 articles 반환
         """
-        result = await db.execute(
-            select(Article)
-            .options(
-                selectinload(Article.user),
-                selectinload(Article.tags),
-            )
-            .order_by(desc(Article.created_at))
-            .limit(limit)
-            .offset(offset)
+        stmt = select(Article).options(
+            selectinload(Article.user),
+            selectinload(Article.tags),
         )
+        stmt = ArticleService._paginate(
+            stmt, ArticleService.NEWEST_ORDER, limit, offset, cursor
+        )
+        result = await db.execute(stmt)
         return result.unique().scalars().all()
 
     @staticmethod
@@ -379,6 +416,7 @@ class ArticleService:
             await db.flush()
             await db.refresh(db_tag)
 
+        content_ids = []
         for content in contents:
             db_content = Content(
                 user_id=db_user.id,
@@ -400,9 +438,21 @@ class ArticleService:
                 tag_id=db_tag.id,
             )
             await db.execute(stmt)
+            content_ids.append(db_content.id)
+
+        # 다운로드는 글 수정이 아니므로 updated_at(태그 피드 정렬 키)은 그대로 유지
+        await db.execute(
+            update(Article)
+            .where(Article.id == db_article.id)
+            .values(
+                down_count=Article.down_count_or_zero + 1,
+                updated_at=Article.updated_at,
+            )
+        )
 
-        db_article.down_count = db_article.down_count + 1
-
+        await LibraryService.record_changes(
+            db_user.id, db, contents=content_ids, tags=[db_tag.id]
+        )
         await db.commit()
 
         return db_tag.id
@@ -575,17 +625,139 @@ class ArticleService:
 
     @staticmethod
     async def get_articles_by_tag_limit(
-        tag_id: int, limit: int, offset: int, db: AsyncSession
+        tag_id: int,
+        limit: int,
+        offset: int,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
     ) -> List[Article]:
-        result = await db.execute(
+        stmt = (
             select(Article)
             .options(
                 selectinload(Article.user),
                 selectinload(Article.tags),
             )
             .where(Article.tags.any(Tag.id == tag_id))
-            .order_by(desc(Article.updated_at))
+        )
+        stmt = ArticleService._paginate(
+            stmt, ArticleService.TAG_ORDER, limit, offset, cursor
+        )
+        result = await db.execute(stmt)
+        return result.unique().scalars().all()
+
+    @staticmethod
+    def _search_stmt(
+        keyword: str,
+        tagnames: Sequence[str],
+        limit: int,
+        offset: int,
+        facet_count: int,
+    ):
+        """
+        한 번의 쿼리로 (매칭 수, 태그 facet, 페이지 article id 목록) 한 row 반환
+        - 매칭: title/body 식 인덱스 tsvector @@ websearch_to_tsquery, tagnames가 있으면 모두 가진 글만
+        - facet: 매칭된 글 전체의 태그 이름별 개수 (많은 순 facet_count개)
+        - 페이지: ts_rank 순 limit/offset
+        """
+        document = article_document()
+        query = func.websearch_to_tsquery(
+            literal_column("'simple'::regconfig"), keyword
+        )
+
+        criteria = [document.op("@@")(query)]
+        if tagnames:
+            tagged = (
+                select(article_tag_association.c.article_id)
+                .join(Tag, Tag.id == article_tag_association.c.tag_id)
+                .where(Tag.tagname.in_(tagnames))
+                .group_by(article_tag_association.c.article_id)
+                .having(func.count(Tag.tagname.distinct()) == len(set(tagnames)))
+            )
+            criteria.append(Article.id.in_(tagged))
+
+        matched = (
+            select(Article.id, func.ts_rank(document, query).label("rank"))
+            .where(*criteria)
+            .cte("matched")
+        )
+
+        facet_rows = (
+            select(Tag.tagname, func.count().label("count"))
+            .select_from(matched)
+            .join(
+                article_tag_association,
+                article_tag_association.c.article_id == matched.c.id,
+            )
+            .join(Tag, Tag.id == article_tag_association.c.tag_id)
+            .group_by(Tag.tagname)
+            .order_by(desc("count"), Tag.tagname)
+            .limit(facet_count)
+            .subquery()
+        )
+        facets = select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            literal_column("'tagname'"),
+                            facet_rows.c.tagname,
+                            literal_column("'count'"),
+                            facet_rows.c.count,
+                        ),
+                        desc(facet_rows.c.count),
+                        facet_rows.c.tagname,
+                    )
+                ),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        ).scalar_subquery()
+
+        page = (
+            select(matched.c.id, matched.c.rank)
+            .order_by(desc(matched.c.rank), desc(matched.c.id))
             .limit(limit)
             .offset(offset)
+            .subquery()
         )
-        return result.unique().scalars().all()
+        ids = select(
+            func.array_agg(
+                aggregate_order_by(page.c.id, desc(page.c.rank), desc(page.c.id))
+            )
+        ).scalar_subquery()
+
+        total = select(func.count()).select_from(matched).scalar_subquery()
+
+        return select(total.label("total"), facets.label("facets"), ids.label("ids"))
+
+    @staticmethod
+    async def search_articles(
+        keyword: str,
+        tagnames: Sequence[str],
+        limit: int,
+        offset: int,
+        db: AsyncSession,
+        facet_count: int = 20,
+    ) -> dict:
+        """
+        게시글 전문 검색 + 태그 필터, 매칭된 글 전체 기준 태그 facet 개수 반환
+        """
+        result = await db.execute(
+            ArticleService._search_stmt(keyword, tagnames, limit, offset, facet_count)
+        )
+        row = result.one()
+
+        articles = []
+        if row.ids:
+            result = await db.execute(
+                select(Article)
+                .options(
+                    selectinload(Article.user),
+                    selectinload(Article.tags),
+                )
+                .where(Article.id.in_(row.ids))
+            )
+            by_id = {article.id: article for article in result.unique().scalars()}
+            articles = [by_id[id_] for id_ in row.ids if id_ in by_id]
+
+        return {"total": row.total, "facets": row.facets, "articles": articles}
@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional, Union
 
 from app.models.article_tag import article_tag_association
 from app.models.content import Content
@@ -8,53 +8,179 @@ from app.models.tag import Tag
 from app.models.user import User
 from app.models.video_metadata import VideoMetadata
 from app.schemas.content import (
+    ContentAnalyzeBatch,
     ContentPost,
     ContentPutRequest,
     UserBookmark,
     UserContents,
 )
+from app.services.library import LibraryService
 from app.services.post import PostService
+from app.services.search import SearchMode, SearchService
 from app.services.video import VideoService
+from app.util.pagination import apply_cursor
+from app.util.projection import ContentView, content_list_options
+from app.util.search_index import IndexedContent
+from app.util.streaming import STREAM_BATCH_SIZE
+from config import Settings
 from fastapi import HTTPException
 from sqlalchemy import and_, delete, desc, insert, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import selectinload
 
 
 class ContentService:
+    @staticmethod
+    def _analyze_error(error: Exception) -> dict:
+        """
+        URL별 분석 실패 -> 응답용 에러
+        외부 API 오류 메시지에는 요청 URL 등 내부 정보가 들어 있을 수 있으므로 서버 로그에만 남김
+        """
+        if isinstance(error, HTTPException):
+            return {"status_code": error.status_code, "detail": error.detail}
+        print(f"Failed to analyze URL: {error!r}")
+        return {"status_code": 422, "detail": "Failed to analyze URL"}
+
+    @staticmethod
+    async def analyze_contents(
+        request: ContentAnalyzeBatch, db: AsyncSession, settings: Settings
+    ) -> List[dict]:
+        """
+        여러 URL(영상/포스트 혼합) 한 번에 분석 -> 입력 순서대로 URL별 결과 또는 에러
+        포스트는 ANALYZE_BATCH_CONCURRENCY개씩 동시 조회, 영상은 videos.list 묶음 호출
+        """
+        items = []
+        errors: Dict[int, Exception] = {}
+        for index, url in enumerate(request.urls):
+            if VideoService._extract_video_id(url):
+                items.append(("video", url))
+                continue
+            try:
+                items.append(("post", PostService._extract_first_url(url)))
+            except ValueError:
+                items.append(("post", url))
+                errors[index] = HTTPException(
+                    status_code=422, detail="No valid URL found in input string"
+                )
+
+        result = await db.execute(
+            select(Content.url).where(
+                Content.user_id == request.user_id,
+                Content.url.in_({url for _, url in items}),
+            )
+        )
+        existing = set(result.scalars().all())
+
+        pending = {"video": [], "post": []}
+        for index, (content_type, url) in enumerate(items):
+            if index in errors:
+                continue
+            if url in existing:
+                errors[index] = HTTPException(
+                    status_code=400, detail="Content already exists"
+                )
+            else:
+                pending[content_type].append(url)
+
+        # 세션을 함께 쓰므로 영상 -> 포스트 순서로 실행
+        analyzed: Dict[str, Dict[str, Union[dict, Exception]]] = {
+            "video": await VideoService.analyze_videos(pending["video"], db, settings),
+            "post": await PostService.analyze_posts(
+                pending["post"],
+                db,
+                settings.ANALYZE_BATCH_CONCURRENCY,
+                request.include_body,
+            ),
+        }
+        # url_metadata 저장분 반영 (get_db는 commit하지 않은 변경을 rollback)
+        await db.commit()
+
+        results = []
+        for index, (content_type, url) in enumerate(items):
+            item = {"url": request.urls[index], "content_type": content_type}
+            info = errors.get(index) or analyzed[content_type][url]
+            if isinstance(info, BaseException):
+                item["error"] = ContentService._analyze_error(info)
+            elif content_type == "video":
+                item["result"] = VideoService._analyze_response(url, info).model_dump()
+            else:
+                item["result"] = PostService._analyze_response(
+                    url, info, request.urls[index]
+                ).model_dump()
+            results.append(item)
+
+        return results
+
+    # 유저 라이브러리 목록의 정렬 및 cursor 키
+    LIBRARY_ORDER = (Content.created_at, Content.id)
+
+    @staticmethod
+    def _library_stmt(*criteria, view: ContentView = "full"):
+        """
+        유저 라이브러리 목록 조회에 공통으로 쓰는 select (tags, metadata 포함)
+        """
+        return select(Content).where(*criteria).options(*content_list_options(view))
+
+    @staticmethod
+    async def _stream_library(stmt, db: AsyncSession) -> AsyncIterator[Content]:
+        """
+        server-side cursor로 STREAM_BATCH_SIZE개씩 읽으며 콘텐츠를 하나씩 반환
+        """
+        stmt = stmt.order_by(desc(Content.created_at), desc(Content.id))
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for content in result.scalars():
+            yield content
+
     @staticmethod
     async def get_user_all_contents(
-        user: UserContents, db: AsyncSession
+        user: UserContents,
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: ContentView = "full",
     ) -> List[Content]:
         """
         유저가 소유한 모든 콘텐츠 정보를 반환
+        limit이 주어지면 cursor 이후의 limit개만 반환
         """
-        stmt = (
-            select(Content)
-            .where(Content.user_id == user.id)
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.video_metadata),
-                joinedload(Content.post_metadata),
-            )
-            .order_by(desc(Content.created_at))
-        )
+        stmt = ContentService._library_stmt(Content.user_id == user.id, view=view)
+        if limit is None:
+            stmt = stmt.order_by(desc(Content.created_at), desc(Content.id))
+        else:
+            stmt = apply_cursor(stmt, ContentService.LIBRARY_ORDER, cursor, limit)
+
         result = await db.execute(stmt)
         return result.unique().scalars().all()
 
+    @staticmethod
+    def stream_user_all_contents(
+        user: UserContents, db: AsyncSession, view: ContentView = "full"
+    ) -> AsyncIterator[Content]:
+        """
+        유저가 소유한 모든 콘텐츠를 메모리에 모으지 않고 하나씩 반환
+        """
+        return ContentService._stream_library(
+            ContentService._library_stmt(Content.user_id == user.id, view=view), db
+        )
+
     @staticmethod
     async def get_user_all_sub_contents(
-        user: UserContents, content_type: str, db: AsyncSession
+        user: UserContents,
+        content_type: str,
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: ContentView = "full",
     ) -> List[Content]:
         """
         유저가 소유한 모든 서브 콘텐츠(비디오, 포스트, ...) 정보를 반환
         """
         if content_type == "video":
-            return await VideoService.get_user_all_videos(user, db)
+            return await VideoService.get_user_all_videos(user, db, limit, cursor, view)
         elif content_type == "post":
-            return await PostService.get_user_all_posts(user, db)
+            return await PostService.get_user_all_posts(user, db, limit, cursor, view)
         else:
             raise HTTPException(status_code=400, detail="Unsupported Content Type")
 
@@ -137,9 +263,23 @@ class ContentService:
                 for tag in existing_tags.values()
             ],
         )
+        version = await LibraryService.record_changes(
+            content.user_id,
+            db,
+            contents=[new_content.id],
+            tags=[tag.id for tag in new_tags],
+        )
 
+        # commit=False면 호출자 commit 후 memory 검색 시 변경 이력으로 반영
         if commit:
             await db.commit()
+            SearchService.index_content(
+                content.user_id,
+                version,
+                new_content,
+                existing_tags.values(),
+                content.video_length,
+            )
 
         return {"id": new_content.id, "tags": [tag for tag in existing_tags.values()]}
 
@@ -173,28 +313,65 @@ class ContentService:
             raise HTTPException(status_code=404, detail="Content not found")
 
         db_content.bookmark = not db_content.bookmark
+        version = await LibraryService.record_changes(
+            db_content.user_id, db, contents=[db_content.id]
+        )
         await db.commit()
+        SearchService.index_bookmark(
+            db_content.user_id, version, db_content.id, db_content.bookmark
+        )
 
     @staticmethod
     async def get_bookmarked_contents(
-        user: UserBookmark, db: AsyncSession
+        user: UserBookmark,
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: ContentView = "full",
     ) -> List[Content]:
         """
         북마크로 저장돼있는 콘텐츠 반환
+        limit이 주어지면 cursor 이후의 limit개만 반환
         """
-        stmt = (
-            select(Content)
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.video_metadata),
-                joinedload(Content.post_metadata),
-            )
-            .where(and_(Content.user_id == user.user_id, Content.bookmark == True))
-            .order_by(desc(Content.created_at))
+        stmt = ContentService._library_stmt(
+            Content.user_id == user.user_id, Content.bookmark == True, view=view
         )
+        if limit is None:
+            stmt = stmt.order_by(desc(Content.created_at), desc(Content.id))
+        else:
+            stmt = apply_cursor(stmt, ContentService.LIBRARY_ORDER, cursor, limit)
+
         result = await db.execute(stmt)
         return result.unique().scalars().all()
 
+    @staticmethod
+    def stream_bookmarked_contents(
+        user: UserBookmark, db: AsyncSession, view: ContentView = "full"
+    ) -> AsyncIterator[Content]:
+        """
+        북마크로 저장돼있는 콘텐츠를 메모리에 모으지 않고 하나씩 반환
+        """
+        return ContentService._stream_library(
+            ContentService._library_stmt(
+                Content.user_id == user.user_id, Content.bookmark == True, view=view
+            ),
+            db,
+        )
+
+    @staticmethod
+    async def get_content(content_id: int, db: AsyncSession) -> Content:
+        """
+        콘텐츠 하나의 전체 정보(post body 포함) 반환
+        """
+        result = await db.execute(
+            ContentService._library_stmt(Content.id == content_id)
+        )
+        db_content = result.unique().scalars().first()
+        if not db_content:
+            raise HTTPException(status_code=404, detail="Content not found")
+
+        return db_content
+
     @staticmethod
     async def delete_content(content_id: int, db: AsyncSession):
         """
@@ -240,7 +417,14 @@ class ContentService:
             )
 
             await db.delete(content)
+            version = await LibraryService.record_changes(
+                content.user_id,
+                db,
+                deleted_contents=[content_id],
+                deleted_tags=[tag.id for tag in orphan_tags],
+            )
             await db.commit()
+            SearchService.unindex_content(content.user_id, version, content_id)
         except IntegrityError:
             await db.rollback()
             raise HTTPException(
@@ -277,6 +461,8 @@ class ContentService:
         new_tag_names = set(content.tags)
 
         return_tags = []
+        created_tags = []
+        deleted_tags = []
 
         tags_to_remove = [
             tag for tag in db_content.tags if tag.tagname not in new_tag_names
@@ -285,6 +471,7 @@ class ContentService:
             db_content.tags.remove(tag)
             if len(tag.contents) == 0:
                 await db.delete(tag)
+                deleted_tags.append(tag.id)
             else:
                 return_tags.append({"id": tag.id, "tagname": tag.tagname})
 
@@ -298,31 +485,50 @@ class ContentService:
                 tag = Tag(user_id=db_content.user_id, tagname=tag_name)
                 db.add(tag)
                 await db.flush()
+                created_tags.append(tag.id)
 
             db_content.tags.append(tag)
             return_tags.append({"id": tag.id, "tagname": tag.tagname})
 
+        version = await LibraryService.record_changes(
+            user_id,
+            db,
+            contents=[content_id],
+            tags=created_tags,
+            deleted_tags=deleted_tags,
+        )
         await db.commit()
 
+        SearchService.index_content(user_id, version, db_content, db_content.tags)
+
         return db_content.tags
 
     @staticmethod
     async def get_search_contents(
-        user_id: int, keyword: str, db: AsyncSession
-    ) -> List[Content]:
+        user_id: int,
+        keyword: str,
+        db: AsyncSession,
+        view: ContentView = "full",
+        mode: SearchMode = "like",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        threshold: Optional[float] = None,
+    ) -> List[Union[Content, IndexedContent]]:
         """
         keyword에 근접한 content 반환
-        todo: 추후 변경?
+        fts: 전문 검색 인덱스로 관련도 순, trgm: 부분 문자열 + 오타 허용 유사도 순
+        like: title/description/tag 부분 문자열 최신순
         """
+        if mode != "like":
+            return await SearchService.search_contents(
+                user_id, keyword, db, view, limit, offset, mode, threshold
+            )
+
         keyword_pattern = f"%{keyword}%"
 
         stmt = (
             select(Content)
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.video_metadata),
-                joinedload(Content.post_metadata),
-            )
+            .options(*content_list_options(view))
             .outerjoin(
                 content_tag_association,
                 Content.id == content_tag_association.c.content_id,
@@ -339,6 +545,8 @@ class ContentService:
             .distinct()
             .order_by(desc(Content.created_at))
         )
+        if limit is not None:
+            stmt = stmt.limit(limit).offset(offset)
 
         result = await db.execute(stmt)
         return result.unique().scalars().all()
@@ -0,0 +1,173 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.content import Content
+from app.models.content_tag import content_tag_association
+from app.models.library_change import LibraryChange, LibraryEntityEnum
+from app.models.library_version import LibraryVersion
+from app.models.tag import Tag
+from app.services.search import SearchService
+from app.util.projection import content_list_options
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class LibraryService:
+    @staticmethod
+    async def bump_version(user_id: int, db: AsyncSession) -> int:
+        """
+        유저 라이브러리 버전 1 증가 후 새 버전 반환
+        쓰기 작업과 같은 트랜잭션에서 호출해야 커밋 시점에 함께 반영됨
+        """
+        stmt = (
+            insert(LibraryVersion)
+            .values(user_id=user_id, version=1)
+            .on_conflict_do_update(
+                index_elements=[LibraryVersion.user_id],
+                set_={"version": LibraryVersion.version + 1},
+            )
+            .returning(LibraryVersion.version)
+        )
+        result = await db.execute(stmt)
+        return result.scalar_one()
+
+    @staticmethod
+    async def get_version(user_id: int, db: AsyncSession) -> int:
+        """
+        유저 라이브러리 현재 버전 반환, 변경 이력이 없으면 0
+        """
+        result = await db.execute(
+            select(LibraryVersion.version).where(LibraryVersion.user_id == user_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    @staticmethod
+    async def record_changes(
+        user_id: int,
+        db: AsyncSession,
+        contents: Iterable[int] = (),
+        tags: Iterable[int] = (),
+        deleted_contents: Iterable[int] = (),
+        deleted_tags: Iterable[int] = (),
+    ) -> int:
+        """
+        라이브러리 버전을 올리고 생성/수정/삭제된 콘텐츠, 태그 id를 변경 이력에 기록
+        콘텐츠의 태그 연결이 바뀐 경우 해당 콘텐츠를 수정으로 기록
+        생성/수정된 콘텐츠의 검색 문서도 같은 트랜잭션에서 갱신
+        """
+        version = await LibraryService.bump_version(user_id, db)
+
+        rows = [
+            {
+                "user_id": user_id,
+                "version": version,
+                "entity": entity,
+                "entity_id": entity_id,
+                "deleted": deleted,
+            }
+            for entity, ids, deleted in (
+                (LibraryEntityEnum.CONTENT, contents, False),
+                (LibraryEntityEnum.TAG, tags, False),
+                (LibraryEntityEnum.CONTENT, deleted_contents, True),
+                (LibraryEntityEnum.TAG, deleted_tags, True),
+            )
+            for entity_id in ids
+        ]
+        if rows:
+            await db.execute(insert(LibraryChange), rows)
+
+        await SearchService.refresh_documents(contents, db)
+        return version
+
+    @staticmethod
+    def _latest_changes(
+        changes: Iterable[Tuple[LibraryEntityEnum, int, bool]],
+    ) -> Dict[LibraryEntityEnum, Dict[int, bool]]:
+        """
+        버전 순으로 정렬된 변경 이력을 entity별 {id: 삭제 여부}로 합침 (마지막 변경 우선)
+        """
+        latest = {entity: {} for entity in LibraryEntityEnum}
+        for entity, entity_id, deleted in changes:
+            latest[entity][entity_id] = deleted
+
+        return latest
+
+    @staticmethod
+    async def get_changes(user_id: int, since: Optional[int], db: AsyncSession) -> dict:
+        """
+        since 버전 이후 바뀐 콘텐츠, 태그, 콘텐츠-태그 연결과 삭제 tombstone 반환
+        since가 없거나 현재 버전보다 크면 전체 라이브러리를 reset으로 반환
+        """
+        version = await LibraryService.get_version(user_id, db)
+        reset = since is None or since > version
+
+        deleted_content_ids: List[int] = []
+        deleted_tag_ids: List[int] = []
+        if reset:
+            content_criteria = [Content.user_id == user_id]
+            tag_criteria = [Tag.user_id == user_id]
+        else:
+            result = await db.execute(
+                select(
+                    LibraryChange.entity,
+                    LibraryChange.entity_id,
+                    LibraryChange.deleted,
+                )
+                .where(
+                    LibraryChange.user_id == user_id,
+                    LibraryChange.version > since,
+                    LibraryChange.version <= version,
+                )
+                .order_by(LibraryChange.version, LibraryChange.id)
+            )
+            latest = LibraryService._latest_changes(result.all())
+
+            content_changes = latest[LibraryEntityEnum.CONTENT]
+            tag_changes = latest[LibraryEntityEnum.TAG]
+            deleted_content_ids = [id_ for id_, gone in content_changes.items() if gone]
+            deleted_tag_ids = [id_ for id_, gone in tag_changes.items() if gone]
+            content_criteria = [
+                Content.user_id == user_id,
+                Content.id.in_(
+                    [id_ for id_, gone in content_changes.items() if not gone]
+                ),
+            ]
+            tag_criteria = [
+                Tag.user_id == user_id,
+                Tag.id.in_([id_ for id_, gone in tag_changes.items() if not gone]),
+            ]
+
+        result = await db.execute(
+            select(Content)
+            .where(*content_criteria)
+            .options(*content_list_options())
+            .order_by(Content.id)
+        )
+        contents = result.unique().scalars().all()
+
+        result = await db.execute(select(Tag).where(*tag_criteria).order_by(Tag.id))
+        tags = result.scalars().all()
+
+        links = []
+        if contents:
+            result = await db.execute(
+                select(
+                    content_tag_association.c.content_id,
+                    content_tag_association.c.tag_id,
+                ).where(
+                    content_tag_association.c.content_id.in_(
+                        [content.id for content in contents]
+                    )
+                )
+            )
+            links = result.all()
+
+        return {
+            "sync_token": version,
+            "reset": reset,
+            "contents": contents,
+            "tags": tags,
+            "links": links,
+            "deleted_contents": deleted_content_ids,
+            "deleted_tags": deleted_tag_ids,
+        }
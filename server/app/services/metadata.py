@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from app.models.url_metadata import UrlMetadata
+from config import get_settings
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = get_settings()
+
+
+class MetadataService:
+    @staticmethod
+    def url_hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_fresh(row: UrlMetadata) -> bool:
+        """
+        마지막 조회/재검증 후 METADATA_STALE_AFTER(초)가 지나지 않았으면 True
+        """
+        stale_at = row.fetched_at + timedelta(seconds=settings.METADATA_STALE_AFTER)
+        return stale_at > datetime.now(timezone.utc)
+
+    @staticmethod
+    async def get(key: str, db: AsyncSession) -> Optional[UrlMetadata]:
+        return (await MetadataService.get_many([key], db)).get(key)
+
+    @staticmethod
+    async def get_many(keys: Iterable[str], db: AsyncSession) -> Dict[str, UrlMetadata]:
+        """
+        캐시 키 -> 저장된 row, 없는 키는 제외
+        """
+        hashes = {MetadataService.url_hash(key): key for key in keys}
+        if not hashes:
+            return {}
+
+        result = await db.execute(
+            select(UrlMetadata).where(UrlMetadata.url_hash.in_(list(hashes)))
+        )
+        return {hashes[row.url_hash]: row for row in result.scalars()}
+
+    @staticmethod
+    def saved(
+        key: str,
+        data: dict,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> dict:
+        """
+        새로 조회한 결과 저장용 update
+        """
+        return {
+            "key": key,
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+    @staticmethod
+    def revalidated(key: str) -> dict:
+        """
+        재검증 결과 변경 없음(304) -> fetched_at만 갱신하는 update
+        """
+        return {"key": key, "data": None}
+
+    @staticmethod
+    async def apply(updates: Iterable[Optional[dict]], db: AsyncSession):
+        """
+        saved/revalidated update를 한 번에 반영
+        저장은 upsert(다른 요청이 먼저 저장했으면 최신 결과로 덮어씀)
+        """
+        now = datetime.now(timezone.utc)
+        rows: Dict[str, dict] = {}
+        touched: List[str] = []
+        for item in updates:
+            if item is None:
+                continue
+
+            url_hash = MetadataService.url_hash(item["key"])
+            if item["data"] is None:
+                touched.append(url_hash)
+                continue
+
+            rows[url_hash] = {
+                "url_hash": url_hash,
+                "url": item["key"],
+                "data": item["data"],
+                "etag": item["etag"],
+                "last_modified": item["last_modified"],
+                "fetched_at": now,
+            }
+
+        if rows:
+            stmt = insert(UrlMetadata).values(list(rows.values()))
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[UrlMetadata.url_hash],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in ("data", "etag", "last_modified", "fetched_at")
+                    },
+                )
+            )
+
+        if touched:
+            await db.execute(
+                update(UrlMetadata)
+                .where(UrlMetadata.url_hash.in_(touched))
+                .values(fetched_at=now)
+            )
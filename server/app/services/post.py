@@ -1,16 +1,51 @@
+import asyncio
 import re
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 from urllib.parse import unquote, urljoin, urlparse
 
-import requests
+import httpx
 from app.models.content import Content, ContentTypeEnum
+from app.models.url_metadata import UrlMetadata
 from app.models.user import User
 from app.schemas.content import ContentAnalyze, ContentAnalyzeResponse, UserContents
-from bs4 import BeautifulSoup
+from app.services.metadata import MetadataService
+from app.util.backoff import host_backoff, url_backoff
+from app.util.fetcher import (
+    DESKTOP_HEADERS,
+    FALLBACK_HEADERS,
+    MOBILE_HEADERS,
+    FetchTrace,
+    fetch_trace,
+    response_text,
+    url_fetcher,
+)
+from app.util.html_parser import HtmlDocument, parse_html
+from app.util.metadata_cache import (
+    normalize_url,
+    redirect_cache,
+    url_metadata_cache,
+)
+from app.util.pagination import apply_cursor
+from app.util.projection import ContentView, content_list_options
+from app.util.singleflight import SingleFlight
+from config import get_settings
 from fastapi import HTTPException
 from sqlalchemy import and_, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+
+settings = get_settings()
+
+# 본문 영역 selector (블로그 플랫폼별), 앞에서부터 처음 매칭되는 요소 사용
+BODY_SELECTORS = [
+    "article",
+    "div.post-content",
+    "div.notion-page-content",
+    "div.tt_article_useless_p_margin",
+    "div.se-main-container",
+]
+
+# 같은 URL 동시 분석(여러 유저가 같은 링크 공유 등)은 한 번만 조회
+post_flights: SingleFlight[Tuple[dict, Optional[dict]]] = SingleFlight()
 
 
 class PostService:
@@ -24,17 +59,14 @@ class PostService:
         return []
 
     @staticmethod
-    def _get_favicon(url: str, bs: BeautifulSoup) -> str:
+    def _get_favicon(url: str, document: HtmlDocument) -> str:
         """
         HTML 파싱된 객체로부터 favicon 경로 추출
         """
         parsed = urlparse(url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
 
-        icon_links = bs.find_all("link", rel=lambda r: r and "icon" in r.lower())
-
-        for icon_link in icon_links:
-            icon_href = icon_link.get("href", "")
+        for icon_href in document.icon_hrefs():
             if icon_href:
                 if icon_href.startswith("http"):
                     return icon_href
@@ -46,26 +78,47 @@ class PostService:
         return f"{base_url}/favicon.ico"
 
     @staticmethod
-    def _follow_redirects_until_valid(url: str, max_redirects: int = 10) -> str:
+    async def _follow_redirects_until_valid(url: str, max_redirects: int = 10) -> str:
         """
         수동 리디렉션을 따라가며 최종 유효한 URL 반환
-        intent:// 등 requests가 지원하지 않는 스킴을 피함
+        같은 링크 재공유 시 hop을 다시 따라가지 않도록 결과를 redirect_cache에 저장
+        (성공은 출발 URL과 거친 hop 모두, 실패는 REDIRECT_NEGATIVE_TTL 동안)
+        """
+        key = normalize_url(url)
+        cached = redirect_cache.get(key)
+        if cached is not None:
+            if "url" in cached:
+                return cached["url"]
+            raise HTTPException(
+                status_code=cached["status_code"], detail=cached["detail"]
+            )
+
+        hops = [key]
+        try:
+            final_url = await PostService._walk_redirects(url, max_redirects, hops)
+        except HTTPException as e:
+            redirect_cache.put(
+                key,
+                {"status_code": e.status_code, "detail": e.detail},
+                ttl=settings.REDIRECT_NEGATIVE_TTL,
+            )
+            raise
+
+        for hop in hops:
+            redirect_cache.put(hop, {"url": final_url})
+        return final_url
+
+    @staticmethod
+    async def _walk_redirects(url: str, max_redirects: int, hops: List[str]) -> str:
+        """
+        intent:// 등 httpx가 지원하지 않는 스킴을 피함
+        각 hop은 body를 저장하지 않고 status, Location만 확인 (작은 body는 읽고 버려 연결 재사용)
+        거친 URL은 정규화해 hops에 추가
         """
         try:
             for _ in range(max_redirects):
-                response = requests.get(
-                    url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36",
-                        "Accept-Language": "ko-KR,ko;q=0.9",
-                        "Accept": (
-                            "text/html,application/xhtml+xml,application/xml;"
-                            "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
-                        ),
-                        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                    },
-                    timeout=5,
-                    allow_redirects=False,
+                response = await url_fetcher.get(
+                    url, headers=MOBILE_HEADERS, read_body=False
                 )
                 if 300 <= response.status_code < 400:
                     next_url = response.headers.get("Location", "")
@@ -85,6 +138,7 @@ class PostService:
                         url = next_url
                     else:
                         url = urljoin(url, next_url)
+                    hops.append(normalize_url(url))
                 elif 200 <= response.status_code < 300:
                     return url
                 else:
@@ -92,7 +146,7 @@ class PostService:
                         status_code=422,
                         detail="Invalid response while resolving redirect",
                     )
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise HTTPException(
                 status_code=422, detail=f"Failed to resolve URL: {str(e)}"
             )
@@ -102,120 +156,312 @@ class PostService:
         )
 
     @staticmethod
-    def _analyze(url: str) -> dict:
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    @staticmethod
+    def _empty_post_info(url: str) -> dict:
+        parsed_url = urlparse(url)
+        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        return {
+            "title": "",
+            "thumbnail": "",
+            "description": "",
+            "favicon": base_url + "/favicon.ico",
+            "body": "",
+            "tags": [],
+        }
+
+    @staticmethod
+    def _covers(post_info: dict, include_body: bool) -> bool:
         """
-        주어진 URL에서 콘텐츠 관련 정보를 추출하여 딕셔너리로 반환
+        저장된 결과가 요청을 만족하는지 (head만 읽은 결과에는 본문이 없음)
         """
-        try:
-            final_url = PostService._follow_redirects_until_valid(url)
-        except Exception as e:
-            print(e)
-            parsed_url = urlparse(url)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-
-            return {
-                "title": "",
-                "thumbnail": "",
-                "description": "",
-                "favicon": base_url + "/favicon.ico",
-                "body": "",
-                "tags": [],
-            }
+        return not (include_body and post_info.get("head_only"))
 
-        try:
-            response = requests.get(
-                final_url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_0) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
-                    "Accept": (
-                        "text/html,application/xhtml+xml,application/xml;"
-                        "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
-                    ),
-                    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                    "Connection": "keep-alive",
-                    "DNT": "1",  # Do Not Track 요청
-                    "Upgrade-Insecure-Requests": "1",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Referer": "https://www.google.com/",
-                },
-                timeout=2,
-                allow_redirects=True,
+    @staticmethod
+    def _validator_headers(cached: Optional[UrlMetadata]) -> Dict[str, str]:
+        """
+        저장된 validator로 conditional GET 헤더 생성
+        """
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    @staticmethod
+    async def _fetch_page(
+        url: str,
+        validators: Optional[Dict[str, str]] = None,
+        include_body: bool = True,
+    ) -> Tuple[httpx.Response, bytes]:
+        """
+        최종 URL 페이지 (응답, body) 반환, 첫 요청 실패 시 다른 UA로 한 번 더 시도
+        validators가 있으면 conditional GET (변경 없으면 304)
+        include_body=False면 </head>(최대 POST_HEAD_MAX_BYTES)까지만 받음
+        """
+        validators = validators or {}
+
+        async def fetch(headers: Dict[str, str]) -> Tuple[httpx.Response, bytes]:
+            if not include_body:
+                return await url_fetcher.get_head(
+                    url,
+                    settings.POST_HEAD_MAX_BYTES,
+                    headers=headers | validators,
+                    follow_redirects=True,
+                    timeout=2,
+                )
+
+            response = await url_fetcher.get(
+                url, headers=headers | validators, follow_redirects=True, timeout=2
             )
-        except Exception as e:
+            return response, response.content
+
+        try:
+            return await fetch(DESKTOP_HEADERS)
+        except httpx.HTTPError as e:
             print(e)
-            response = requests.get(
-                final_url,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/122.0.0.0 Safari/537.36"
-                    ),
-                    "Accept": (
-                        "text/html,application/xhtml+xml,application/xml;"
-                        "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
-                    ),
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                    "Connection": "keep-alive",
-                    "DNT": "1",
-                    "Upgrade-Insecure-Requests": "1",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Referer": "https://www.google.com/",
-                },
-                timeout=2,
-                allow_redirects=True,
+            return await fetch(FALLBACK_HEADERS)
+
+    @staticmethod
+    async def _analyze(
+        url: str, db: Optional[AsyncSession] = None, include_body: bool = True
+    ) -> dict:
+        """
+        주어진 URL에서 콘텐츠 관련 정보를 추출하여 딕셔너리로 반환
+        1. 워커 메모리 캐시 2. url_metadata 테이블(오래됐으면 conditional GET으로 재검증) 3. 새로 조회
+        실패 시 저장된 결과가 있으면 그대로, 없으면 빈 정보 반환(저장하지 않음)
+        include_body=False면 <head>의 title, og 정보만 추출 (body는 빈 문자열)
+        """
+        key = normalize_url(url)
+        post_info = url_metadata_cache.get(key)
+        if post_info is not None and PostService._covers(post_info, include_body):
+            return post_info
+
+        cached = await MetadataService.get(key, db) if db is not None else None
+        post_info, update = await PostService._shared_lookup(
+            url, key, cached, include_body
+        )
+        if db is not None:
+            await MetadataService.apply([update], db)
+
+        return post_info
+
+    @staticmethod
+    async def _shared_lookup(
+        url: str, key: str, cached: Optional[UrlMetadata], include_body: bool
+    ) -> Tuple[dict, Optional[dict]]:
+        """
+        같은 정규화 URL을 분석 중이면 그 결과(예외 포함)를 함께 기다림
+        url_metadata 저장은 실제로 조회한 호출만 하도록 update는 None으로 반환
+        """
+        flight_key = key if include_body else f"{key}#head"
+        (post_info, update), shared = await post_flights.run(
+            flight_key,
+            lambda: PostService._lookup_post_info(url, key, cached, include_body),
+        )
+        if shared:
+            return dict(post_info), None
+        return post_info, update
+
+    @staticmethod
+    async def _lookup_post_info(
+        url: str, key: str, cached: Optional[UrlMetadata], include_body: bool = True
+    ) -> Tuple[dict, Optional[dict]]:
+        """
+        메모리 캐시에 없는 URL 분석 -> (post_info, url_metadata update)
+        저장된 결과가 신선하면 그대로, 오래됐으면 재검증, 없으면 새로 조회
+        본문이 필요한데 head만 읽은 결과면 저장된 결과 없이 새로 조회
+        """
+        if cached is not None and not PostService._covers(cached.data, include_body):
+            cached = None
+
+        if cached is not None and MetadataService.is_fresh(cached):
+            url_metadata_cache.put(key, cached.data)
+            return dict(cached.data), None
+
+        fetched = await PostService._fetch_post_info(url, cached, include_body)
+        if fetched is None:
+            if cached is not None:
+                return dict(cached.data), None
+            return PostService._empty_post_info(url), None
+
+        if fetched["post_info"] is None:
+            post_info = dict(cached.data)
+            update = MetadataService.revalidated(key)
+        else:
+            post_info = fetched["post_info"]
+            update = MetadataService.saved(
+                key, post_info, fetched["etag"], fetched["last_modified"]
             )
-        response.encoding = response.apparent_encoding
 
-        html = response.text
+        url_metadata_cache.put(key, post_info)
+        return post_info, update
+
+    @staticmethod
+    async def analyze_posts(
+        urls: List[str], db: AsyncSession, concurrency: int, include_body: bool = True
+    ) -> Dict[str, Union[dict, Exception]]:
+        """
+        여러 URL 동시 분석 -> {url: post_info 또는 실패 예외}
+        동시 실행 수는 concurrency, host별 동시 요청 수는 url_fetcher가 제한
+        세션은 동시에 쓸 수 없으므로 url_metadata 조회/저장은 분석 전후에 한 번씩
+        """
+        keys = {url: normalize_url(url) for url in urls}
+        results: Dict[str, Union[dict, Exception]] = {}
+        pending: Dict[str, str] = {}  # 같은 페이지는 한 번만 분석 (key -> url)
+        for url, key in keys.items():
+            post_info = url_metadata_cache.get(key)
+            if post_info is not None and PostService._covers(post_info, include_body):
+                results[url] = post_info
+            else:
+                pending.setdefault(key, url)
+
+        cached = await MetadataService.get_many(pending, db)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def lookup(key: str, url: str) -> Tuple[dict, Optional[dict]]:
+            async with semaphore:
+                return await PostService._shared_lookup(
+                    url, key, cached.get(key), include_body
+                )
+
+        looked_up = await asyncio.gather(
+            *(lookup(key, url) for key, url in pending.items()),
+            return_exceptions=True,
+        )
+        by_key = dict(zip(pending, looked_up))
+        await MetadataService.apply(
+            [item[1] for item in looked_up if not isinstance(item, BaseException)], db
+        )
+
+        for url, key in keys.items():
+            if url in results:
+                continue
+            item = by_key[key]
+            results[url] = item if isinstance(item, BaseException) else item[0]
 
+        return results
+
+    @staticmethod
+    def _analyze_response(
+        url: str, post_info: dict, base_url: str
+    ) -> ContentAnalyzeResponse:
+        return ContentAnalyzeResponse(
+            url=url,
+            title=post_info["title"],
+            thumbnail=PostService._normalize_url_scheme(
+                post_info["thumbnail"], base_url
+            ),
+            favicon=PostService._normalize_url_scheme(post_info["favicon"], base_url),
+            description=post_info["description"],
+            body=post_info["body"],
+            tags=post_info["tags"],
+        )
+
+    @staticmethod
+    async def _fetch_post_info(
+        url: str, cached: Optional[UrlMetadata] = None, include_body: bool = True
+    ) -> Optional[dict]:
+        """
+        리디렉션 + 페이지 조회 전체에 url_fetcher.deadline 제한, 실패/초과/2xx 아닌 응답 시 None
+        {"post_info", "etag", "last_modified"} 반환, cached 기준 변경 없으면(304) post_info는 None
+        HTML 파싱은 event loop를 막지 않도록 thread에서 실행
+        실패한 URL, 연결 실패/시간 초과가 반복된 host는 backoff 동안 조회 없이 바로 None
+        host 실패는 실제로 요청하다 실패한 host(리디렉션 hop 또는 final_url)에 기록
+        """
+        key = normalize_url(url)
+        if url_backoff.blocked(key) or host_backoff.blocked(PostService._host(url)):
+            return None
+
+        trace = FetchTrace()
+        token = fetch_trace.set(trace)
+        try:
+            async with asyncio.timeout(url_fetcher.deadline):
+                try:
+                    final_url = await PostService._follow_redirects_until_valid(url)
+                except Exception as e:
+                    print(e)
+                    url_backoff.failed(key)
+                    # 응답 내용이 아니라 연결 자체가 실패한 경우만 host 실패로 기록
+                    if isinstance(e.__context__, httpx.TransportError) and trace.host:
+                        host_backoff.failed(trace.host)
+                    return None
+
+                final_host = PostService._host(final_url)
+                if host_backoff.blocked(final_host):
+                    return None
+
+                response, content = await PostService._fetch_page(
+                    final_url, PostService._validator_headers(cached), include_body
+                )
+        except (TimeoutError, httpx.HTTPError) as e:
+            print(f"Analyze failed: {url} {e!r}")
+            # host별 대기(url_fetcher.host_slot) 중 deadline 초과는 URL, host 탓이 아님
+            if trace.host is not None:
+                url_backoff.failed(key)
+                host_backoff.failed(trace.host)
+            return None
+        finally:
+            fetch_trace.reset(token)
+
+        host_backoff.succeeded(final_host)
+        not_modified = response.status_code == 304 and cached is not None
+        if not (response.is_success or not_modified):
+            # 오류/차단 페이지(404, 429, 503 등)는 파싱, 저장하지 않고 URL 실패로 기록
+            print(f"Analyze failed: {url} status {response.status_code}")
+            url_backoff.failed(key)
+            return None
+        url_backoff.succeeded(key)
+
+        fetched = {
+            "post_info": None,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if not_modified:
+            return fetched
+
+        html = response_text(response, content)
+        fetched["post_info"] = await asyncio.to_thread(
+            PostService._parse_html, url, final_url, html, include_body
+        )
+        return fetched
+
+    @staticmethod
+    def _parse_html(
+        url: str,
+        final_url: str,
+        html: str,
+        include_body: bool = True,
+        backend: Optional[str] = None,
+    ) -> dict:
+        """
+        HTML에서 title, og 정보, 본문, favicon 추출
+        include_body=False면 본문은 찾지 않고 head_only 표시
+        backend: HTML parser (기본값 HTML_PARSER_BACKEND)
+        """
         parsed_url = urlparse(final_url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         html = html.replace("%PUBLIC_URL%", base_url)
 
-        bs = BeautifulSoup(html, "html.parser")
+        document = parse_html(html, backend or settings.HTML_PARSER_BACKEND)
 
-        title_tag = bs.find("title")
-        og_title_tag = bs.find("meta", property="og:title")
-        title = (
-            og_title_tag.get("content", "").strip()
-            if og_title_tag
-            else (title_tag.text.strip() if title_tag else "")
-        )
+        og_title = document.meta_property("og:title")
+        title = og_title.strip() if og_title is not None else document.title()
+        thumbnail = document.meta_property("og:image") or ""
+        description = document.meta_property("og:description") or ""
 
-        thumbnail_tag = bs.find("meta", property="og:image")
-        description_tag = bs.find("meta", property="og:description")
-        thumbnail = thumbnail_tag.get("content", "") if thumbnail_tag else ""
-        description = description_tag.get("content", "") if description_tag else ""
-
-        possible_selectors = [
-            "article",
-            "div.post-content",
-            "div.notion-page-content",
-            "div.tt_article_useless_p_margin",
-            "div.se-main-container",
-        ]
-        body_element = next(
-            (
-                bs.select_one(selector)
-                for selector in possible_selectors
-                if bs.select_one(selector)
-            ),
-            None,
-        )
-        body = body_element.get_text(separator="\n").strip() if body_element else ""
+        # 본문 추출 시 script 등을 제거하므로 favicon 먼저 추출
+        favicon = PostService._get_favicon(url, document)
+        body = document.body_text(BODY_SELECTORS) if include_body else ""
 
         tags = PostService._extract_tag(body)
-        favicon = PostService._get_favicon(url, bs)
 
-        return {
+        post_info = {
             "title": title,
             "thumbnail": thumbnail,
             "description": description,
@@ -223,6 +469,9 @@ class PostService:
             "body": body,
             "tags": tags,
         }
+        if not include_body:
+            post_info["head_only"] = True
+        return post_info
 
     @staticmethod
     def _extract_first_url(url: str) -> str:
@@ -278,40 +527,35 @@ class PostService:
         if db_content:
             raise HTTPException(status_code=400, detail="Content already exists")
 
-        post_info = PostService._analyze(real_url)
-
-        content = ContentAnalyzeResponse(
-            url=real_url,
-            title=post_info["title"],
-            thumbnail=PostService._normalize_url_scheme(
-                post_info["thumbnail"], content.url
-            ),
-            favicon=PostService._normalize_url_scheme(
-                post_info["favicon"], content.url
-            ),
-            description=post_info["description"],
-            body=post_info["body"],
-            tags=post_info["tags"],
-        )
+        post_info = await PostService._analyze(real_url, db, content.include_body)
+        # url_metadata 저장분 반영 (get_db는 commit하지 않은 변경을 rollback)
+        await db.commit()
 
-        return content
+        return PostService._analyze_response(real_url, post_info, content.url)
 
     @staticmethod
-    async def get_user_all_posts(user: UserContents, db: AsyncSession) -> List[Content]:
+    async def get_user_all_posts(
+        user: UserContents,
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: ContentView = "full",
+    ) -> List[Content]:
         """
         유저가 소유한 포스트 정보를 모두 반환
+        limit이 주어지면 (created_at, id) cursor 이후의 limit개만 반환
         """
         stmt = (
             select(Content)
             .join(User)
             .where(User.id == user.id)
             .where(Content.content_type == ContentTypeEnum.POST)
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.post_metadata),
-            )
-            .order_by(desc(Content.id))
+            .options(*content_list_options(view))
         )
+        if limit is None:
+            stmt = stmt.order_by(desc(Content.id))
+        else:
+            stmt = apply_cursor(stmt, (Content.created_at, Content.id), cursor, limit)
 
         result = await db.execute(stmt)
         contents = result.scalars().all()
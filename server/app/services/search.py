@@ -0,0 +1,443 @@
+import time
+from dataclasses import replace
+from typing import Iterable, List, Literal, Optional, Union
+
+from app.models.content import Content, ContentTypeEnum
+from app.models.content_search import ContentSearchDocument
+from app.models.content_tag import content_tag_association
+from app.models.library_change import LibraryChange, LibraryEntityEnum
+from app.models.library_version import LibraryVersion
+from app.models.post_metadata import PostMetadata
+from app.models.tag import Tag
+from app.models.video_metadata import VideoMetadata
+from app.util.projection import ContentView, content_list_options
+from app.util.search_index import (
+    IndexedContent,
+    IndexedPost,
+    IndexedTag,
+    IndexedVideo,
+    SearchIndexRegistry,
+    UserSearchIndex,
+)
+from config import get_settings
+from sqlalchemy import desc, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# fts: tsvector + GIN 전문 검색(ts_rank 정렬), like: 기존 ILIKE 부분 문자열 검색
+# trgm: pg_trgm 부분 문자열 + 오타 허용 유사도 검색(유사도 정렬), 공백 없는 CJK 텍스트용
+# memory: 프로세스 내 유저별 inverted index(입력 중 검색용, 최신순)
+SearchMode = Literal["fts", "like", "trgm", "memory"]
+
+# 한국어/영어가 섞여 있어 stemming 없이 공백 단위로 토큰화하는 simple 설정 사용
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# tsvector 최대 크기(1MB)를 넘지 않도록 post body는 앞부분만 색인
+MAX_INDEXED_BODY_LENGTH = 100_000
+
+
+def _document_expression():
+    """
+    contents row 기준 검색 문서 tsvector (title > tags > description > body 가중치)
+    """
+    tag_names = (
+        select(func.string_agg(Tag.tagname, " "))
+        .select_from(content_tag_association.join(Tag))
+        .where(content_tag_association.c.content_id == Content.id)
+        .scalar_subquery()
+    )
+    body = (
+        select(func.left(PostMetadata.body, MAX_INDEXED_BODY_LENGTH))
+        .where(PostMetadata.content_id == Content.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    def weighted(text, weight: str):
+        return func.setweight(
+            func.to_tsvector(SEARCH_CONFIG, func.coalesce(text, "")),
+            literal_column(f"'{weight}'"),
+        )
+
+    return (
+        weighted(Content.title, "A")
+        .op("||")(weighted(tag_names, "B"))
+        .op("||")(weighted(Content.description, "C"))
+        .op("||")(weighted(body, "D"))
+    )
+
+
+# 워커 프로세스별 유저 검색 index, 메모리 예산 초과 시 LRU 제거
+content_search_index = SearchIndexRegistry(get_settings().SEARCH_INDEX_MAX_BYTES)
+
+
+def like_pattern(keyword: str) -> str:
+    """
+    keyword를 포함하는 ILIKE 패턴, keyword 안의 %, _는 문자 그대로 매칭 (escape '/')
+    """
+    escaped = keyword.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"%{escaped}%"
+
+
+class SearchService:
+    @staticmethod
+    def _upsert_documents_stmt(*criteria):
+        select_stmt = select(Content.id, Content.user_id, _document_expression()).where(
+            *criteria
+        )
+        stmt = insert(ContentSearchDocument).from_select(
+            ["content_id", "user_id", "document"], select_stmt
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[ContentSearchDocument.content_id],
+            set_={"document": stmt.excluded.document},
+        )
+
+    @staticmethod
+    async def refresh_documents(content_ids: Iterable[int], db: AsyncSession):
+        """
+        생성/수정된 콘텐츠의 검색 문서 갱신 (삭제는 FK cascade)
+        태그 연결 등 ORM 변경분이 반영되도록 flush 후 실행
+        """
+        content_ids = list(content_ids)
+        if not content_ids:
+            return
+
+        await db.flush()
+        await db.execute(
+            SearchService._upsert_documents_stmt(Content.id.in_(content_ids))
+        )
+
+    @staticmethod
+    async def backfill_documents(db: AsyncSession):
+        """
+        검색 문서가 없는 콘텐츠(기능 추가 전 데이터)의 문서 생성
+        """
+        missing = (
+            ~select(ContentSearchDocument.content_id)
+            .where(ContentSearchDocument.content_id == Content.id)
+            .exists()
+        )
+        await db.execute(SearchService._upsert_documents_stmt(missing))
+        await db.commit()
+
+    @staticmethod
+    def _fts_stmt(user_id: int, keyword: str, view: ContentView):
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, keyword)
+        rank = func.ts_rank(ContentSearchDocument.document, query)
+
+        return (
+            select(Content)
+            .join(
+                ContentSearchDocument,
+                ContentSearchDocument.content_id == Content.id,
+            )
+            .where(
+                ContentSearchDocument.user_id == user_id,
+                ContentSearchDocument.document.op("@@")(query),
+            )
+            .options(*content_list_options(view))
+            .order_by(desc(rank), desc(Content.id))
+        )
+
+    @staticmethod
+    def _trgm_stmt(user_id: int, keyword: str, view: ContentView):
+        """
+        title, description, 태그 이름 중 하나라도 keyword를 포함(ILIKE)하거나
+        word_similarity가 threshold 이상(<% 연산자)이면 매칭, 가장 높은 유사도 순 정렬
+        두 조건 모두 gin_trgm_ops 인덱스 사용
+        """
+        pattern = like_pattern(keyword)
+        keyword = literal(keyword)
+
+        def matches(column):
+            return or_(column.ilike(pattern, escape="/"), keyword.op("<%")(column))
+
+        tag_content_ids = (
+            select(content_tag_association.c.content_id)
+            .join(Tag, Tag.id == content_tag_association.c.tag_id)
+            .where(Tag.user_id == user_id, matches(Tag.tagname))
+        )
+        tag_score = (
+            select(func.max(func.word_similarity(keyword, Tag.tagname)))
+            .select_from(content_tag_association.join(Tag))
+            .where(content_tag_association.c.content_id == Content.id)
+            .scalar_subquery()
+        )
+        score = func.greatest(
+            func.word_similarity(keyword, Content.title),
+            func.word_similarity(keyword, func.coalesce(Content.description, "")),
+            func.coalesce(tag_score, 0),
+        )
+
+        return (
+            select(Content)
+            .where(
+                Content.user_id == user_id,
+                or_(
+                    matches(Content.title),
+                    matches(Content.description),
+                    Content.id.in_(tag_content_ids),
+                ),
+            )
+            .options(*content_list_options(view))
+            .order_by(desc(score), desc(Content.created_at), desc(Content.id))
+        )
+
+    @staticmethod
+    def _indexed(
+        content, tagnames: Iterable[str], video_length: Optional[int]
+    ) -> IndexedContent:
+        """
+        Content(또는 같은 컬럼의 row) -> index에 저장할 목록용 필드
+        """
+        return IndexedContent(
+            id=content.id,
+            url=content.url,
+            title=content.title,
+            description=content.description,
+            thumbnail=content.thumbnail,
+            favicon=content.favicon,
+            bookmark=content.bookmark,
+            content_type=content.content_type,
+            created_at=content.created_at,
+            tags=[IndexedTag(tagname) for tagname in tagnames],
+            video_metadata=(
+                IndexedVideo(video_length)
+                if content.content_type == ContentTypeEnum.VIDEO
+                else None
+            ),
+        )
+
+    @staticmethod
+    async def _index_contents(
+        index: UserSearchIndex, db: AsyncSession, *criteria
+    ) -> List[int]:
+        """
+        조건에 맞는 콘텐츠를 index에 추가하고 추가한 id 반환
+        """
+        result = await db.execute(
+            select(
+                Content.id,
+                Content.url,
+                Content.title,
+                Content.description,
+                Content.thumbnail,
+                Content.favicon,
+                Content.bookmark,
+                Content.content_type,
+                Content.created_at,
+                VideoMetadata.video_length,
+            )
+            .outerjoin(VideoMetadata, VideoMetadata.content_id == Content.id)
+            .where(*criteria)
+        )
+        rows = result.all()
+
+        tagnames = {row.id: [] for row in rows}
+        if rows:
+            result = await db.execute(
+                select(content_tag_association.c.content_id, Tag.tagname)
+                .join(Tag, Tag.id == content_tag_association.c.tag_id)
+                .where(content_tag_association.c.content_id.in_(list(tagnames)))
+                .order_by(Tag.id)
+            )
+            for content_id, tagname in result.all():
+                tagnames[content_id].append(tagname)
+
+        for row in rows:
+            index.add(SearchService._indexed(row, tagnames[row.id], row.video_length))
+        return list(tagnames)
+
+    @staticmethod
+    async def _user_index(user_id: int, db: AsyncSession) -> UserSearchIndex:
+        """
+        유저 index 반환, 처음이면 전체 라이브러리로 생성
+        다른 워커에서 생긴 변경은 library_changes로 index 버전 이후 변경분만 반영
+        버전 확인은 SEARCH_INDEX_CHECK_INTERVAL마다 한 번 (같은 워커의 변경은 바로 반영됨)
+        """
+        index = content_search_index.get(user_id)
+        now = time.monotonic()
+        interval = get_settings().SEARCH_INDEX_CHECK_INTERVAL
+        if index is not None and now - index.checked_at < interval:
+            return index
+
+        result = await db.execute(
+            select(LibraryVersion.version).where(LibraryVersion.user_id == user_id)
+        )
+        version = result.scalar_one_or_none() or 0
+
+        if index is None or index.version > version:
+            index = UserSearchIndex(version)
+            await SearchService._index_contents(index, db, Content.user_id == user_id)
+            index.checked_at = now
+            content_search_index.put(user_id, index)
+            return index
+
+        if index.version < version:
+            result = await db.execute(
+                select(LibraryChange.entity_id, LibraryChange.deleted)
+                .where(
+                    LibraryChange.user_id == user_id,
+                    LibraryChange.entity == LibraryEntityEnum.CONTENT,
+                    LibraryChange.version > index.version,
+                    LibraryChange.version <= version,
+                )
+                .order_by(LibraryChange.version, LibraryChange.id)
+            )
+            changes = dict(result.all())
+
+            for content_id in changes:
+                index.remove(content_id)
+            await SearchService._index_contents(
+                index,
+                db,
+                Content.user_id == user_id,
+                Content.id.in_([id_ for id_, gone in changes.items() if not gone]),
+            )
+            index.version = version
+            content_search_index.evict()
+
+        index.checked_at = now
+        return index
+
+    @staticmethod
+    def _advance_index(index: UserSearchIndex, version: int):
+        # 중간 변경을 놓치지 않았을 때만 버전 갱신, 아니면 다음 검색 때 변경 이력으로 보정
+        if index.version == version - 1:
+            index.version = version
+
+    @staticmethod
+    def index_content(
+        user_id: int,
+        version: int,
+        content: Content,
+        tags: Iterable[Tag],
+        video_length: Optional[int] = None,
+    ):
+        """
+        commit된 저장/수정 콘텐츠를 이미 만들어진 유저 index에 바로 반영
+        video_length가 없으면 index에 있던 값 사용, 그것도 없으면 검색 시 변경 이력으로 반영
+        """
+        index = content_search_index.get(user_id)
+        if index is None:
+            return
+
+        if video_length is None and content.content_type == ContentTypeEnum.VIDEO:
+            previous = index.get(content.id)
+            if previous is None or previous.video_metadata is None:
+                return
+            video_length = previous.video_metadata.video_length
+
+        tagnames = [tag.tagname for tag in sorted(tags, key=lambda tag: tag.id)]
+        index.add(SearchService._indexed(content, tagnames, video_length))
+        SearchService._advance_index(index, version)
+        content_search_index.evict()
+
+    @staticmethod
+    def index_bookmark(user_id: int, version: int, content_id: int, bookmark: bool):
+        """
+        북마크 변경을 이미 만들어진 유저 index에 바로 반영
+        """
+        index = content_search_index.get(user_id)
+        content = index.get(content_id) if index is not None else None
+        if content is None:
+            return
+
+        content.bookmark = bookmark
+        SearchService._advance_index(index, version)
+
+    @staticmethod
+    def unindex_content(user_id: int, version: int, content_id: int):
+        """
+        삭제된 콘텐츠를 이미 만들어진 유저 index에서 바로 제거
+        """
+        index = content_search_index.get(user_id)
+        if index is None:
+            return
+
+        index.remove(content_id)
+        SearchService._advance_index(index, version)
+
+    @staticmethod
+    async def _memory_search(
+        user_id: int,
+        keyword: str,
+        db: AsyncSession,
+        view: ContentView,
+        limit: Optional[int],
+        offset: int,
+    ) -> List[IndexedContent]:
+        """
+        목록용 필드는 index에서 바로 반환, view=full이면 post body만 추가 조회
+        """
+        index = await SearchService._user_index(user_id, db)
+        contents = index.search(keyword)
+        contents = (
+            contents[offset : offset + limit]
+            if limit is not None
+            else contents[offset:]
+        )
+        post_ids = [
+            content.id
+            for content in contents
+            if content.content_type == ContentTypeEnum.POST
+        ]
+        if view == "summary" or not post_ids:
+            return contents
+
+        result = await db.execute(
+            select(PostMetadata.content_id, PostMetadata.body).where(
+                PostMetadata.content_id.in_(post_ids)
+            )
+        )
+        bodies = dict(result.all())
+        return [
+            (
+                replace(content, post_metadata=IndexedPost(bodies[content.id]))
+                if content.id in bodies
+                else content
+            )
+            for content in contents
+        ]
+
+    @staticmethod
+    async def search_contents(
+        user_id: int,
+        keyword: str,
+        db: AsyncSession,
+        view: ContentView = "full",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        mode: SearchMode = "fts",
+        threshold: Optional[float] = None,
+    ) -> List[Union[Content, IndexedContent]]:
+        """
+        fts: websearch 문법(따옴표 구문, OR, -제외) keyword로 GIN 인덱스 검색 후 ts_rank 순 반환
+        trgm: 부분 문자열 또는 유사도 threshold 이상인 콘텐츠를 유사도 순 반환
+        memory: 프로세스 내 index의 목록용 필드를 최신순 반환 (Content 조회 없음)
+        """
+        if mode == "memory":
+            return await SearchService._memory_search(
+                user_id, keyword, db, view, limit, offset
+            )
+
+        if mode == "trgm":
+            if threshold is not None:
+                # <% 연산자 기준값, 현재 트랜잭션에만 적용
+                await db.execute(
+                    select(
+                        func.set_config(
+                            "pg_trgm.word_similarity_threshold", str(threshold), True
+                        )
+                    )
+                )
+            stmt = SearchService._trgm_stmt(user_id, keyword, view)
+        else:
+            stmt = SearchService._fts_stmt(user_id, keyword, view)
+
+        if limit is not None:
+            stmt = stmt.limit(limit).offset(offset)
+
+        result = await db.execute(stmt)
+        return result.unique().scalars().all()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from app.models.content import Content, ContentTypeEnum
 from app.models.content_tag import content_tag_association
@@ -6,14 +6,40 @@ from app.models.post_metadata import PostMetadata
 from app.models.tag import Tag
 from app.models.video_metadata import VideoMetadata
 from app.schemas.tag import TagContents, TagDelete, TagPost, TagPut, UserTags
+from app.services.library import LibraryService
+from app.util.hangul import prefix_ranges
+from app.util.projection import ContentView, content_list_options
+from app.util.streaming import STREAM_BATCH_SIZE
 from fastapi import HTTPException
-from sqlalchemy import and_, desc, exists, func, select
+from sqlalchemy import and_, delete, desc, exists, false, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
 
 
 class TagService:
+    @staticmethod
+    def _tag_contents_stmt(
+        tag_id: int,
+        content_type: Optional[ContentTypeEnum] = None,
+        view: ContentView = "full",
+    ):
+        """
+        태그와 매치되는 콘텐츠 select, content_type이 주어지면 해당 타입만
+        """
+        stmt = (
+            select(Content)
+            .join(
+                content_tag_association,
+                Content.id == content_tag_association.c.content_id,
+            )
+            .options(*content_list_options(view))
+            .where(content_tag_association.c.tag_id == tag_id)
+        )
+        if content_type is not None:
+            stmt = stmt.where(Content.content_type == content_type)
+
+        return stmt.order_by(desc(Content.created_at))
+
     @staticmethod
     async def get_user_tags(user: UserTags, db: AsyncSession) -> List[Tag]:
         """
@@ -28,86 +54,99 @@ class TagService:
         return result.unique().scalars().all()
 
     @staticmethod
-    async def get_tag_all_contents(tag: TagContents, db: AsyncSession) -> List[Content]:
+    def _complete_tags_stmt(user_id: int, prefix: str, limit: int):
         """
-        태그와 매치되는 모든 콘텐츠 반환
+        lower(tagname)이 prefix 범위에 드는 태그를 사용 횟수(연결된 콘텐츠 수) 순으로 select
+        범위 비교(~>=~, ~<~)는 text_pattern_ops 인덱스로 처리되므로 매칭된 태그만 집계
         """
-        result = await db.execute(select(Tag).where(Tag.id == tag.tag_id))
+        tagname = func.lower(Tag.tagname)
+        ranges = [
+            and_(tagname.op("~>=~")(start), tagname.op("~<~")(end))
+            for start, end in prefix_ranges(prefix)
+        ]
+        usage = func.count(content_tag_association.c.content_id)
 
-        stmt = (
-            select(Content)
-            .join(
+        return (
+            select(Tag.id, Tag.tagname, Tag.color, usage.label("count"))
+            .outerjoin(
                 content_tag_association,
-                content_tag_association.c.content_id == Content.id,
+                content_tag_association.c.tag_id == Tag.id,
             )
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.video_metadata),
-                joinedload(Content.post_metadata),
-            )
-            .where(content_tag_association.c.tag_id == tag.tag_id)
-            .order_by(desc(Content.created_at))
+            .where(Tag.user_id == user_id, or_(false(), *ranges))
+            .group_by(Tag.id)
+            .order_by(desc(usage), func.length(Tag.tagname), Tag.tagname)
+            .limit(limit)
+        )
+
+    @staticmethod
+    async def complete_tags(
+        user_id: int, prefix: str, db: AsyncSession, limit: int = 10
+    ) -> List[dict]:
+        """
+        prefix로 시작하는 유저 태그 상위 limit개 반환 (입력 중인 한글 조합 포함)
+        """
+        result = await db.execute(
+            TagService._complete_tags_stmt(user_id, prefix, limit)
         )
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def get_tag_all_contents(
+        tag: TagContents, db: AsyncSession, view: ContentView = "full"
+    ) -> List[Content]:
+        """
+        태그와 매치되는 모든 콘텐츠 반환
+        """
+        result = await db.execute(select(Tag).where(Tag.id == tag.tag_id))
+
+        stmt = TagService._tag_contents_stmt(tag.tag_id, view=view)
 
         result = await db.execute(stmt)
         return result.scalars().all()
 
     @staticmethod
-    async def get_tag_videos(tag: TagContents, db: AsyncSession) -> List[dict]:
+    async def get_tag_videos(
+        tag: TagContents, db: AsyncSession, view: ContentView = "full"
+    ) -> List[dict]:
         """
         VIDEO 콘텐츠 + tagname 리스트를 같이 조회
         """
-        stmt = (
-            select(Content)
-            .join(
-                content_tag_association,
-                Content.id == content_tag_association.c.content_id,
-            )
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.video_metadata),
-                joinedload(Content.post_metadata),
-            )
-            .where(
-                and_(
-                    content_tag_association.c.tag_id == tag.tag_id,
-                    Content.content_type == ContentTypeEnum.VIDEO,
-                )
-            )
-            .order_by(desc(Content.created_at))
+        stmt = TagService._tag_contents_stmt(
+            tag.tag_id, ContentTypeEnum.VIDEO, view=view
         )
 
         result = await db.execute(stmt)
         return result.scalars().all()
 
     @staticmethod
-    async def get_tag_posts(tag: TagContents, db: AsyncSession) -> List[Content]:
+    async def get_tag_posts(
+        tag: TagContents, db: AsyncSession, view: ContentView = "full"
+    ) -> List[Content]:
         """
         태그와 매치되는 post 반환
         """
-        stmt = (
-            select(Content)
-            .join(
-                content_tag_association,
-                Content.id == content_tag_association.c.content_id,
-            )
-            .options(
-                selectinload(Content.tags),
-                joinedload(Content.video_metadata),
-                joinedload(Content.post_metadata),
-            )
-            .where(
-                and_(
-                    content_tag_association.c.tag_id == tag.tag_id,
-                    Content.content_type == ContentTypeEnum.POST,
-                )
-            )
-            .order_by(desc(Content.created_at))
+        stmt = TagService._tag_contents_stmt(
+            tag.tag_id, ContentTypeEnum.POST, view=view
         )
 
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    async def stream_tag_contents(
+        tag: TagContents,
+        db: AsyncSession,
+        content_type: Optional[ContentTypeEnum] = None,
+        view: ContentView = "full",
+    ) -> AsyncIterator[Content]:
+        """
+        태그와 매치되는 콘텐츠를 server-side cursor로 읽으며 하나씩 반환
+        """
+        stmt = TagService._tag_contents_stmt(tag.tag_id, content_type, view)
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for content in result.scalars():
+            yield content
+
     @staticmethod
     async def post_tag(user_id: int, tag: TagPost, db: AsyncSession) -> Tag:
         """
@@ -133,6 +172,8 @@ class TagService:
 
         try:
             db.add(new_tag)
+            await db.flush()
+            await LibraryService.record_changes(user_id, db, tags=[new_tag.id])
             await db.commit()
         except IntegrityError:
             await db.rollback()
@@ -163,6 +204,15 @@ class TagService:
         if tag.color is not None:
             db_tag.color = tag.color
 
+        # 콘텐츠 응답에 태그 이름이 들어가므로 연결된 콘텐츠도 변경으로 기록
+        result = await db.execute(
+            select(content_tag_association.c.content_id).where(
+                content_tag_association.c.tag_id == db_tag.id
+            )
+        )
+        await LibraryService.record_changes(
+            user_id, db, contents=result.scalars().all(), tags=[db_tag.id]
+        )
         await db.commit()
 
         return db_tag.id
@@ -195,7 +245,17 @@ class TagService:
             )
 
         try:
+            # 확인 후 다른 요청이 연결한 콘텐츠도 cascade 대신 직접 끊고 변경으로 기록
+            result = await db.execute(
+                delete(content_tag_association)
+                .where(content_tag_association.c.tag_id == db_tag.id)
+                .returning(content_tag_association.c.content_id)
+            )
+            content_ids = result.scalars().all()
             await db.delete(db_tag)
+            await LibraryService.record_changes(
+                user_id, db, contents=content_ids, deleted_tags=[db_tag.id]
+            )
             await db.commit()
         except IntegrityError:
             await db.rollback()
@@ -64,7 +64,9 @@ class UserService:
             tutorial2_description = "上部のアプリアイコンとプロフィール画像をタップしてみてください！何が表示されるか確認してみましょう。読み終わったらこのメモを削除してください。"
             tutorial2_tags = ["チュートリアル"]
 
-        analyzed_post = PostService._analyze(tutorial1_url)
+        analyzed_post = await PostService._analyze(
+            tutorial1_url, db, include_body=False
+        )
 
         tutorial1 = ContentPost(
             user_id=db_user.id,
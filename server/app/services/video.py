@@ -1,15 +1,24 @@
-from typing import List
+import asyncio
+from typing import Dict, List, Optional, Union
 from urllib.parse import parse_qs, urlparse
 
 import isodate
 from app.models.content import Content, ContentTypeEnum
 from app.schemas.content import ContentAnalyze, ContentAnalyzeResponse, UserContents
-from config import Settings
+from app.services.metadata import MetadataService
+from app.util.batcher import MicroBatcher
+from app.util.metadata_cache import url_metadata_cache
+from app.util.pagination import apply_cursor
+from app.util.projection import ContentView, content_list_options
+from app.util.youtube import youtube_client
+from config import Settings, get_settings
 from fastapi import HTTPException
-from googleapiclient.discovery import build
 from sqlalchemy import and_, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+
+# videos.list 한 번에 조회할 수 있는 최대 id 수
+VIDEOS_LIST_MAX_IDS = 50
+VIDEOS_LIST_PART = "snippet,contentDetails"
 
 
 class VideoService:
@@ -45,37 +54,14 @@ class VideoService:
             return 0
 
     @staticmethod
-    def _extract_video_info(
-        video_url: str, settings: Settings, lang: str = "ko"
-    ) -> dict:
+    def _video_item_info(video_data: dict) -> dict:
         """
-        유튜브 비디오 링크 -> 자막 반환
+        videos.list 응답 item -> 영상 정보
         """
-        video_id = VideoService._extract_video_id(video_url)
-        youtube = build("youtube", "v3", developerKey=settings.YOUTUBE_API_KEY)
-
-        request = youtube.videos().list(part="snippet,contentDetails", id=video_id)
-        response = request.execute()
-
-        if len(response["items"]) == 0:
-            raise HTTPException(status_code=404, detail="Video not found on YouTube")
-
-        if not response["items"]:
-            return {
-                "title": "",
-                "thumbnail": "",
-                "favicon": "https://www.youtube.com/favicon.ico",
-                "description": "",
-                "tags": [],
-                "length": 0,  # 초 단위
-                "summation": "",
-            }
-
-        video_data = response["items"][0]
         snippet = video_data["snippet"]
         content_details = video_data["contentDetails"]
 
-        video_info = {
+        return {
             "title": snippet.get("title", ""),
             "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
             "favicon": "https://www.youtube.com/favicon.ico",
@@ -87,6 +73,99 @@ class VideoService:
             "summation": "",
         }
 
+    @staticmethod
+    async def _fetch_video_infos(video_ids: List[str]) -> Dict[str, dict]:
+        """
+        videos.list 한 번으로 여러 영상 조회 (최대 VIDEOS_LIST_MAX_IDS개)
+        -> {video id: 영상 정보}, 없는 영상은 제외
+        """
+        response = await youtube_client.videos_list(video_ids, VIDEOS_LIST_PART)
+
+        return {
+            item["id"]: VideoService._video_item_info(item)
+            for item in response.get("items", [])
+        }
+
+    @staticmethod
+    async def analyze_videos(
+        urls: List[str], db: AsyncSession, settings: Settings
+    ) -> Dict[str, Union[dict, Exception]]:
+        """
+        여러 영상 URL 분석 -> {url: video_info 또는 실패 예외}
+        캐시/url_metadata에 없거나 오래된 영상만 video_batcher로 조회 (50개씩 묶어 videos.list 호출)
+        """
+        keys = {url: f"youtube:{VideoService._extract_video_id(url)}" for url in urls}
+        found: Dict[str, dict] = {}
+        for key in set(keys.values()):
+            video_info = url_metadata_cache.get(key)
+            if video_info is not None:
+                found[key] = video_info
+
+        cached = await MetadataService.get_many(set(keys.values()) - set(found), db)
+        for key, row in cached.items():
+            if MetadataService.is_fresh(row):
+                url_metadata_cache.put(key, row.data)
+                found[key] = dict(row.data)
+
+        video_ids = sorted(
+            {key.removeprefix("youtube:") for key in keys.values()}
+            - {key.removeprefix("youtube:") for key in found}
+            - {""}
+        )
+        fetched = await asyncio.gather(
+            *(video_batcher.load(video_id) for video_id in video_ids),
+            return_exceptions=True,
+        )
+
+        errors: Dict[str, Exception] = {}
+        updates = []
+        for video_id, result in zip(video_ids, fetched):
+            key = f"youtube:{video_id}"
+            if isinstance(result, BaseException):
+                errors[key] = result
+            elif result is not None:
+                found[key] = result
+                url_metadata_cache.put(key, result)
+                updates.append(MetadataService.saved(key, result))
+        await MetadataService.apply(updates, db)
+
+        not_found = HTTPException(status_code=404, detail="Video not found on YouTube")
+        return {
+            url: found.get(key) or errors.get(key, not_found)
+            for url, key in keys.items()
+        }
+
+    @staticmethod
+    async def _extract_video_info(
+        video_url: str,
+        settings: Settings,
+        db: Optional[AsyncSession] = None,
+        lang: str = "ko",
+    ) -> dict:
+        """
+        유튜브 비디오 링크 -> 영상 정보 반환
+        1. 워커 메모리 캐시 2. url_metadata 테이블 3. YouTube API (동시 요청과 묶어 조회)
+        같은 영상은 저장된 결과 반환 (YouTube API quota 절약)
+        """
+        video_id = VideoService._extract_video_id(video_url)
+        key = f"youtube:{video_id}"
+        video_info = url_metadata_cache.get(key)
+        if video_info is not None:
+            return video_info
+
+        cached = await MetadataService.get(key, db) if db is not None else None
+        if cached is not None and MetadataService.is_fresh(cached):
+            url_metadata_cache.put(key, cached.data)
+            return dict(cached.data)
+
+        # videos.list는 304 응답도 quota를 쓰므로 etag 재검증 대신 묶음 조회로 다시 받음
+        video_info = await video_batcher.load(video_id) if video_id else None
+        if video_info is None:
+            raise HTTPException(status_code=404, detail="Video not found on YouTube")
+        if db is not None:
+            await MetadataService.apply([MetadataService.saved(key, video_info)], db)
+
+        url_metadata_cache.put(key, video_info)
         return video_info
 
     @staticmethod
@@ -106,10 +185,16 @@ class VideoService:
         if db_content:
             raise HTTPException(status_code=400, detail="Content already exists")
 
-        video_info = VideoService._extract_video_info(content.url, settings)
+        video_info = await VideoService._extract_video_info(content.url, settings, db)
+        # url_metadata 저장분 반영 (get_db는 commit하지 않은 변경을 rollback)
+        await db.commit()
+
+        return VideoService._analyze_response(content.url, video_info)
 
-        content = ContentAnalyzeResponse(
-            url=content.url,
+    @staticmethod
+    def _analyze_response(url: str, video_info: dict) -> ContentAnalyzeResponse:
+        return ContentAnalyzeResponse(
+            url=url,
             title=video_info["title"],
             thumbnail=video_info["thumbnail"],
             favicon=video_info["favicon"],
@@ -118,29 +203,40 @@ class VideoService:
             tags=video_info["tags"],
         )
 
-        return content
-
     @staticmethod
     async def get_user_all_videos(
-        user: UserContents, db: AsyncSession
+        user: UserContents,
+        db: AsyncSession,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: ContentView = "full",
     ) -> List[Content]:
         """
         유저가 소유한 비디오 정보를 모두 반환
+        limit이 주어지면 (created_at, id) cursor 이후의 limit개만 반환
         """
         stmt = (
             select(Content)
-            .options(
-                joinedload(Content.tags),
-                joinedload(Content.video_metadata),
-            )
             .where(
                 Content.user_id == user.id,
                 Content.content_type == ContentTypeEnum.VIDEO,
             )
-            .order_by(desc(Content.created_at))
+            .options(*content_list_options(view))
         )
+        if limit is None:
+            stmt = stmt.order_by(desc(Content.created_at))
+        else:
+            stmt = apply_cursor(stmt, (Content.created_at, Content.id), cursor, limit)
+
         result = await db.execute(stmt)
         contents = result.unique().scalars().all()
 
         return contents
-        return contents
+
+
+# 짧은 시간 안에 들어온 영상 조회(요청/유저 무관)를 videos.list 한 번으로 묶음
+video_batcher = MicroBatcher(
+    lambda video_ids: VideoService._fetch_video_infos(video_ids),
+    VIDEOS_LIST_MAX_IDS,
+    get_settings().YOUTUBE_BATCH_WINDOW,
+)
@@ -0,0 +1,65 @@
+"""
+링크 분석 HTML parser backend별 페이지당 CPU 시간 비교
+python -m app.tests.benchmark.bench_html_parser [저장한 페이지 디렉터리]
+
+pages/: 플랫폼별(Notion, Tistory, 네이버 블로그 se-main-container, Medium) 본문 구조를
+남기고 줄인 페이지, 실제 페이지는 디렉터리를 지정해 비교
+bs4: BeautifulSoup(html.parser), selectolax: lexbor(C 구현), 결과가 다르면 MISMATCH 표시
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from app.services.post import PostService
+from app.util.html_parser import PARSER_BACKENDS
+
+PAGES_DIR = Path(__file__).parent / "pages"
+
+
+def _pages(directory: Path) -> dict:
+    return {
+        path.name: path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(directory.glob("*.htm*"))
+    }
+
+
+def _parse(html: str, backend: str) -> dict:
+    return PostService._parse_html(
+        "https://example.com/post", "https://example.com/post", html, True, backend
+    )
+
+
+def _cpu_time(html: str, backend: str, repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for _ in range(number):
+            _parse(html, backend)
+        best = min(best, time.process_time() - start)
+    return best / number
+
+
+def main(directory: Path = PAGES_DIR, repeat: int = 5, number: int = 20) -> None:
+    pages = _pages(directory)
+    backends = list(PARSER_BACKENDS)
+    if "selectolax" not in backends:
+        print("selectolax not installed: bs4 only")
+
+    for name, html in pages.items():
+        results = {backend: _parse(html, backend) for backend in backends}
+        mismatched = [
+            key
+            for key in results["bs4"]
+            if any(result[key] != results["bs4"][key] for result in results.values())
+        ]
+        timings = ", ".join(
+            f"{backend} {_cpu_time(html, backend, repeat, number) * 1e3:.2f} ms"
+            for backend in backends
+        )
+        status = f"MISMATCH {mismatched}" if mismatched else "match"
+        print(f"{name:>16} ({len(html) // 1024} KB): {timings} [{status}]")
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else PAGES_DIR)
@@ -0,0 +1,95 @@
+"""
+콘텐츠 목록 응답 직렬화 item당 비용 비교
+python -m app.tests.benchmark.bench_serializer [item 수]
+
+before: 라우터에서 모델 생성(검증) -> FastAPI response_model 재검증 -> dict 변환 -> json.dumps
+after: app.util.serializer (row -> dict, pydantic-core로 한 번에 bytes)
+"""
+
+import json
+import sys
+import timeit
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+
+from app.models.content import ContentTypeEnum
+from app.schemas.content import UserContentsResponse
+from app.util.serializer import content_item, dump_json
+from pydantic import TypeAdapter
+
+
+def _rows(count: int) -> list:
+    created_at = datetime(2025, 5, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            url=f"https://www.youtube.com/watch?v={i}",
+            title=f"title {i}",
+            thumbnail=f"https://i.ytimg.com/vi/{i}/hqdefault.jpg",
+            favicon="https://www.youtube.com/favicon.ico",
+            description="description " * 10,
+            bookmark=i % 2 == 0,
+            tags=[SimpleNamespace(tagname=f"tag{j}") for j in range(3)],
+            created_at=created_at,
+            content_type=ContentTypeEnum.VIDEO,
+            video_metadata=SimpleNamespace(video_length=300),
+            post_metadata=None,
+        )
+        for i in range(count)
+    ]
+
+
+_response_adapter = TypeAdapter(List[UserContentsResponse])
+
+
+def before(rows: list) -> bytes:
+    items = [
+        UserContentsResponse(
+            id=content.id,
+            title=content.title,
+            url=content.url,
+            thumbnail=content.thumbnail,
+            favicon=content.favicon,
+            description=content.description,
+            bookmark=content.bookmark,
+            **(
+                {"video_length": content.video_metadata.video_length}
+                if getattr(content, "video_metadata", None)
+                else {}
+            ),
+            **(
+                {"body": content.post_metadata.body}
+                if getattr(content, "post_metadata", None)
+                else {}
+            ),
+            tags=([tag.tagname for tag in content.tags] if content.tags else []),
+            created_at=content.created_at,
+            type="video" if getattr(content, "video_metadata", None) else "post",
+        )
+        for content in rows
+    ]
+    # FastAPI serialize_response: response_model 검증 후 json 모드 dict -> JSONResponse
+    validated = _response_adapter.validate_python(items, from_attributes=True)
+    content = _response_adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def after(rows: list) -> bytes:
+    return dump_json([content_item(content, UserContentsResponse) for content in rows])
+
+
+def main(count: int = 500, repeat: int = 5, number: int = 20) -> None:
+    rows = _rows(count)
+    assert json.loads(before(rows)) == json.loads(after(rows))
+
+    for name, func in (("before", before), ("after", after)):
+        best = min(timeit.repeat(lambda: func(rows), repeat=repeat, number=number))
+        per_item = best / number / count * 1e6
+        print(f"{name:>6}: {per_item:.2f} us/item ({count} items)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
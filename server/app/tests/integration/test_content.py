@@ -1,9 +1,17 @@
+import json
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 from app.models.content import Content
+from app.models.url_metadata import UrlMetadata
+from app.services import post
+from app.util.fetcher import UrlFetcher
+from app.util.metadata_cache import MetadataCache
+from config import get_settings
 from fastapi import HTTPException
 from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
 
@@ -175,6 +183,44 @@ async def test_analyze_fail_with_exists_content(
     assert response.json()["detail"] == "Content already exists"
 
 
+@pytest.mark.asyncio
+async def test_analyze_persists_url_metadata(
+    auth_client, db_session, test_user_persist, monkeypatch
+):
+    """
+    분석 결과(url_metadata)는 요청이 끝난 뒤 다른 세션에서도 조회됨 (commit 확인)
+    """
+    html = "<html><head><title>저장 확인</title></head><body></body></html>"
+    fetcher = UrlFetcher(
+        get_settings(),
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, html=html)),
+    )
+    monkeypatch.setattr(post, "url_fetcher", fetcher)
+    monkeypatch.setattr(
+        post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+    )
+
+    response = await auth_client.post(
+        "/api/contents/analyze?content_type=post",
+        json={"url": "https://example.com/single", "user_id": test_user_persist.id},
+    )
+    assert response.status_code == 200
+
+    response = await auth_client.post(
+        "/api/contents/analyze/batch",
+        json={"urls": ["https://example.com/batch"], "user_id": test_user_persist.id},
+    )
+    assert response.status_code == 200
+
+    await db_session.rollback()
+    async with AsyncSession(db_session.bind) as session:
+        result = await session.execute(select(UrlMetadata.url, UrlMetadata.data))
+        rows = dict(result.all())
+
+    assert set(rows) == {"https://example.com/single", "https://example.com/batch"}
+    assert rows["https://example.com/single"]["title"] == "저장 확인"
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("field", ["id", "tags"])
 @pytest.mark.parametrize(
@@ -491,3 +537,343 @@ async def test_edit_content_success(
     assert editted_content.thumbnail == "new_thumbnail"
     assert editted_content.description == "new_description"
     assert editted_content.bookmark != db_content.bookmark
+
+
+@pytest.mark.asyncio
+async def test_get_all_contents_paginated_success(
+    auth_client, test_user_persist_with_content
+):
+    """
+    limit 지정 시 cursor pagination -> 200
+    페이지를 끝까지 넘기면 중복 없이 전체 콘텐츠를 받고 next_cursor가 None
+    """
+    url = f"/api/contents/user/{test_user_persist_with_content.id}/all"
+
+    response = await auth_client.get(url, params={"limit": 1})
+    first_page = response.json()
+
+    assert response.status_code == 200
+    assert len(first_page["contents"]) == 1
+    assert first_page["next_cursor"]
+
+    response = await auth_client.get(
+        url, params={"limit": 1, "cursor": first_page["next_cursor"]}
+    )
+    second_page = response.json()
+
+    assert response.status_code == 200
+    assert len(second_page["contents"]) == 1
+    assert second_page["contents"][0]["id"] != first_page["contents"][0]["id"]
+
+    response = await auth_client.get(
+        url, params={"limit": 1, "cursor": second_page["next_cursor"]}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"contents": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_get_all_contents_fail_with_invalid_cursor(
+    auth_client, test_user_persist_with_content
+):
+    """
+    잘못된 cursor -> 400 Bad Request
+    """
+    response = await auth_client.get(
+        f"/api/contents/user/{test_user_persist_with_content.id}/all",
+        params={"limit": 1, "cursor": "invalid"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("params", "headers"),
+    [
+        ({"stream": 1}, {}),
+        ({}, {"Accept": "application/x-ndjson"}),
+    ],
+)
+async def test_get_all_contents_stream_success(
+    auth_client, test_user_persist_with_content, params, headers
+):
+    """
+    스트리밍 모드 전체 콘텐츠 조회 -> 200, NDJSON
+    한 줄에 콘텐츠 하나씩, 일반 응답과 같은 항목을 같은 순서로 반환
+    """
+    url = f"/api/contents/user/{test_user_persist_with_content.id}/all"
+
+    response = await auth_client.get(url, params=params, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    streamed = [json.loads(line) for line in response.text.splitlines() if line]
+    expected = (await auth_client.get(url)).json()
+
+    assert [x["id"] for x in streamed] == [x["id"] for x in expected]
+
+
+@pytest.mark.asyncio
+async def test_get_all_contents_summary_and_detail_success(
+    auth_client, test_user_persist
+):
+    """
+    view=summary 목록 조회 -> body 없이 반환
+    GET /contents/{id} 상세 조회 -> body 포함해서 반환
+    """
+    body = {
+        "user_id": test_user_persist.id,
+        "url": "https://www.github.com/",
+        "title": "github",
+        "thumbnail": "",
+        "favicon": "",
+        "description": "",
+        "bookmark": False,
+        "video_length": 0,
+        "body": "full article body",
+        "tags": ["temp"],
+    }
+    response = await auth_client.post("/api/contents/save?content_type=post", json=body)
+    content_id = response.json()["id"]
+
+    response = await auth_client.get(
+        f"/api/contents/user/{test_user_persist.id}/all", params={"view": "summary"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == content_id
+    assert "body" not in response.json()[0]
+    assert response.json()[0]["tags"] == ["temp"]
+
+    response = await auth_client.get(
+        f"/api/contents/user/{test_user_persist.id}/sub",
+        params={"content_type": "post", "view": "summary"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == content_id
+    assert "body" not in response.json()[0]
+
+    response = await auth_client.get(f"/api/contents/{content_id}")
+
+    assert response.status_code == 200
+    assert response.json()["body"] == "full article body"
+
+
+@pytest.mark.asyncio
+async def test_get_content_detail_fail(auth_client):
+    """
+    존재하지 않는 콘텐츠 상세 조회 -> 404 Not Found
+    """
+    response = await auth_client.get("/api/contents/999999")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Content not found"
+
+
+@pytest.mark.asyncio
+async def test_get_all_contents_not_modified_success(
+    auth_client, test_user_persist_with_content, db_session
+):
+    """
+    같은 ETag로 재요청 시 304, 라이브러리 변경 후에는 새 ETag로 200
+    """
+    url = f"/api/contents/user/{test_user_persist_with_content.id}/all"
+    response = await auth_client.get(url)
+    etag = response.headers["etag"]
+
+    assert response.status_code == 200
+
+    response = await auth_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    async with db_session as session:
+        result = await session.execute(
+            select(Content).where(Content.user_id == test_user_persist_with_content.id)
+        )
+        content_id = result.unique().scalars().first().id
+
+    await auth_client.post(f"/api/contents/{content_id}/bookmark")
+    response = await auth_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_sync_contents_success(
+    auth_client, test_user_persist_with_content, db_session
+):
+    """
+    since 없이 요청 -> 전체 라이브러리(reset), 이후 변경분만 반환하고 삭제는 tombstone으로 반환
+    """
+    url = f"/api/contents/user/{test_user_persist_with_content.id}/sync"
+    response = await auth_client.get(url)
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert response_json["reset"]
+    assert len(response_json["contents"]) > 1
+
+    contents = response_json["contents"]
+    bookmarked_id, deleted_id = contents[0]["id"], contents[1]["id"]
+
+    await auth_client.post(f"/api/contents/{bookmarked_id}/bookmark")
+    await auth_client.delete(f"/api/contents/{deleted_id}")
+    response = await auth_client.get(url, params={"since": response_json["sync_token"]})
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert not response_json["reset"]
+    assert [x["id"] for x in response_json["contents"]] == [bookmarked_id]
+    assert response_json["deleted_contents"] == [deleted_id]
+    assert {x["content_id"] for x in response_json["links"]} <= {bookmarked_id}
+
+    response = await auth_client.get(url, params={"since": response_json["sync_token"]})
+
+    assert response.json()["contents"] == []
+    assert response.json()["deleted_contents"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_contents_success(auth_client, test_user_persist):
+    """
+    저장한 콘텐츠를 전문 검색(title, tag, body)으로 찾고, 관련도 순 정렬 + limit 적용
+    """
+    for url, title, body, tags in [
+        ("https://example.com/1", "async python guide", "event loop", ["python"]),
+        ("https://example.com/2", "rust book", "python bindings", ["rust"]),
+        ("https://example.com/3", "cooking", "kimchi", ["food"]),
+    ]:
+        await auth_client.post(
+            "/api/contents/save?content_type=post",
+            json={
+                "url": url,
+                "title": title,
+                "thumbnail": "",
+                "favicon": "",
+                "description": "",
+                "bookmark": False,
+                "video_length": 0,
+                "body": body,
+                "tags": tags,
+            }
+            | {"user_id": test_user_persist.id},
+        )
+
+    url = f"/api/contents/user/{test_user_persist.id}/search"
+    response = await auth_client.get(f"{url}/python", params={"mode": "fts"})
+
+    assert response.status_code == 200
+    assert [x["title"] for x in response.json()["contents"]] == [
+        "async python guide",
+        "rust book",
+    ]
+
+    response = await auth_client.get(
+        f"{url}/python -rust", params={"mode": "fts", "limit": 1}
+    )
+
+    assert [x["title"] for x in response.json()["contents"]] == ["async python guide"]
+
+    response = await auth_client.get(f"{url}/kim", params={"mode": "like"})
+
+    assert response.json()["contents"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_contents_trgm_success(auth_client, test_user_persist):
+    """
+    trgm 모드: 공백 없는 한국어 부분 문자열, 오타(pyhton) 검색
+    """
+    for url, title, tags in [
+        ("https://example.com/1", "파이썬비동기프로그래밍", ["개발"]),
+        ("https://example.com/2", "python asyncio tutorial", ["python"]),
+    ]:
+        await auth_client.post(
+            "/api/contents/save?content_type=post",
+            json={
+                "url": url,
+                "title": title,
+                "thumbnail": "",
+                "favicon": "",
+                "description": "",
+                "bookmark": False,
+                "video_length": 0,
+                "body": "",
+                "tags": tags,
+                "user_id": test_user_persist.id,
+            },
+        )
+
+    url = f"/api/contents/user/{test_user_persist.id}/search"
+    response = await auth_client.get(f"{url}/비동기", params={"mode": "trgm"})
+
+    assert response.status_code == 200
+    assert [x["title"] for x in response.json()["contents"]] == [
+        "파이썬비동기프로그래밍"
+    ]
+
+    response = await auth_client.get(
+        f"{url}/pyhton", params={"mode": "trgm", "threshold": 0.3}
+    )
+
+    assert [x["title"] for x in response.json()["contents"]] == [
+        "python asyncio tutorial"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_contents_memory_success(auth_client, test_user_persist):
+    """
+    memory 모드: 단어 prefix + 한국어 bigram 검색(최신순), 삭제 후 바로 검색 결과에서 제외
+    """
+    content_ids = []
+    for url, title, tags in [
+        ("https://example.com/1", "파이썬비동기프로그래밍", ["개발"]),
+        ("https://example.com/2", "python asyncio tutorial", ["비동기"]),
+    ]:
+        response = await auth_client.post(
+            "/api/contents/save?content_type=post",
+            json={
+                "url": url,
+                "title": title,
+                "thumbnail": "",
+                "favicon": "",
+                "description": "",
+                "bookmark": False,
+                "video_length": 0,
+                "body": "",
+                "tags": tags,
+                "user_id": test_user_persist.id,
+            },
+        )
+        content_ids.append(response.json()["id"])
+
+    url = f"/api/contents/user/{test_user_persist.id}/search"
+    response = await auth_client.get(f"{url}/비동기", params={"mode": "memory"})
+
+    assert response.status_code == 200
+    assert [x["title"] for x in response.json()["contents"]] == [
+        "python asyncio tutorial",
+        "파이썬비동기프로그래밍",
+    ]
+
+    response = await auth_client.get(f"{url}/asy tut", params={"mode": "memory"})
+
+    assert [x["title"] for x in response.json()["contents"]] == [
+        "python asyncio tutorial"
+    ]
+
+    await auth_client.delete(f"/api/contents/{content_ids[1]}")
+    response = await auth_client.get(f"{url}/비동기", params={"mode": "memory"})
+
+    assert [x["title"] for x in response.json()["contents"]] == [
+        "파이썬비동기프로그래밍"
+    ]
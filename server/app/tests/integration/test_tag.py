@@ -196,3 +196,53 @@ async def test_update_tag_fail_with_invalid_tag_id(
         response.json()["detail"]
         == f"Tag id '{fake_tag_id}' does not exist for user id '{test_user_persist_with_content.id}'"
     )
+
+
+@pytest.mark.asyncio
+async def test_complete_tags_success(auth_client, test_user_persist):
+    """
+    태그 자동완성: prefix(대소문자 무시, 조합 중인 한글 포함)로 시작하는 태그를 사용 횟수 순 반환
+    """
+    for url, tags in [
+        ("https://example.com/1", ["Python", "하늘", "한국"]),
+        ("https://example.com/2", ["python-web", "Python", "한국"]),
+        ("https://example.com/3", ["한국", "pytorch"]),
+    ]:
+        response = await auth_client.post(
+            "/api/contents/save?content_type=post",
+            json={
+                "url": url,
+                "title": url,
+                "thumbnail": "",
+                "favicon": "",
+                "description": "",
+                "bookmark": False,
+                "video_length": 0,
+                "body": "",
+                "tags": tags,
+                "user_id": test_user_persist.id,
+            },
+        )
+        assert response.status_code == 200
+
+    url = f"/api/tags/user/{test_user_persist.id}/complete"
+    response = await auth_client.get(url, params={"prefix": "PY"})
+
+    assert response.status_code == 200
+    assert [(x["tagname"], x["count"]) for x in response.json()] == [
+        ("Python", 2),
+        ("pytorch", 1),
+        ("python-web", 1),
+    ]
+
+    response = await auth_client.get(url, params={"prefix": "하", "limit": 1})
+
+    assert [x["tagname"] for x in response.json()] == ["한국"]
+
+    response = await auth_client.get(url, params={"prefix": "한"})
+
+    assert [x["tagname"] for x in response.json()] == ["한국", "하늘"]
+
+    response = await auth_client.get(url, params={"prefix": "rust"})
+
+    assert response.json() == []
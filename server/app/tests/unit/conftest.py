@@ -0,0 +1,34 @@
+import pytest
+from app.services import post
+from app.util.backoff import FailureBackoff
+from app.util.metadata_cache import MetadataCache
+from config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def redirect_cache(monkeypatch):
+    """
+    테스트마다 빈 리디렉션 캐시 사용 (모듈 전역 캐시가 다른 테스트 결과를 재사용하지 않도록)
+    """
+    cache = MetadataCache(ttl=get_settings().REDIRECT_CACHE_TTL, max_bytes=1 << 20)
+    monkeypatch.setattr(post, "redirect_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def analyze_backoff(monkeypatch):
+    """
+    테스트마다 빈 실패 기록 사용 -> (url_backoff, host_backoff)
+    """
+    settings = get_settings()
+    backoffs = (
+        FailureBackoff(settings.ANALYZE_BACKOFF_BASE, settings.ANALYZE_BACKOFF_MAX),
+        FailureBackoff(
+            settings.ANALYZE_BACKOFF_BASE,
+            settings.ANALYZE_BACKOFF_MAX,
+            threshold=settings.ANALYZE_HOST_FAILURE_THRESHOLD,
+        ),
+    )
+    monkeypatch.setattr(post, "url_backoff", backoffs[0])
+    monkeypatch.setattr(post, "host_backoff", backoffs[1])
+    return backoffs
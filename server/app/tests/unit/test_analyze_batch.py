@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+from app.services import post, video
+from app.services.content import ContentService
+from app.services.post import PostService
+from app.services.video import VIDEOS_LIST_MAX_IDS, VideoService
+from app.tests.unit.test_metadata_cache import FakeMetadataStore
+from app.util.fetcher import UrlFetcher
+from app.util.metadata_cache import MetadataCache
+from config import get_settings
+from fastapi import HTTPException
+
+## batch analyze unit test
+# 1. 포스트: 같은 페이지(정규화 URL)는 한 번만 조회, 동시 실행 수 제한, URL별 결과
+# 2. 포스트: 저장된 결과 재사용, 새 결과는 한 번에 저장
+# 3. 영상: 50개씩 묶어 videos.list 호출, 없는 영상은 404
+# 4. HTTPException이 아닌 실패는 고정 메시지만 응답 (외부 API 오류 내용 노출 안 함)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeMetadataStore()
+    for module in (post, video):
+        monkeypatch.setattr(module, "MetadataService", store)
+        monkeypatch.setattr(
+            module, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+        )
+    return store
+
+
+@pytest.mark.asyncio
+async def test_analyze_posts(monkeypatch, store):
+    requests = []
+    running = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal running, peak
+        requests.append(str(request.url))
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if request.url.host == "down.example.com":
+            return httpx.Response(500)
+        return httpx.Response(200, html=f"<title>{request.url.path}</title>")
+
+    fetcher = UrlFetcher(get_settings(), transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(post, "url_fetcher", fetcher)
+
+    urls = [f"https://site{i}.example.com/p{i}" for i in range(6)]
+    urls += ["https://site0.example.com/p0?utm_source=x", "https://down.example.com/"]
+    results = await PostService.analyze_posts(urls, db=object(), concurrency=2)
+
+    assert list(results) == urls
+    assert results[urls[0]]["title"] == results[urls[6]]["title"] == "/p0"
+    # 조회 실패는 빈 정보로 반환하고 저장하지 않음
+    assert results["https://down.example.com/"]["title"] == ""
+    assert peak <= 2
+    assert not any("utm_source" in url for url in requests)
+    assert set(store.rows) == {f"https://site{i}.example.com/p{i}" for i in range(6)}
+
+    # 저장된 결과(fresh)는 다시 조회하지 않음
+    requests.clear()
+    monkeypatch.setattr(
+        post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+    )
+    results = await PostService.analyze_posts(urls[:6], db=object(), concurrency=2)
+
+    assert requests == []
+    assert results[urls[3]]["title"] == "/p3"
+
+
+@pytest.mark.asyncio
+async def test_analyze_videos(monkeypatch, store):
+    calls = []
+
+    async def fetch_video_infos(video_ids):
+        calls.append(list(video_ids))
+        return {
+            video_id: {"title": video_id, "length": 1}
+            for video_id in video_ids
+            if video_id != "missing0000"
+        }
+
+    monkeypatch.setattr(VideoService, "_fetch_video_infos", fetch_video_infos)
+
+    video_ids = [f"v{i:010d}" for i in range(VIDEOS_LIST_MAX_IDS + 10)]
+    urls = [f"https://youtu.be/{video_id}" for video_id in video_ids]
+    urls += [
+        f"https://www.youtube.com/watch?v={video_ids[0]}",
+        "https://youtu.be/missing0000",
+    ]
+    results = await VideoService.analyze_videos(urls, object(), get_settings())
+
+    assert sorted(len(chunk) for chunk in calls) == [11, VIDEOS_LIST_MAX_IDS]
+    assert results[urls[0]]["title"] == results[urls[-2]]["title"] == video_ids[0]
+    assert isinstance(results[urls[-1]], HTTPException)
+    assert results[urls[-1]].status_code == 404
+    assert len(store.rows) == len(video_ids)
+
+    calls.clear()
+    await VideoService.analyze_videos(urls[:3], object(), get_settings())
+    assert calls == []
+
+
+def test_analyze_error_hides_details():
+    request = httpx.Request("GET", "https://api.example.com/videos?key=SECRET123")
+    error = httpx.HTTPStatusError(
+        "quota exceeded", request=request, response=httpx.Response(403)
+    )
+
+    assert ContentService._analyze_error(error) == {
+        "status_code": 422,
+        "detail": "Failed to analyze URL",
+    }
+    assert ContentService._analyze_error(
+        HTTPException(status_code=404, detail="Video not found on YouTube")
+    ) == {"status_code": 404, "detail": "Video not found on YouTube"}
@@ -0,0 +1,187 @@
+import asyncio
+
+import httpx
+import pytest
+from app.services import post
+from app.services.post import PostService
+from app.util.backoff import FailureBackoff
+from app.util.fetcher import UrlFetcher
+from app.util.metadata_cache import MetadataCache
+from config import get_settings
+
+## failure backoff unit test
+# 1. 실패할 때마다 대기 시간 2배(최대 max_delay), 성공하면 기록 제거
+# 2. threshold 전까지는 실패를 기록만 하고 막지 않음
+# 3. 분석: 실패한 URL은 backoff 동안 조회 없이 기본 정보 반환
+# 4. 분석: 연결 실패가 반복된 host는 다른 URL도 조회하지 않음
+# 5. 분석: host 실패는 원래 URL이 아니라 실제로 실패한 host(리디렉션 대상)에 기록
+# 6. 분석: host별 대기 중 deadline 초과는 실패로 기록하지 않음
+# 7. 분석: 페이지가 2xx가 아니면(차단, 점검 페이지) 파싱, 캐시, 저장 없이 URL 실패로 기록
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_exponential_backoff():
+    clock = FakeClock()
+    backoff = FailureBackoff(base=10, max_delay=35, clock=clock)
+
+    for delay in (10, 20, 35, 35):
+        backoff.failed("a")
+        clock.now += delay - 1
+        assert backoff.blocked("a")
+        clock.now += 1
+        assert not backoff.blocked("a")
+
+    backoff.failed("a")
+    backoff.succeeded("a")
+    assert not backoff.blocked("a")
+    assert backoff.stats() == {"entries": 0, "blocked": 0, "suppressed": 4}
+
+
+def test_threshold():
+    clock = FakeClock()
+    backoff = FailureBackoff(base=10, max_delay=100, threshold=3, clock=clock)
+
+    backoff.failed("host")
+    backoff.failed("host")
+    assert not backoff.blocked("host")
+
+    backoff.failed("host")
+    assert backoff.blocked("host")
+    backoff.failed("host")
+    clock.now = 19
+    assert backoff.blocked("host")
+
+
+@pytest.fixture
+def analyze_with(monkeypatch):
+    def use(handler, **overrides):
+        settings = get_settings().model_copy(update=overrides)
+        fetcher = UrlFetcher(settings, transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(post, "url_fetcher", fetcher)
+        monkeypatch.setattr(
+            post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+        )
+        return fetcher
+
+    return use
+
+
+@pytest.mark.asyncio
+async def test_analyze_skips_failed_url(analyze_with, analyze_backoff):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(404 if request.url.path == "/gone" else 200)
+
+    analyze_with(handler)
+
+    for _ in range(3):
+        info = await PostService._analyze("https://example.com/gone")
+        assert info["title"] == ""
+        assert info["favicon"] == "https://example.com/favicon.ico"
+    await PostService._analyze("https://example.com/ok")
+
+    assert requests == ["/gone", "/ok", "/ok"]
+    assert analyze_backoff[0].stats()["suppressed"] == 2
+    assert analyze_backoff[1].stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_skips_failing_host(analyze_with, analyze_backoff):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.host)
+        if request.url.host == "down.example.com":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200)
+
+    analyze_with(handler)
+
+    threshold = get_settings().ANALYZE_HOST_FAILURE_THRESHOLD
+    for i in range(threshold + 2):
+        info = await PostService._analyze(f"https://down.example.com/{i}")
+        assert info["favicon"] == "https://down.example.com/favicon.ico"
+    await PostService._analyze("https://example.com/")
+
+    assert requests.count("down.example.com") == threshold
+    assert requests.count("example.com") == 2
+    assert analyze_backoff[1].stats()["blocked"] == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_records_redirect_target_host(analyze_with, analyze_backoff):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "short.example.com":
+            return httpx.Response(
+                301, headers={"Location": f"https://down.example.com{request.url.path}"}
+            )
+        raise httpx.ConnectError("connection refused", request=request)
+
+    analyze_with(handler)
+
+    threshold = get_settings().ANALYZE_HOST_FAILURE_THRESHOLD
+    for i in range(threshold):
+        await PostService._analyze(f"https://short.example.com/{i}")
+
+    host_backoff = analyze_backoff[1]
+    assert host_backoff.blocked("down.example.com")
+    assert not host_backoff.blocked("short.example.com")
+    assert list(host_backoff._failures) == ["down.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_ignores_timeout_in_host_queue(analyze_with, analyze_backoff):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    fetcher = analyze_with(
+        handler, FETCH_MAX_CONNECTIONS_PER_HOST=1, POST_ANALYZE_DEADLINE=0.05
+    )
+    url_backoff, host_backoff = analyze_backoff
+
+    # 다른 요청이 host slot을 잡고 있는 동안 대기만 하다 deadline 초과
+    async with fetcher.host_slot("https://slow.example.com/"):
+        await PostService._analyze("https://slow.example.com/b")
+    assert url_backoff.stats()["entries"] == host_backoff.stats()["entries"] == 0
+
+    # 요청 중 deadline 초과는 기록
+    await PostService._analyze("https://slow.example.com/a")
+    assert list(url_backoff._failures) == ["https://slow.example.com/a"]
+    assert host_backoff._failures["slow.example.com"][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_rejects_error_page(analyze_with, analyze_backoff):
+    requests = []
+    blocked = "<html><head><title>Access denied</title></head></html>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        # 리디렉션 확인은 통과, 페이지 조회는 차단 페이지
+        if requests.count(request.url.path) == 1:
+            return httpx.Response(200)
+        return httpx.Response(503, html=blocked)
+
+    analyze_with(handler)
+    url = "https://example.com/blocked"
+
+    info, update = await PostService._lookup_post_info(url, url, None)
+    assert info == PostService._empty_post_info(url)
+    assert update is None
+    assert post.url_metadata_cache.get(url) is None
+    assert analyze_backoff[0].blocked(url)
+    assert analyze_backoff[1].stats()["entries"] == 0
+
+    # backoff 동안은 다시 조회하지 않음
+    await PostService._analyze(url)
+    assert requests == ["/blocked", "/blocked"]
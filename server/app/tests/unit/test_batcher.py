@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from app.util.batcher import MicroBatcher
+
+## micro batcher unit test
+# 1. window 안에 들어온 key는 한 번에 조회, 같은 key는 한 번만, 결과에 없으면 None
+# 2. max_batch개가 모이면 window를 기다리지 않고 바로 조회
+# 3. 조회 실패는 batch의 모든 호출자에게 전달, 한 호출자 취소는 다른 호출자에 영향 없음
+# 4. 조회 중인 key는 새 batch 없이 결과 공유, 끝나면 결과를 저장하지 않음
+# 5. 조회 task가 취소되면 호출자도 취소, 같은 key는 다음 요청에서 새로 조회
+
+
+def _batcher(max_batch: int = 3, window: float = 0.01, fail: bool = False):
+    calls = []
+
+    async def fetch(keys):
+        calls.append(keys)
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("quota exceeded")
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    return MicroBatcher(fetch, max_batch, window), calls
+
+
+@pytest.mark.asyncio
+async def test_window_merges_requests():
+    batcher, calls = _batcher()
+
+    results = await asyncio.gather(
+        batcher.load("a"), batcher.load("missing"), batcher.load("a")
+    )
+
+    assert results == ["A", None, "A"]
+    assert calls == [["a", "missing"]]
+    assert batcher.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_max_batch_flushes_immediately():
+    batcher, calls = _batcher(max_batch=2, window=10)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.load(key) for key in "abcd")), timeout=1
+    )
+
+    assert results == ["A", "B", "C", "D"]
+    assert calls == [["a", "b"], ["c", "d"]]
+
+
+@pytest.mark.asyncio
+async def test_failure_and_cancel():
+    batcher, _ = _batcher(fail=True)
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(batcher.load("a"), batcher.load("b"))
+
+    batcher, calls = _batcher()
+    cancelled = asyncio.ensure_future(batcher.load("a"))
+    waiting = asyncio.ensure_future(batcher.load("a"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiting == "A"
+    assert calls == [["a"]]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_key_is_shared():
+    batcher, calls = _batcher(window=0)
+
+    first = asyncio.ensure_future(batcher.load("a"))
+    await asyncio.sleep(0.005)  # 첫 batch 조회 중
+    assert await asyncio.gather(first, batcher.load("a")) == ["A", "A"]
+    assert calls == [["a"]]
+
+    assert await batcher.load("a") == "A"
+    assert calls == [["a"], ["a"]]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_fetch_cancels_callers():
+    started = asyncio.Event()
+
+    async def fetch(keys):
+        started.set()
+        await asyncio.sleep(10)
+
+    batcher = MicroBatcher(fetch, max_batch=2, window=0.01)
+    callers = [asyncio.create_task(batcher.load(key)) for key in ("a", "b")]
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*callers, return_exceptions=True), timeout=1
+    )
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert batcher._in_flight == {}
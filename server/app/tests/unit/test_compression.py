@@ -0,0 +1,139 @@
+import gzip
+import json
+
+import pytest
+from app.middleware.compression import (
+    ENCODERS,
+    CompressedCache,
+    CompressionMiddleware,
+    select_encoding,
+)
+from config import Settings
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+## response compression unit test
+# 1. Accept-Encoding q값/선호 순서에 따라 인코딩 선택
+# 2. minimum_size 미만이면 압축하지 않음
+# 3. 큰 JSON 응답은 압축 + Content-Length 재계산 + Vary, strong ETag는 weak로 변경
+# 4. 스트리밍 응답은 chunk 단위로 압축
+# 5. 같은 ETag 응답은 캐시된 압축 bytes 재사용
+# 6. LRU 캐시는 max_bytes를 넘지 않음
+
+BODY = json.dumps([{"id": i, "title": "title " * 10} for i in range(100)]).encode()
+
+
+def _client(**settings) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/large")
+    def large():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"1"'})
+
+    @app.get("/image")
+    def image():
+        return Response(BODY, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        lines = (json.dumps({"id": i}).encode() + b"\n" for i in range(100))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    app.add_middleware(
+        CompressionMiddleware,
+        settings=Settings(COMPRESSION_MINIMUM_SIZE=500, **settings),
+    )
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("*", next(iter(ENCODERS))),
+    ],
+)
+def test_select_encoding(accept_encoding, expected):
+    assert select_encoding(accept_encoding) == expected
+
+
+def test_select_encoding_prefers_brotli():
+    pytest.importorskip("brotli")
+
+    assert select_encoding("gzip, deflate, br") == "br"
+    assert select_encoding("gzip, br;q=0.5") == "gzip"
+
+
+@pytest.mark.parametrize("path", ["/small", "/image"])
+def test_skip_compression(path):
+    response = _client().get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_compress_large_response():
+    response = _client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"1"'
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+def test_compress_streaming_response():
+    response = _client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 100
+
+
+def test_reuse_compressed_body():
+    client = _client()
+    client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    middleware = client.app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+    cached = middleware.cache.get('"1"', "gzip")
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert gzip.decompress(cached) == BODY
+    assert response.content == BODY
+    assert middleware.cache.size == len(cached)
+
+
+def test_compressed_cache_eviction():
+    cache = CompressedCache(max_bytes=10)
+    cache.put('"1"', "gzip", b"12345")
+    cache.put('"2"', "gzip", b"12345")
+    cache.get('"1"', "gzip")
+    cache.put('"3"', "gzip", b"12345")
+
+    assert cache.get('"2"', "gzip") is None
+    assert cache.get('"1"', "gzip") == b"12345"
+    assert cache.size == 10
+
+
+def test_not_modified_etag_matches_compressed_response():
+    app = FastAPI()
+
+    @app.get("/cached")
+    def cached():
+        return Response(status_code=304, headers={"ETag": '"1"'})
+
+    app.add_middleware(CompressionMiddleware, settings=Settings())
+    response = TestClient(app).get("/cached", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"1"'
@@ -0,0 +1,52 @@
+import pytest
+from app.util.etag import etag_matches, make_library_etag
+from starlette.requests import Request
+
+## library ETag unit test
+# 1. 같은 버전, 같은 요청 형태면 같은 ETag
+# 2. 버전, 쿼리(view/cursor), Accept가 다르면 다른 ETag
+# 3. If-None-Match 비교: 목록, W/ prefix, * 지원
+
+
+def _request(query: str = "", headers: dict = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/contents/user/1/all",
+            "query_string": query.encode("ascii"),
+            "headers": [
+                (key.lower().encode("ascii"), value.encode("ascii"))
+                for key, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+def test_make_library_etag():
+    etag = make_library_etag(_request(), 1, 3)
+
+    assert etag.startswith('"1-3-') and etag.endswith('"')
+    assert etag == make_library_etag(_request(), 1, 3)
+    assert etag != make_library_etag(_request(), 1, 4)
+    assert etag != make_library_etag(_request("view=summary"), 1, 3)
+    assert etag != make_library_etag(
+        _request(headers={"Accept": "application/x-ndjson"}), 1, 3
+    )
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matched",
+    [
+        (None, False),
+        ('"1-3-abc"', True),
+        ('W/"1-3-abc"', True),
+        ('"1-2-abc", "1-3-abc"', True),
+        ("*", True),
+        ('"1-2-abc"', False),
+    ],
+)
+def test_etag_matches(if_none_match, matched):
+    headers = {"If-None-Match": if_none_match} if if_none_match else {}
+
+    assert etag_matches(_request(headers=headers), '"1-3-abc"') == matched
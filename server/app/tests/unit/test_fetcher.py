@@ -0,0 +1,360 @@
+import asyncio
+import time
+
+import httpcore
+import httpx
+import pytest
+from app.services import post
+from app.services.post import PostService
+from app.util.fetcher import (
+    CachingNetworkBackend,
+    DnsCache,
+    UrlFetcher,
+    response_text,
+)
+from app.util.metadata_cache import MetadataCache
+from config import get_settings
+from fastapi import HTTPException
+
+## async url fetcher unit test
+# 1. 리디렉션 수동 추적: 상대 경로 Location, intent:// fallback URL
+# 2. 분석 전체 deadline 초과 시 빈 정보 반환 (event loop는 막히지 않음)
+# 3. host별 동시 요청 수 제한
+# 4. charset 없는 응답은 byte로 인코딩 추정
+# 5. head만 필요하면 </head>(청크 경계에 걸쳐도) 또는 byte 상한까지만 받고 중단
+# 6. 리디렉션 결과 캐시: 같은 링크/거친 hop은 다시 따라가지 않음, 실패는 짧은 TTL
+# 7. DNS 캐시(연결 실패 시 다음 주소, 모두 실패하면 캐시 제거), keep-alive 연결 재사용 집계
+# 8. 같은 host 요청 시작 간격 유지, 대기 시간 집계
+# 9. 리디렉션 hop의 작은 body는 읽고 버려 연결 재사용, 상한을 넘으면 연결 종료
+
+
+def _fetcher(handler, **overrides) -> UrlFetcher:
+    settings = get_settings().model_copy(update=overrides)
+    return UrlFetcher(settings, transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def use_fetcher(monkeypatch):
+    def use(fetcher: UrlFetcher):
+        monkeypatch.setattr(post, "url_fetcher", fetcher)
+        return fetcher
+
+    return use
+
+
+@pytest.mark.asyncio
+async def test_follow_redirects_until_valid(use_fetcher):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/short":
+            return httpx.Response(301, headers={"Location": "/long"})
+        if request.url.path == "/long":
+            return httpx.Response(200, text="ok")
+        return httpx.Response(
+            302,
+            headers={
+                "Location": "intent://open#Intent;scheme=app;"
+                "S.browser_fallback_url=https%3A%2F%2Fm.example.com%2Fpost;end"
+            },
+        )
+
+    use_fetcher(_fetcher(handler))
+
+    url = await PostService._follow_redirects_until_valid("https://example.com/short")
+    assert url == "https://example.com/long"
+
+    url = await PostService._follow_redirects_until_valid("https://example.com/app")
+    assert url == "https://m.example.com/post"
+
+
+@pytest.mark.asyncio
+async def test_analyze(use_fetcher):
+    html = """
+    <html><head>
+        <title>fallback</title>
+        <meta property="og:title" content="제목">
+        <meta property="og:description" content="설명">
+        <link rel="icon" href="/icon.png">
+    </head><body><article>본문</article></body></html>
+    """
+    use_fetcher(
+        _fetcher(
+            lambda request: httpx.Response(
+                200, html=html, headers={"Content-Type": "text/html; charset=utf-8"}
+            )
+        )
+    )
+
+    info = await PostService._analyze("https://example.com/post")
+
+    assert info["title"] == "제목"
+    assert info["description"] == "설명"
+    assert info["body"] == "본문"
+    assert info["favicon"] == "https://example.com/icon.png"
+
+
+@pytest.mark.asyncio
+async def test_analyze_deadline(use_fetcher):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    use_fetcher(_fetcher(handler, POST_ANALYZE_DEADLINE=0.05))
+
+    info = await PostService._analyze("https://slow.example.com/post")
+
+    assert info["title"] == ""
+    assert info["favicon"] == "https://slow.example.com/favicon.ico"
+
+
+@pytest.mark.asyncio
+async def test_host_slot_limits_concurrency():
+    active, peak = 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200)
+
+    fetcher = _fetcher(handler, FETCH_MAX_CONNECTIONS_PER_HOST=2)
+    await asyncio.gather(
+        *[fetcher.get(f"https://example.com/{i}") for i in range(6)],
+        fetcher.get("https://other.com/"),
+    )
+    await fetcher.aclose()
+
+    assert peak == 3
+    assert fetcher._hosts == {}
+
+
+def test_response_text_detects_encoding():
+    body = "한국어 페이지입니다. 인코딩을 추정합니다.".encode("euc-kr")
+    response = httpx.Response(200, content=body, headers={"Content-Type": "text/html"})
+
+    assert "한국어" in response_text(response)
+
+
+def _streaming_handler(chunks, sent):
+    async def stream():
+        for chunk in chunks:
+            sent.append(chunk)
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=stream(), headers={"Content-Type": "text/html"}
+        )
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_get_head_stops_at_head_end():
+    chunks = [b"<html><head><title>T</title></he", b"ad><body>"] + [b"x" * 1024] * 100
+    sent = []
+    fetcher = _fetcher(_streaming_handler(chunks, sent))
+
+    response, body = await fetcher.get_head("https://example.com/", max_bytes=1 << 20)
+    await fetcher.aclose()
+
+    assert response.status_code == 200
+    assert body.endswith(b"</head><body>")
+    assert len(sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_head_byte_cap():
+    sent = []
+    fetcher = _fetcher(_streaming_handler([b"<html>" + b"x" * 1000] * 100, sent))
+
+    _, body = await fetcher.get_head("https://example.com/", max_bytes=2500)
+    await fetcher.aclose()
+
+    assert len(body) == 2500
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_analyze_head_only(use_fetcher, monkeypatch):
+    html = (
+        '<html><head><meta property="og:title" content="OG"></head>'
+        "<body><article>본문</article></body></html>"
+    )
+    use_fetcher(_fetcher(lambda request: httpx.Response(200, html=html)))
+    monkeypatch.setattr(
+        post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+    )
+
+    head = await PostService._analyze("https://example.com/a", include_body=False)
+    full = await PostService._analyze("https://example.com/a")
+
+    assert head["title"] == full["title"] == "OG"
+    assert head["body"] == "" and head["head_only"]
+    # head만 저장된 상태에서 본문 요청 시 다시 조회
+    assert full["body"] == "본문" and "head_only" not in full
+    assert (
+        await PostService._analyze("https://example.com/a", include_body=False) == full
+    )
+
+
+@pytest.mark.asyncio
+async def test_redirect_cache(use_fetcher, redirect_cache):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/s":
+            return httpx.Response(301, headers={"Location": "/mid"})
+        if request.url.path == "/mid":
+            return httpx.Response(302, headers={"Location": "/post"})
+        if request.url.path == "/post":
+            return httpx.Response(200)
+        return httpx.Response(404)
+
+    use_fetcher(_fetcher(handler))
+
+    for url in ("https://example.com/s", "https://example.com/s?utm_source=x"):
+        assert await PostService._follow_redirects_until_valid(url) == (
+            "https://example.com/post"
+        )
+    assert await PostService._follow_redirects_until_valid(
+        "https://example.com/mid"
+    ) == ("https://example.com/post")
+    assert requests == ["/s", "/mid", "/post"]
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as e:
+            await PostService._follow_redirects_until_valid("https://example.com/gone")
+        assert e.value.status_code == 422
+    assert requests.count("/gone") == 1
+
+    # 실패는 REDIRECT_NEGATIVE_TTL만 유지
+    elapsed = get_settings().REDIRECT_NEGATIVE_TTL + 1
+    redirect_cache.clock = lambda: time.monotonic() + elapsed
+    with pytest.raises(HTTPException):
+        await PostService._follow_redirects_until_valid("https://example.com/gone")
+    await PostService._follow_redirects_until_valid("https://example.com/s")
+    assert requests.count("/gone") == 2
+    assert requests.count("/s") == 1
+
+
+class FakeNetworkBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, down=()):
+        self.down = set(down)
+        self.connected = []
+
+    async def connect_tcp(self, host, port, timeout=None, *args):
+        self.connected.append(host)
+        if host in self.down:
+            raise httpcore.ConnectError(f"{host} down")
+        return object()
+
+
+@pytest.mark.asyncio
+async def test_dns_cache(monkeypatch):
+    lookups = []
+
+    async def resolve(host, port):
+        lookups.append(host)
+        return ["10.0.0.1", "10.0.0.2"]
+
+    dns = DnsCache(ttl=60)
+    monkeypatch.setattr(dns, "_lookup", resolve)
+
+    backend = CachingNetworkBackend(FakeNetworkBackend(down={"10.0.0.1"}), dns)
+    await backend.connect_tcp("example.com", 443)
+    await backend.connect_tcp("example.com", 443)
+    await backend.connect_tcp("127.0.0.1", 80)
+
+    assert lookups == ["example.com"]
+    assert backend.backend.connected == ["10.0.0.1", "10.0.0.2"] * 2 + ["127.0.0.1"]
+    assert backend.connections == 3
+    assert dns.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    backend.backend.down.add("10.0.0.2")
+    with pytest.raises(httpcore.ConnectError):
+        await backend.connect_tcp("example.com", 443)
+    assert dns.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_connection_reuse():
+    async def handle(reader, writer):
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    fetcher = UrlFetcher(get_settings())
+    try:
+        for i in range(4):
+            response = await fetcher.get(f"http://localhost:{port}/{i}")
+            assert response.text == "ok"
+    finally:
+        await fetcher.aclose()
+        server.close()
+
+    stats = fetcher.stats()
+    assert stats["requests"] == 4
+    assert stats["connections"] == 1
+    assert stats["reuse_ratio"] == 0.75
+    assert stats["dns"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_host_min_interval():
+    fetcher = _fetcher(
+        lambda request: httpx.Response(200), FETCH_HOST_MIN_INTERVAL=0.05
+    )
+
+    started = time.monotonic()
+    await asyncio.gather(*[fetcher.get(f"https://example.com/{i}") for i in range(3)])
+    await fetcher.get("https://other.com/")
+    elapsed = time.monotonic() - started
+    await fetcher.aclose()
+
+    assert elapsed >= 0.09  # 같은 host 3건: 0, 0.05, 0.1초에 시작
+    stats = fetcher.stats()
+    assert stats["requests"] == 4
+    assert stats["max_queue_wait"] >= 0.09
+
+
+async def _redirect_server(body: bytes):
+    async def handle(reader, writer):
+        while request := await reader.readuntil(b"\r\n\r\n"):
+            path = request.split(b" ")[1]
+            if path == b"/final":
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            else:
+                writer.write(
+                    b"HTTP/1.1 302 Found\r\nLocation: /final\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+                )
+            await writer.drain()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("drain_max_bytes, connections", [(1024, 1), (10, 2)])
+async def test_redirect_drains_small_body(use_fetcher, drain_max_bytes, connections):
+    server = await _redirect_server(b"<a href='/final'>moved</a>")
+    port = server.sockets[0].getsockname()[1]
+    settings = get_settings().model_copy(
+        update={"FETCH_DRAIN_MAX_BYTES": drain_max_bytes}
+    )
+    fetcher = use_fetcher(UrlFetcher(settings))
+    try:
+        url = await PostService._walk_redirects(
+            f"http://localhost:{port}/short", max_redirects=5, hops=[]
+        )
+    finally:
+        await fetcher.aclose()
+        server.close()
+
+    assert url == f"http://localhost:{port}/final"
+    assert fetcher.stats()["requests"] == 2
+    assert fetcher.stats()["connections"] == connections
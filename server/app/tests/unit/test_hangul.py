@@ -0,0 +1,59 @@
+import unicodedata
+
+from app.services.tag import TagService
+from app.util.hangul import normalize_prefix, prefix_ranges
+from sqlalchemy.dialects.postgresql import asyncpg
+
+## tag prefix 자동완성 unit test
+# 1. prefix 정규화: NFC 조합 + 소문자
+# 2. prefix 범위: 일반 문자열, 조합 중인 한글 마지막 글자(받침 추가, 받침 이동, 단독 자음)
+# 3. 자동완성 쿼리: lower(tagname) 범위 비교, 사용 횟수 순 정렬
+
+
+def _matches(prefix: str, value: str) -> bool:
+    return any(start <= value < end for start, end in prefix_ranges(prefix))
+
+
+def test_normalize_prefix():
+    assert normalize_prefix(unicodedata.normalize("NFD", "한국")) == "한국"
+    assert normalize_prefix(" PyThon ") == "python"
+
+
+def test_prefix_ranges():
+    assert prefix_ranges("Py") == [("py", "pz")]
+    assert prefix_ranges("  ") == []
+
+    assert _matches("py", "python")
+    assert not _matches("py", "pz")
+    assert not _matches("py", "p")
+
+
+def test_prefix_ranges_hangul():
+    # 받침 없는 음절: 받침이 붙을 수 있음
+    assert _matches("하", "한국")
+    assert _matches("하", "하늘")
+    assert not _matches("하", "해")
+
+    # 받침 있는 음절: 받침이 다음 음절 초성이 될 수 있음
+    assert _matches("한", "한국")
+    assert _matches("한", "하늘")
+    assert not _matches("한", "하루")
+    assert _matches("닭", "달걀")
+
+    # 단독 자음: 다음 음절 초성 또는 앞 음절 받침
+    assert _matches("한ㄱ", "한국")
+    assert not _matches("한ㄱ", "한나")
+    assert _matches("하ㄴ", "한국")
+    assert _matches("ㄱ", "개발")
+    assert not _matches("ㄱ", "나")
+
+
+def test_complete_tags_stmt():
+    stmt = TagService._complete_tags_stmt(1, "한ㄱ", 10)
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+
+    assert "lower(tags.tagname) ~>=~" in sql
+    assert "lower(tags.tagname) ~<~" in sql
+    assert "LEFT OUTER JOIN content_tag" in sql
+    assert "ORDER BY count(content_tag.content_id) DESC" in sql
+    assert stmt.compile().params["param_1"] == 10
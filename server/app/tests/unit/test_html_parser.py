@@ -0,0 +1,63 @@
+import pytest
+from app.services.post import BODY_SELECTORS, PostService
+from app.tests.benchmark.bench_html_parser import PAGES_DIR
+from app.util.html_parser import PARSER_BACKENDS, parse_html, resolve_backend
+
+## html parser backend unit test
+# 1. backend별 title, og 정보, favicon, 본문 추출 결과가 같음 (플랫폼별 페이지)
+# 2. og:title이 비어 있으면 <title>로 대체하지 않음, rel 대소문자 무시
+# 3. 본문 텍스트에서 script/style 제외, 처음 매칭되는 selector 사용
+# 4. 설치되지 않은 backend 지정 시 ValueError
+
+BACKENDS = [
+    pytest.param(
+        backend,
+        marks=pytest.mark.skipif(
+            backend not in PARSER_BACKENDS, reason=f"{backend} not installed"
+        ),
+    )
+    for backend in ("bs4", "selectolax")
+]
+
+
+@pytest.mark.parametrize("page", sorted(path.name for path in PAGES_DIR.iterdir()))
+def test_backends_match(page):
+    html = (PAGES_DIR / page).read_text(encoding="utf-8")
+    results = [
+        PostService._parse_html(
+            "https://example.com/", "https://example.com/", html, True, backend
+        )
+        for backend in PARSER_BACKENDS
+    ]
+
+    assert results[0]["title"] and results[0]["body"]
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_document(backend):
+    html = """
+    <html><head>
+        <title> 페이지 제목 </title>
+        <meta property="og:title" content="">
+        <link rel="Shortcut Icon" href="/favicon.png">
+    </head><body>
+        <div class="post-content">두 번째</div>
+        <article>첫 <b>번째</b><script>track()</script><style>p{}</style></article>
+    </body></html>
+    """
+    document = parse_html(html, backend)
+
+    assert document.title() == "페이지 제목"
+    assert document.meta_property("og:title") == ""
+    assert document.meta_property("og:image") is None
+    assert document.icon_hrefs() == ["/favicon.png"]
+    assert document.body_text(BODY_SELECTORS) == "첫 \n번째"
+    assert document.body_text(["div.missing"]) == ""
+
+
+def test_resolve_backend():
+    assert resolve_backend("bs4") == "bs4"
+    assert resolve_backend("auto") in PARSER_BACKENDS
+    with pytest.raises(ValueError):
+        resolve_backend("html5lib")
@@ -0,0 +1,30 @@
+from app.models.library_change import LibraryEntityEnum
+from app.services.library import LibraryService
+
+## library delta sync unit test
+# 1. 같은 id의 변경이 여러 번이면 마지막 변경(수정/삭제)만 남음
+# 2. 콘텐츠와 태그는 같은 id라도 따로 취급
+
+
+def test_latest_changes():
+    content, tag = LibraryEntityEnum.CONTENT, LibraryEntityEnum.TAG
+    changes = [
+        (content, 1, False),
+        (tag, 1, False),
+        (content, 2, False),
+        (content, 1, True),
+        (tag, 3, True),
+        (tag, 3, False),
+    ]
+
+    assert LibraryService._latest_changes(changes) == {
+        content: {1: True, 2: False},
+        tag: {1: False, 3: False},
+    }
+
+
+def test_latest_changes_empty():
+    assert LibraryService._latest_changes([]) == {
+        LibraryEntityEnum.CONTENT: {},
+        LibraryEntityEnum.TAG: {},
+    }
@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from app.models.url_metadata import UrlMetadata
+from app.services import post
+from app.services.metadata import MetadataService
+from app.services.post import PostService
+from app.util.fetcher import UrlFetcher
+from app.util.metadata_cache import MetadataCache, normalize_url
+from config import get_settings
+
+## url metadata cache unit test
+# 1. URL 정규화: scheme/host 소문자, 기본 포트/fragment/추적 파라미터 제거, query 정렬
+#    si, feature 등 사이트 전용 추적 파라미터는 해당 host에서만 제거
+# 2. TTL 만료, LRU 메모리 상한, hit/miss 카운터
+# 3. 같은 URL 재분석 시 외부 요청 없이 캐시 반환, 실패 결과는 캐시하지 않음
+# 4. url_metadata: 오래된 결과는 conditional GET으로 재검증, 304면 다시 받지 않고 fetched_at만 갱신
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Example.COM:443/a?b=2&a=1#top", "https://example.com/a?a=1&b=2"),
+        ("https://example.com", "https://example.com/"),
+        ("http://example.com:8080/x", "http://example.com:8080/x"),
+        (
+            "https://blog.naver.com/post?utm_source=kakao&logNo=1&fbclid=abc",
+            "https://blog.naver.com/post?logNo=1",
+        ),
+        ("https://youtu.be/abc?si=share", "https://youtu.be/abc"),
+        (
+            "https://m.youtube.com/watch?v=abc&feature=share",
+            "https://m.youtube.com/watch?v=abc",
+        ),
+        # 사이트 전용 추적 파라미터는 다른 사이트에서 유지 (ref 등은 항상 유지)
+        (
+            "https://example.com/list?feature=new&si=1&ref=main",
+            "https://example.com/list?feature=new&ref=main&si=1",
+        ),
+        ("https://notyoutube.com/a?si=1", "https://notyoutube.com/a?si=1"),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = MetadataCache(ttl=10, max_bytes=1 << 20, clock=clock)
+    cache.put("a", {"title": "A"})
+
+    clock.now = 9
+    assert cache.get("a") == {"title": "A"}
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.size == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    value = {"title": "x" * 100}
+    cache = MetadataCache(ttl=60, max_bytes=1 << 20)
+    cache.put("a", value)
+    cache.max_bytes = cache.size * 2
+
+    cache.put("b", value)
+    cache.get("a")
+    cache.put("c", value)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == value
+    assert cache.get("c") == value
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_returns_copy():
+    cache = MetadataCache(ttl=60, max_bytes=1 << 20)
+    cache.put("a", {"title": "A"})
+
+    cache.get("a")["title"] = "changed"
+
+    assert cache.get("a") == {"title": "A"}
+
+
+@pytest.mark.asyncio
+async def test_analyze_uses_cache(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        if request.url.host == "down.example.com":
+            return httpx.Response(500)
+        return httpx.Response(200, html="<title>cached</title>")
+
+    fetcher = UrlFetcher(get_settings(), transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(post, "url_fetcher", fetcher)
+    monkeypatch.setattr(
+        post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+    )
+
+    first = await PostService._analyze("https://example.com/a?utm_source=x")
+    second = await PostService._analyze("https://EXAMPLE.com/a")
+
+    assert first["title"] == second["title"] == "cached"
+    assert len(requests) == 2  # 리디렉션 확인 + 페이지 조회 1번씩
+
+    await PostService._analyze("https://down.example.com/")
+    await PostService._analyze("https://down.example.com/")
+
+    # 실패 결과는 메타데이터 캐시에 저장하지 않음 (리디렉션 실패만 짧게 캐시되어 재요청 없음)
+    assert len(requests) == 3
+    assert (
+        post.url_metadata_cache.get(normalize_url("https://down.example.com/")) is None
+    )
+    assert post.url_metadata_cache.stats()["hits"] == 1
+
+
+class FakeMetadataStore(MetadataService):
+    """
+    url_metadata 테이블 대신 dict에 저장
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.touched = []
+
+    async def get_many(self, keys, db):
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+    async def get(self, key, db):
+        return self.rows.get(key)
+
+    async def apply(self, updates, db):
+        for item in filter(None, updates):
+            if item["data"] is None:
+                self.touched.append(item["key"])
+                continue
+
+            self.rows[item["key"]] = UrlMetadata(
+                url=item["key"],
+                data=item["data"],
+                etag=item["etag"],
+                last_modified=item["last_modified"],
+                fetched_at=datetime.now(timezone.utc),
+            )
+
+
+def test_is_fresh():
+    now = datetime.now(timezone.utc)
+    stale_after = timedelta(seconds=get_settings().METADATA_STALE_AFTER)
+
+    assert MetadataService.is_fresh(UrlMetadata(fetched_at=now))
+    assert not MetadataService.is_fresh(
+        UrlMetadata(fetched_at=now - stale_after - timedelta(seconds=1))
+    )
+    assert len(MetadataService.url_hash("https://example.com/")) == 64
+
+
+@pytest.mark.asyncio
+async def test_analyze_revalidates_stale_row(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html="<title>page</title>", headers={"ETag": '"v1"'})
+
+    store = FakeMetadataStore()
+    fetcher = UrlFetcher(get_settings(), transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(post, "url_fetcher", fetcher)
+    monkeypatch.setattr(post, "MetadataService", store)
+    store.is_fresh = lambda row: False
+
+    url = "https://example.com/page"
+    for _ in range(2):
+        monkeypatch.setattr(
+            post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+        )
+        info = await PostService._analyze(url, db=object())
+        assert info["title"] == "page"
+
+    # 처음엔 전체 조회 후 저장, 두 번째는 (리디렉션 확인 없이) etag로 재검증(304)
+    assert requests == [None, None, '"v1"']
+    assert store.rows[url].etag == '"v1"'
+    assert store.touched == [url]
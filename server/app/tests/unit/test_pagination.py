@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from app.models.article import Article
+from app.models.content import Content
+from app.services.article import ArticleService
+from app.util.pagination import apply_cursor, decode_cursor, encode_cursor, next_cursor
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+## cursor pagination unit test
+# 1. encode -> decode 시 원래 값(datetime, int) 복원
+# 2. 잘못된 cursor -> 400
+# 3. cursor가 있으면 (created_at, id) < (...) 조건과 내림차순 정렬 추가
+# 4. limit보다 적게 조회되면 next cursor 없음, 가득 차면 마지막 항목 기준 cursor
+# 5. article 피드: 첫 페이지/cursor 요청은 keyset, offset만 있는 요청은 OFFSET 유지
+# 6. 카운트 피드: NULL 카운트는 0으로 정렬, cursor도 0
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor, [datetime, int]) == [created_at, 42]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-a-cursor", encode_cursor(1), encode_cursor("x", "y"), "%%%"],
+)
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, [datetime, int])
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
+
+
+def test_apply_cursor():
+    keys = (Content.created_at, Content.id)
+    cursor = encode_cursor(datetime(2025, 5, 1, tzinfo=timezone.utc), 42)
+
+    stmt = apply_cursor(select(Content), keys, cursor, 20)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "(contents.created_at, contents.id) < (" in sql
+    assert "ORDER BY contents.created_at DESC, contents.id DESC" in sql
+    assert "LIMIT" in sql
+
+
+def test_next_cursor():
+    keys = (Content.created_at, Content.id)
+    created_at = datetime(2025, 5, 1, tzinfo=timezone.utc)
+    items = [SimpleNamespace(created_at=created_at, id=i) for i in (3, 2, 1)]
+
+    assert next_cursor(items, 5, keys) is None
+    assert next_cursor([], 5, keys) is None
+    assert decode_cursor(next_cursor(items, 3, keys), [datetime, int]) == [
+        created_at,
+        1,
+    ]
+
+
+@pytest.mark.parametrize(
+    "offset, cursor, uses_offset",
+    [
+        (0, None, False),
+        (0, encode_cursor(10, 3), False),
+        (20, encode_cursor(10, 3), False),
+        (20, None, True),
+    ],
+)
+def test_article_feed_paginate(offset, cursor, uses_offset):
+    stmt = ArticleService._paginate(
+        select(Article), ArticleService.POPULAR_ORDER, 10, offset, cursor
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    key = "coalesce(articles.down_count, 0)"
+    assert f"ORDER BY {key} DESC, articles.id DESC" in sql
+    assert ("OFFSET" in sql) == uses_offset
+    assert (f"({key}, articles.id) <" in sql) == (cursor is not None)
+
+
+def test_article_count_cursor_with_null_count():
+    articles = [Article(id=2, down_count=5), Article(id=1, down_count=None)]
+    cursor = next_cursor(articles, 2, ArticleService.POPULAR_ORDER)
+
+    assert decode_cursor(cursor, [int, int]) == [0, 1]
@@ -2,7 +2,7 @@ from urllib.parse import urljoin
 
 import pytest
 from app.services.post import PostService
-from bs4 import BeautifulSoup
+from app.util.html_parser import SoupDocument
 
 ## get favicon unit test
 # 1. 절대 경로
@@ -19,8 +19,8 @@ def test_get_favicon_absolute_url():
         </head>
     </html>
     """
-    bs = BeautifulSoup(html, "html.parser")
-    result = PostService._get_favicon("https://example.com", bs)
+    document = SoupDocument(html)
+    result = PostService._get_favicon("https://example.com", document)
     assert result == "https://cdn.example.com/favicon.png"
 
 
@@ -32,8 +32,8 @@ def test_get_favicon_relative_path():
         </head>
     </html>
     """
-    bs = BeautifulSoup(html, "html.parser")
-    result = PostService._get_favicon("https://example.com", bs)
+    document = SoupDocument(html)
+    result = PostService._get_favicon("https://example.com", document)
     assert result == "https://example.com/favicon.ico"
 
 
@@ -45,15 +45,15 @@ def test_get_favicon_relative_path_no_slash():
         </head>
     </html>
     """
-    bs = BeautifulSoup(html, "html.parser")
-    result = PostService._get_favicon("https://example.com", bs)
+    document = SoupDocument(html)
+    result = PostService._get_favicon("https://example.com", document)
     assert result == "https://example.com/images/favicon.ico"
 
 
 def test_get_favicon_no_icon_tag():
     html = "<html><head></head><body>No icons here</body></html>"
-    bs = BeautifulSoup(html, "html.parser")
-    result = PostService._get_favicon("https://example.com", bs)
+    document = SoupDocument(html)
+    result = PostService._get_favicon("https://example.com", document)
     assert result == "https://example.com/favicon.ico"
 
 
@@ -0,0 +1,28 @@
+import pytest
+from app.models.content import Content
+from app.util.projection import content_list_options
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+## content list projection unit test
+# 1. full -> post_metadata join 포함
+# 2. summary -> post_metadata join 없음, 목록에 필요 없는 컬럼(user_id, updated_at) 제외
+
+
+def _compile(view: str) -> str:
+    stmt = select(Content).options(*content_list_options(view))
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_full_view_joins_post_metadata():
+    sql = _compile("full")
+
+    assert "post_metadata" in sql
+    assert "contents.updated_at" in sql
+
+
+@pytest.mark.parametrize(
+    "column", ["post_metadata", "contents.user_id", "contents.updated_at"]
+)
+def test_summary_view_skips_unused_columns(column):
+    assert column not in _compile("summary")
@@ -0,0 +1,83 @@
+import pytest
+from app.models.article import Article, article_document
+from app.models.content import Content
+from app.services.article import ArticleService
+from app.services.search import SearchService, like_pattern
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
+
+## content full-text search unit test
+# 1. 검색 문서: title/tags/description/body 가중치 tsvector upsert
+# 2. 검색: 유저 문서에 대해 websearch_to_tsquery 매칭 후 ts_rank 내림차순
+# 3. trgm: title/description/tag의 ILIKE 부분 문자열 또는 <% 유사도 매칭, 유사도 내림차순
+# 4. ILIKE 패턴에서 keyword의 %, _ escape
+# 5. 게시글 검색: 식 인덱스와 같은 tsvector 식으로 매칭, 태그 AND 필터, facet/페이지 한 쿼리
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_upsert_documents_stmt():
+    sql = _compile(SearchService._upsert_documents_stmt(Content.id.in_([1, 2])))
+
+    assert "INSERT INTO content_search_documents" in sql
+    assert "setweight(to_tsvector('simple'::regconfig" in sql
+    assert "string_agg(tags.tagname" in sql
+    assert "post_metadata.body" in sql
+    assert "ON CONFLICT (content_id) DO UPDATE SET document = excluded.document" in sql
+
+
+def test_fts_stmt():
+    sql = _compile(SearchService._fts_stmt(1, '"event loop" -rust', "summary"))
+
+    assert "content_search_documents.user_id = " in sql
+    assert "@@ websearch_to_tsquery('simple'::regconfig" in sql
+    assert "ORDER BY ts_rank(content_search_documents.document" in sql
+    assert "post_metadata" not in sql
+
+
+def test_trgm_stmt():
+    stmt = SearchService._trgm_stmt(1, "태그", "summary")
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+
+    assert "contents.title ILIKE" in sql
+    assert "<% contents.title" in sql
+    assert "<% contents.description" in sql
+    assert "<% tags.tagname" in sql
+    assert "ORDER BY greatest(word_similarity(" in sql
+
+
+@pytest.mark.parametrize(
+    "keyword, pattern",
+    [("태그", "%태그%"), ("100%", "%100/%%"), ("a_b", "%a/_b%"), ("a/b", "%a//b%")],
+)
+def test_like_pattern(keyword, pattern):
+    assert like_pattern(keyword) == pattern
+
+
+def test_article_search_stmt():
+    stmt = ArticleService._search_stmt("python", ["web", "python", "web"], 20, 40, 10)
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+    index = next(
+        index
+        for index in Article.__table__.indexes
+        if index.name == "idx_articles_document"
+    )
+
+    # 쿼리의 tsvector 식이 인덱스 식과 같아야 GIN 인덱스 사용
+    document = str(article_document().compile(dialect=asyncpg.dialect()))
+    assert document == str(index.expressions[0].compile(dialect=asyncpg.dialect()))
+    assert f"({document}) @@ websearch_to_tsquery('simple'::regconfig" in sql
+
+    assert "HAVING count(DISTINCT tags.tagname) = " in sql
+    assert "json_agg(json_build_object('tagname', " in sql
+    assert "array_agg(anon_2.id ORDER BY anon_2.rank DESC" in sql
+    assert stmt.compile().params["count_2"] == 2
+
+
+def test_article_search_stmt_without_tags():
+    sql = _compile(ArticleService._search_stmt("python", [], 20, 0, 10))
+
+    assert "article_tag.article_id IN" not in sql
+    assert "HAVING" not in sql
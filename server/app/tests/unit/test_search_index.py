@@ -0,0 +1,223 @@
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from app.models.content import ContentTypeEnum
+from app.schemas.common import ContentResponseModel
+from app.services.search import SearchService, content_search_index
+from app.util.search_index import (
+    IndexedContent,
+    IndexedTag,
+    IndexedVideo,
+    SearchIndexRegistry,
+    UserSearchIndex,
+    index_tokens,
+    query_tokens,
+)
+from app.util.serializer import content_item, dump_json
+
+## in-memory content search index unit test
+# 1. token: Latin 단어, CJK 1-gram + bigram (NFKC, 소문자)
+# 2. 검색: 모든 token 매칭(AND), Latin은 prefix, 최신순 정렬
+# 3. 수정/삭제 시 이전 token 제거
+# 4. registry: 메모리 예산 초과 시 LRU 제거
+# 5. 저장/삭제/북마크 hook: 이미 만들어진 index에만 반영, 연속된 버전일 때만 버전 갱신
+# 6. memory 검색: 버전 확인 간격 안에서는 DB 조회 없이 index의 목록용 필드 반환
+
+NOW = datetime(2025, 1, 1)
+
+
+def _content(id_, title, description, tagnames, created_at, video_length=None):
+    return IndexedContent(
+        id=id_,
+        url=f"https://example.com/{id_}",
+        title=title,
+        description=description,
+        thumbnail=None,
+        favicon="",
+        bookmark=False,
+        content_type=(
+            ContentTypeEnum.VIDEO if video_length is not None else ContentTypeEnum.POST
+        ),
+        created_at=created_at,
+        tags=[IndexedTag(tagname) for tagname in tagnames],
+        video_metadata=IndexedVideo(video_length) if video_length is not None else None,
+    )
+
+
+def _index() -> UserSearchIndex:
+    index = UserSearchIndex(version=3)
+    index.add(
+        _content(1, "Python asyncio 튜토리얼", "비동기 프로그래밍", ["python"], NOW)
+    )
+    index.add(
+        _content(
+            2, "FastAPI 비동기 서버", None, ["백엔드"], NOW + timedelta(minutes=1), 90
+        )
+    )
+    index.add(_content(3, "강아지 사진", "", ["일상"], NOW + timedelta(minutes=2)))
+    return index
+
+
+def _ids(index: UserSearchIndex, keyword: str):
+    return [content.id for content in index.search(keyword)]
+
+
+def test_index_tokens():
+    tokens = index_tokens("Ｐython 비동기", "async_io")
+
+    assert {"python", "async", "io"} <= tokens
+    assert {"비", "동", "기", "비동", "동기"} <= tokens
+    assert "비동기" not in tokens
+
+
+def test_query_tokens():
+    assert query_tokens("Asy 비동기") == [
+        ("asy", True),
+        ("비동", False),
+        ("동기", False),
+    ]
+    assert query_tokens("개") == [("개", False)]
+    assert query_tokens("  !! ") == []
+
+
+def test_search():
+    index = _index()
+
+    assert _ids(index, "비동기") == [2, 1]
+    assert _ids(index, "pyt") == [1]
+    assert _ids(index, "asy tut") == []
+    assert _ids(index, "asy 튜토") == [1]
+    assert _ids(index, "아지") == [3]
+    assert _ids(index, "백엔드 fast") == [2]
+    assert _ids(index, "rust") == []
+    assert _ids(index, "") == []
+
+
+def test_update_and_remove():
+    index = _index()
+    size = index.approx_bytes
+
+    index.add(_content(1, "Rust 입문", None, [], NOW))
+    assert _ids(index, "pyt") == []
+    assert _ids(index, "rus") == [1]
+
+    index.remove(1)
+    index.remove(1)
+    assert _ids(index, "rus") == []
+    assert len(index) == 2
+    assert index.approx_bytes < size
+
+
+def test_registry_evicts_least_recently_used():
+    first, second, third = _index(), _index(), _index()
+    registry = SearchIndexRegistry(max_bytes=first.approx_bytes * 2)
+
+    registry.put(1, first)
+    registry.put(2, second)
+    registry.get(1)
+    registry.put(3, third)
+
+    assert registry.get(2) is None
+    assert registry.get(1) is first
+    assert registry.get(3) is third
+
+
+def test_registry_keeps_latest_index():
+    registry = SearchIndexRegistry(max_bytes=0)
+    index = _index()
+
+    registry.put(1, index)
+
+    assert registry.get(1) is index
+
+
+def _row(id_, title, content_type=ContentTypeEnum.POST):
+    return SimpleNamespace(
+        id=id_,
+        url=f"https://example.com/{id_}",
+        title=title,
+        description=None,
+        thumbnail=None,
+        favicon="",
+        bookmark=False,
+        content_type=content_type,
+        created_at=NOW,
+    )
+
+
+def _tags(*names):
+    return [
+        SimpleNamespace(id=len(names) - i, tagname=name) for i, name in enumerate(names)
+    ]
+
+
+@pytest.fixture
+def user_index():
+    index = _index()
+    content_search_index.put(100, index)
+    yield index
+    content_search_index.discard(100)
+
+
+def test_index_hooks(user_index):
+    SearchService.index_content(100, 4, _row(4, "도커 배포"), _tags("devops", "ops"))
+    assert _ids(user_index, "도커") == [4]
+    # 태그는 Content.tags와 같이 id 순
+    assert [tag.tagname for tag in user_index.get(4).tags] == ["ops", "devops"]
+    assert user_index.version == 4
+
+    # 다른 워커의 변경(버전 5)을 놓친 경우 버전은 그대로 두고 검색 시 변경 이력으로 보정
+    SearchService.unindex_content(100, 6, 4)
+    assert _ids(user_index, "도커") == []
+    assert user_index.version == 4
+
+    # index가 없는 유저는 무시
+    SearchService.index_content(101, 1, _row(5, "도커"), [])
+    assert content_search_index.get(101) is None
+
+
+def test_index_hooks_keep_list_fields(user_index):
+    # 수정 시 video_length를 모르면 index에 있던 값 유지
+    SearchService.index_content(
+        100, 4, _row(2, "FastAPI 서버", ContentTypeEnum.VIDEO), _tags("백엔드")
+    )
+    assert user_index.get(2).video_metadata.video_length == 90
+
+    SearchService.index_bookmark(100, 5, 2, True)
+    assert user_index.get(2).bookmark
+    assert user_index.version == 5
+
+    # index에 없는 video는 video_length를 알 수 없으므로 검색 시 변경 이력으로 반영
+    SearchService.index_content(100, 6, _row(7, "새 영상", ContentTypeEnum.VIDEO), [])
+    assert user_index.get(7) is None
+    assert user_index.version == 5
+
+
+@pytest.mark.asyncio
+async def test_memory_search_without_db(user_index):
+    user_index.checked_at = time.monotonic()
+
+    contents = await SearchService.search_contents(
+        100, "비동기", db=None, view="summary", limit=1, mode="memory"
+    )
+    payload = json.loads(
+        dump_json([content_item(c, ContentResponseModel, "summary") for c in contents])
+    )
+
+    assert payload == [
+        {
+            "id": 2,
+            "url": "https://example.com/2",
+            "title": "FastAPI 비동기 서버",
+            "thumbnail": None,
+            "favicon": "",
+            "description": None,
+            "bookmark": False,
+            "video_length": 90,
+            "tags": ["백엔드"],
+            "created_at": "2025-01-01T00:01:00",
+        }
+    ]
@@ -0,0 +1,118 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from app.models.content import ContentTypeEnum
+from app.schemas.common import ContentResponseModel
+from app.schemas.content import UserContentsResponse
+from app.schemas.tag import TagContentsResponse
+from app.util.serializer import article_item, content_item, dump_json
+
+## serializer unit test
+# 1. 모델 생성/검증 없이 만든 응답이 기존(pydantic 검증) 응답과 같은 JSON
+# 2. join하지 않은 metadata는 기본값(video_length=0, body="")
+# 3. 응답 모델에 type 필드가 없으면 type 제외
+# 4. 빈 목록, page 응답 직렬화
+# 5. view=summary -> post_metadata를 읽지 않고 body 필드 생략
+
+CREATED_AT = datetime(2025, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _content(content_type=ContentTypeEnum.VIDEO, video=True, post=False):
+    return SimpleNamespace(
+        id=1,
+        url="https://www.youtube.com/watch?v=abc",
+        title="title",
+        thumbnail=None,
+        favicon="",
+        description="desc",
+        bookmark=True,
+        tags=[SimpleNamespace(tagname="music"), SimpleNamespace(tagname="live")],
+        created_at=CREATED_AT,
+        content_type=content_type,
+        video_metadata=SimpleNamespace(video_length=120) if video else None,
+        post_metadata=SimpleNamespace(body="body") if post else None,
+    )
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        _content(),
+        _content(ContentTypeEnum.POST, video=False, post=True),
+        _content(ContentTypeEnum.POST, video=False, post=False),
+    ],
+)
+@pytest.mark.parametrize("model", [UserContentsResponse, TagContentsResponse])
+def test_content_item_matches_validated_model(content, model):
+    expected = model(
+        id=content.id,
+        url=content.url,
+        title=content.title,
+        thumbnail=content.thumbnail,
+        favicon=content.favicon,
+        description=content.description,
+        bookmark=content.bookmark,
+        **(
+            {"video_length": content.video_metadata.video_length}
+            if content.video_metadata
+            else {}
+        ),
+        **({"body": content.post_metadata.body} if content.post_metadata else {}),
+        tags=[tag.tagname for tag in content.tags],
+        created_at=content.created_at,
+        type=content.content_type.value,
+    )
+
+    assert json.loads(dump_json(content_item(content, model))) == json.loads(
+        expected.model_dump_json()
+    )
+
+
+def test_content_item_without_type_field():
+    payload = json.loads(dump_json(content_item(_content(), ContentResponseModel)))
+
+    assert "type" not in payload
+    assert payload["video_length"] == 120
+    assert payload["body"] == ""
+
+
+def test_article_item():
+    article = SimpleNamespace(
+        id=3,
+        title="t",
+        body=None,
+        encoded_content="H4sI",
+        up_count=1,
+        down_count=2,
+        created_at=CREATED_AT,
+        updated_at=CREATED_AT,
+        user=SimpleNamespace(id=7, username="user", profile_image=None),
+        tags=[SimpleNamespace(tagname="music")],
+    )
+    payload = json.loads(dump_json([article_item(article)]))
+
+    assert payload[0]["user_id"] == 7
+    assert payload[0]["tags"] == ["music"]
+    assert payload[0]["created_at"] == "2025-05-01T12:30:00Z"
+
+
+def test_dump_json_list_and_page():
+    items = [content_item(_content(), UserContentsResponse)]
+    page = {"contents": items, "next_cursor": None}
+
+    assert dump_json([]) == b"[]"
+    assert json.loads(dump_json(items)) == json.loads(dump_json(page))["contents"]
+
+
+def test_content_item_summary_omits_body():
+    content = _content(ContentTypeEnum.POST, video=False)
+    del content.post_metadata  # summary 조회에서는 post_metadata를 읽으면 안 됨
+    payload = json.loads(
+        dump_json(content_item(content, UserContentsResponse, "summary"))
+    )
+
+    assert "body" not in payload
+    assert payload["type"] == "post"
+    assert payload["video_length"] == 0
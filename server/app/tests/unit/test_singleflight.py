@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+from app.services import post
+from app.services.post import PostService
+from app.tests.unit.test_metadata_cache import FakeMetadataStore
+from app.util.fetcher import UrlFetcher
+from app.util.metadata_cache import MetadataCache
+from app.util.singleflight import SingleFlight
+from config import get_settings
+
+## single flight unit test
+# 1. 같은 key 동시 호출은 한 번만 실행, 결과/예외 공유, 끝나면 결과를 저장하지 않음
+# 2. 같은 URL 동시 분석은 페이지를 한 번만 조회, url_metadata 저장도 한 번
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    flights = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value == "fail":
+            raise RuntimeError(value)
+        return value
+
+    results = await asyncio.gather(
+        flights.run("a", lambda: work("first")),
+        flights.run("a", lambda: work("second")),
+    )
+    assert results == [("first", False), ("first", True)]
+
+    failed = await asyncio.gather(
+        flights.run("b", lambda: work("fail")),
+        flights.run("b", lambda: work("fail")),
+        return_exceptions=True,
+    )
+    assert all(isinstance(error, RuntimeError) for error in failed)
+
+    assert await flights.run("a", lambda: work("third")) == ("third", False)
+    assert calls == ["first", "fail", "third"]
+    assert flights.stats() == {"in_flight": 0, "calls": 3, "shared": 2}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_analyze_same_url(monkeypatch):
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, html="<title>viral</title>")
+
+    store = FakeMetadataStore()
+    saved = []
+    apply = store.apply
+
+    async def count_apply(updates, db):
+        saved.extend(filter(None, updates))
+        await apply(updates, db)
+
+    store.apply = count_apply
+    fetcher = UrlFetcher(get_settings(), transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(post, "url_fetcher", fetcher)
+    monkeypatch.setattr(post, "MetadataService", store)
+    monkeypatch.setattr(
+        post, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+    )
+
+    infos = await asyncio.gather(
+        *(
+            PostService._analyze(f"https://example.com/viral?utm_source={i}", object())
+            for i in range(10)
+        )
+    )
+
+    assert all(info["title"] == "viral" for info in infos)
+    assert requests == ["/viral", "/viral"]  # 리디렉션 확인 + 페이지 조회 1번씩
+    assert len(saved) == 1
@@ -1,5 +1,13 @@
+import asyncio
+
+import httpx
 import pytest
+from app.services import video
 from app.services.video import VideoService
+from app.util.metadata_cache import MetadataCache
+from app.util.youtube import YouTubeClient
+from config import get_settings
+from fastapi import HTTPException
 
 ## extract video id unit test
 # 1. 일반적인 youtube 영상 주소 -> video id 반환 (1, 2)
@@ -25,3 +33,82 @@ from app.services.video import VideoService
 )
 def test_extract_video_id(url, expected_video_id):
     assert VideoService._extract_video_id(url) == expected_video_id
+
+
+## youtube client unit test
+# 1. videos.list REST 호출 (id 묶음, api key는 header), 오류 응답은 httpx.HTTPStatusError
+# 2. 동시에 들어온 영상 조회는 videos.list 한 번으로 묶음, 응답 item -> 영상 정보, 없는 영상은 404
+
+
+def _youtube_client(handler) -> YouTubeClient:
+    return YouTubeClient(get_settings(), transport=httpx.MockTransport(handler))
+
+
+VIDEO_ITEM = {
+    "id": "dQw4w9WgXcQ",
+    "snippet": {
+        "title": "제목",
+        "description": "설명",
+        "tags": ["music"],
+        "thumbnails": {"high": {"url": "https://i.ytimg.com/hq.jpg"}},
+    },
+    "contentDetails": {"duration": "PT3M33S"},
+}
+
+
+@pytest.mark.asyncio
+async def test_youtube_videos_list():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.params["id"] == "forbidden":
+            return httpx.Response(403, json={"error": {"code": 403}})
+        return httpx.Response(200, json={"items": [VIDEO_ITEM]})
+
+    client = _youtube_client(handler)
+    response = await client.videos_list(["a", "b"], "snippet")
+    assert response["items"] == [VIDEO_ITEM]
+    assert requests[0].url.path == "/youtube/v3/videos"
+    assert requests[0].url.params["id"] == "a,b"
+    assert requests[0].headers["X-Goog-Api-Key"] == get_settings().YOUTUBE_API_KEY
+    assert set(requests[0].url.params) == {"part", "id"}
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.videos_list(["forbidden"], "snippet")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_extract_video_info_batches_requests(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params["id"].split(","))
+        items = [
+            VIDEO_ITEM | {"id": video_id}
+            for video_id in requests[-1]
+            if video_id != "missing0000"
+        ]
+        return httpx.Response(200, json={"items": items})
+
+    monkeypatch.setattr(video, "youtube_client", _youtube_client(handler))
+    monkeypatch.setattr(
+        video, "url_metadata_cache", MetadataCache(ttl=60, max_bytes=1 << 20)
+    )
+
+    infos = await asyncio.gather(
+        *(
+            VideoService._extract_video_info(f"https://youtu.be/{video_id}", None)
+            for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb", "aaaaaaaaaaa")
+        ),
+        VideoService._extract_video_info("https://youtu.be/missing0000", None),
+        return_exceptions=True,
+    )
+
+    # 동시에 들어온 요청은 videos.list 한 번으로 조회
+    assert len(requests) == 1
+    assert sorted(requests[0]) == ["aaaaaaaaaaa", "bbbbbbbbbbb", "missing0000"]
+    assert infos[0]["title"] == infos[1]["title"] == "제목"
+    assert infos[0]["length"] == 213
+    assert isinstance(infos[3], HTTPException) and infos[3].status_code == 404
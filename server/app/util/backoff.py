@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from config import get_settings
+
+# 기록을 유지하는 최대 key 수 (오래 안 쓴 key부터 제거)
+MAX_ENTRIES = 10_000
+
+
+class FailureBackoff:
+    """
+    key(URL, host)별 연속 실패 기록, threshold번 이상 실패하면
+    base * 2^(초과 횟수)초(최대 max_delay) 동안 blocked, 성공하면 기록 제거
+    """
+
+    def __init__(
+        self,
+        base: float,
+        max_delay: float,
+        threshold: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.base = base
+        self.max_delay = max_delay
+        self.threshold = threshold
+        self.clock = clock
+        self.suppressed = 0
+        self._failures: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+    def blocked(self, key: str) -> bool:
+        entry = self._failures.get(key)
+        if entry is None or entry[1] <= self.clock():
+            return False
+
+        self.suppressed += 1
+        return True
+
+    def failed(self, key: str) -> None:
+        count = self._failures.pop(key, (0, 0.0))[0] + 1
+        until = 0.0
+        if count >= self.threshold:
+            delay = self.base * 2 ** (count - self.threshold)
+            until = self.clock() + min(delay, self.max_delay)
+
+        self._failures[key] = (count, until)
+        if len(self._failures) > MAX_ENTRIES:
+            self._failures.popitem(last=False)
+
+    def succeeded(self, key: str) -> None:
+        self._failures.pop(key, None)
+
+    def clear(self) -> None:
+        self._failures.clear()
+
+    def stats(self) -> dict:
+        now = self.clock()
+        return {
+            "entries": len(self._failures),
+            "blocked": sum(1 for _, until in self._failures.values() if until > now),
+            "suppressed": self.suppressed,
+        }
+
+
+settings = get_settings()
+# 분석 실패한 URL, 연결 실패/시간 초과가 반복된 host는 backoff 동안 조회하지 않음
+url_backoff = FailureBackoff(
+    settings.ANALYZE_BACKOFF_BASE, settings.ANALYZE_BACKOFF_MAX
+)
+host_backoff = FailureBackoff(
+    settings.ANALYZE_BACKOFF_BASE,
+    settings.ANALYZE_BACKOFF_MAX,
+    threshold=settings.ANALYZE_HOST_FAILURE_THRESHOLD,
+)
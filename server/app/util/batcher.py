@@ -0,0 +1,84 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class MicroBatcher(Generic[T]):
+    """
+    window(초) 동안 들어온 key를 모아 fetch 한 번으로 조회 (최대 max_batch개씩)
+    요청/유저가 달라도 같은 batch로 합쳐지고, 대기 중이거나 조회 중인 key는 그 결과를 공유
+    호출자는 자기 key 결과만 받음 (fetch 결과에 없으면 None, fetch 실패 시 같은 예외)
+    조회 task가 취소되면 기다리던 호출자도 CancelledError
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Awaitable[Dict[str, T]]],
+        max_batch: int,
+        window: float,
+    ):
+        self.fetch = fetch
+        self.max_batch = max_batch
+        self.window = window
+        self.batches = 0
+        self.keys = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: str) -> Optional[T]:
+        future = self._pending.get(key) or self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+
+        # 한 호출자가 취소되어도 같은 key를 기다리는 다른 호출자에게는 영향 없음
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[str, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys += len(batch)
+        try:
+            results = await self.fetch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        except BaseException:
+            # 조회 task가 취소되면 기다리는 호출자도 취소 (결과 없이 무한 대기하지 않도록)
+            for future in batch.values():
+                future.cancel()
+            raise
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            # 조회가 끝난 key는 결과를 저장하지 않고 제거 (다음 요청은 새로 조회)
+            for key in batch:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "keys": self.keys,
+            "avg_batch_size": self.keys / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,61 @@
+import hashlib
+from typing import Dict
+
+from app.db import get_db
+from app.services.library import LibraryService
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def make_library_etag(request: Request, user_id: int, version: int) -> str:
+    """
+    라이브러리 버전 + 요청 형태(경로, 쿼리, Accept)로 strong ETag 생성
+    같은 버전이라도 view, cursor, 응답 포맷이 다르면 다른 표현이므로 구분
+    """
+    representation = (
+        f"{request.url.path}?{request.url.query}|{request.headers.get('accept', '')}"
+    )
+    variant = hashlib.blake2b(representation.encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{user_id}-{version}-{variant}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match 헤더가 etag와 일치하는지 확인 (weak 비교)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(
+        value.removeprefix("W/") == etag for value in candidates
+    )
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """
+    ETag 응답 헤더, 매 요청마다 재검증하도록 no-cache 지정
+    """
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+async def library_etag(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> str:
+    """
+    라이브러리 목록 조회용 dependency
+    클라이언트가 가진 버전과 같으면 목록 쿼리 없이 304 반환
+    """
+    version = await LibraryService.get_version(user_id, db)
+    etag = make_library_etag(request, user_id, version)
+    headers = etag_headers(etag)
+
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return etag
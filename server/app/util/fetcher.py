@@ -0,0 +1,386 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpcore
+import httpx
+from charset_normalizer import from_bytes
+from config import Settings, get_settings
+
+# 링크 분석용 브라우저 헤더 (사이트별 차단을 피하기 위해 모바일/데스크톱 UA 사용)
+MOBILE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36",
+    "Accept": (
+        "text/html,application/xhtml+xml,application/xml;"
+        "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+DESKTOP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_0) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
+    "Accept": (
+        "text/html,application/xhtml+xml,application/xml;"
+        "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "DNT": "1",  # Do Not Track 요청
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Referer": "https://www.google.com/",
+}
+FALLBACK_HEADERS = DESKTOP_HEADERS | {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+}
+
+
+# head만 필요할 때 여기까지 받으면 중단 (</head> 생략 가능하므로 <body도 확인)
+HEAD_END_MARKERS = (b"</head>", b"<body")
+
+
+class DnsCache:
+    """
+    host -> IP 목록 TTL 캐시 (요청마다 getaddrinfo 하지 않도록)
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        addresses = await self._lookup(host, port)
+        self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    async def _lookup(self, host: str, port: int) -> List[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def invalidate(self, host: str, port: int) -> None:
+        self._entries.pop((host, port), None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore 기본 backend에 DNS 캐시 적용, 새 연결 수 집계 (TLS SNI/인증서 검증은 host 그대로)
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, dns: DnsCache):
+        self.backend = backend
+        self.dns = dns
+        self.connections = 0
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            ipaddress.ip_address(host)
+            addresses = [host]
+        except ValueError:
+            try:
+                addresses = await self.dns.resolve(host, port)
+            except OSError as e:
+                raise httpcore.ConnectError(str(e)) from e
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                stream = await self.backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+                continue
+            self.connections += 1
+            return stream
+
+        # 모든 주소 연결 실패 시 다음 요청에서 다시 조회
+        self.dns.invalidate(host, port)
+        raise error or httpcore.ConnectError(f"No address for {host}")
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+class FetchTrace:
+    """
+    현재 task의 url_fetcher 요청 추적 (fetch_trace에 설정한 경우만)
+    host: slot을 얻어 요청 중인 host, 요청이 끝나면 None
+    예외/timeout 후에도 남아 있으면 그 host 요청 중 실패, None이면 host별 대기 중
+    """
+
+    def __init__(self):
+        self.host: Optional[str] = None
+
+
+fetch_trace: ContextVar[Optional[FetchTrace]] = ContextVar("fetch_trace", default=None)
+
+
+class _HostSlot:
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+        self.next_start = 0.0
+
+
+class UrlFetcher:
+    """
+    외부 URL 조회용 공유 httpx.AsyncClient
+    connection pool + keep-alive 재사용, DNS 캐시, host별 동시 요청 수 제한
+    host별 대기는 도착 순서(FIFO), 같은 host 요청 시작 간격은 FETCH_HOST_MIN_INTERVAL 이상
+    client는 첫 요청 시 현재 event loop에서 생성하고 lifespan 종료 시 닫음
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=settings.FETCH_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.FETCH_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.FETCH_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(
+            settings.FETCH_TIMEOUT, connect=settings.FETCH_CONNECT_TIMEOUT
+        )
+        self.max_per_host = settings.FETCH_MAX_CONNECTIONS_PER_HOST
+        self.min_interval = settings.FETCH_HOST_MIN_INTERVAL
+        self.deadline = settings.POST_ANALYZE_DEADLINE
+        self.drain_max_bytes = settings.FETCH_DRAIN_MAX_BYTES
+        self.transport = transport
+        self.dns = DnsCache(settings.FETCH_DNS_TTL)
+        self.backend: Optional[CachingNetworkBackend] = None
+        self.requests = 0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._hosts: Dict[str, _HostSlot] = {}
+
+    def _default_transport(self) -> httpx.AsyncHTTPTransport:
+        transport = httpx.AsyncHTTPTransport(limits=self.limits)
+        # httpx는 network backend 지정을 지원하지 않아 connection pool의 backend를 교체
+        pool = transport._pool
+        self.backend = CachingNetworkBackend(pool._network_backend, self.dns)
+        pool._network_backend = self.backend
+        return transport
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport or self._default_transport(),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """
+        host별 동시 요청 수 제한 + 시작 간격 유지, 대기 시간 집계
+        대기 중인 요청이 없고 간격 제한이 끝난 slot은 정리
+        """
+        host = urlparse(url).netloc.lower()
+        slot = self._hosts.get(host)
+        if slot is None:
+            self._prune_hosts()
+            slot = self._hosts[host] = _HostSlot(self.max_per_host)
+
+        slot.users += 1
+        queued_at = time.monotonic()
+        try:
+            async with slot.semaphore:
+                now = time.monotonic()
+                start = max(now, slot.next_start)
+                slot.next_start = start + self.min_interval
+                if start > now:
+                    await asyncio.sleep(start - now)
+
+                waited = time.monotonic() - queued_at
+                self.requests += 1
+                self.queue_wait += waited
+                self.max_queue_wait = max(self.max_queue_wait, waited)
+                trace = fetch_trace.get()
+                if trace is not None:
+                    trace.host = host
+                yield
+                if trace is not None:
+                    trace.host = None
+        finally:
+            slot.users -= 1
+            if slot.users == 0 and slot.next_start <= time.monotonic():
+                del self._hosts[host]
+
+    def _prune_hosts(self) -> None:
+        now = time.monotonic()
+        for host in [
+            host
+            for host, slot in self._hosts.items()
+            if slot.users == 0 and slot.next_start <= now
+        ]:
+            del self._hosts[host]
+
+    def stats(self) -> dict:
+        """
+        connection 재사용률(1 - 새 연결 수 / 요청 수), host별 대기 시간, DNS 캐시
+        """
+        connections = self.backend.connections if self.backend is not None else None
+        return {
+            "requests": self.requests,
+            "connections": connections,
+            "reuse_ratio": (
+                1 - connections / self.requests
+                if connections is not None and self.requests
+                else None
+            ),
+            "avg_queue_wait": self.queue_wait / self.requests if self.requests else 0.0,
+            "max_queue_wait": self.max_queue_wait,
+            "active_hosts": len(self._hosts),
+            "queued": sum(
+                max(0, slot.users - self.max_per_host) for slot in self._hosts.values()
+            ),
+            "dns": self.dns.stats(),
+        }
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+        timeout: Optional[float] = None,
+        read_body: bool = True,
+    ) -> httpx.Response:
+        """
+        GET 응답 반환 (실패 시 httpx.HTTPError)
+        read_body=False면 status, header만 사용하고 body는 저장하지 않음 (_drain)
+        """
+        request = self.client.build_request(
+            "GET",
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        async with self.host_slot(url):
+            response = await self.client.send(
+                request, follow_redirects=follow_redirects, stream=True
+            )
+            try:
+                if read_body:
+                    await response.aread()
+                else:
+                    await self._drain(response)
+            finally:
+                await response.aclose()
+
+        return response
+
+    async def _drain(self, response: httpx.Response) -> None:
+        """
+        다 읽지 않은 응답을 닫으면 httpcore가 연결을 버리므로
+        drain_max_bytes 이하 body는 읽고 버려 연결을 pool로 반환, 더 크면 그대로 종료
+        """
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > self.drain_max_bytes:
+            return
+
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > self.drain_max_bytes:
+                return
+
+    async def get_head(
+        self,
+        url: str,
+        max_bytes: int,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+        timeout: Optional[float] = None,
+        markers: Tuple[bytes, ...] = HEAD_END_MARKERS,
+    ) -> Tuple[httpx.Response, bytes]:
+        """
+        body를 조금씩 받다가 markers 중 하나(대소문자 무시)가 나오거나 max_bytes를 넘으면 중단
+        -> (응답, 받은 body), 나머지는 받지 않고 연결 종료
+        """
+        request = self.client.build_request(
+            "GET",
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        longest = max(len(marker) for marker in markers)
+        body = bytearray()
+        async with self.host_slot(url):
+            response = await self.client.send(
+                request, follow_redirects=follow_redirects, stream=True
+            )
+            try:
+                async for chunk in response.aiter_bytes():
+                    # 청크 경계에 걸친 marker도 찾도록 앞 청크 끝부분부터 검사
+                    start = max(0, len(body) - longest + 1)
+                    body += chunk
+                    window = body[start:].lower()
+                    if len(body) >= max_bytes or any(
+                        marker in window for marker in markers
+                    ):
+                        break
+            finally:
+                await response.aclose()
+
+        return response, bytes(body[:max_bytes])
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def response_text(response: httpx.Response, content: Optional[bytes] = None) -> str:
+    """
+    Content-Type charset이 있으면 그대로, 없으면 byte로 인코딩 추정 (EUC-KR 페이지 등)
+    content: get_head처럼 일부만 받은 body (없으면 response.content)
+    """
+    if content is None:
+        content = response.content
+
+    if response.charset_encoding:
+        try:
+            return content.decode(response.charset_encoding, errors="replace")
+        except LookupError:
+            pass
+
+    match = from_bytes(content).best()
+    return str(match) if match is not None else content.decode("utf-8", "replace")
+
+
+url_fetcher = UrlFetcher(get_settings())
@@ -0,0 +1,92 @@
+import unicodedata
+from typing import List, Optional, Tuple
+
+# 완성형 한글 음절: 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_END = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+CHOSEONG_BLOCK = JUNGSEONG_COUNT * JONGSEONG_COUNT
+
+# 호환용 자모(키보드 입력 중 단독으로 들어오는 자음)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 겹받침은 뒤 자음만 다음 음절 초성으로 넘어감 (닭 -> 달+ㄱ)
+_SPLIT_JONGSEONG = {
+    "ㄳ": ("ㄱ", "ㅅ"),
+    "ㄵ": ("ㄴ", "ㅈ"),
+    "ㄶ": ("ㄴ", "ㅎ"),
+    "ㄺ": ("ㄹ", "ㄱ"),
+    "ㄻ": ("ㄹ", "ㅁ"),
+    "ㄼ": ("ㄹ", "ㅂ"),
+    "ㄽ": ("ㄹ", "ㅅ"),
+    "ㄾ": ("ㄹ", "ㅌ"),
+    "ㄿ": ("ㄹ", "ㅍ"),
+    "ㅀ": ("ㄹ", "ㅎ"),
+    "ㅄ": ("ㅂ", "ㅅ"),
+}
+
+
+def _syllable(char: str) -> Optional[int]:
+    code = ord(char)
+    return code - SYLLABLE_BASE if SYLLABLE_BASE <= code <= SYLLABLE_END else None
+
+
+def _choseong_range(head: str, consonant: str) -> Tuple[str, str]:
+    start = SYLLABLE_BASE + CHOSEONG.index(consonant) * CHOSEONG_BLOCK
+    return head + chr(start), head + chr(start + CHOSEONG_BLOCK)
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def normalize_prefix(prefix: str) -> str:
+    """
+    NFC 정규화(macOS 등에서 들어오는 풀어쓴 자모 조합) + 소문자
+    """
+    return unicodedata.normalize("NFC", prefix).strip().lower()
+
+
+def prefix_ranges(prefix: str) -> List[Tuple[str, str]]:
+    """
+    prefix로 시작하는 문자열의 [시작, 끝) 범위 목록 (코드 포인트 순서 기준)
+    입력 중인 마지막 한글 글자는 조합이 끝나지 않았을 수 있으므로 이어질 수 있는 음절까지 포함
+    - 받침 없는 음절(하): 받침이 붙은 음절(한, 할, ...)
+    - 받침 있는 음절(한): 받침이 다음 음절 초성으로 넘어간 경우(하나, 하늘, ...)
+    - 단독 자음(한ㄱ): 그 자음이 초성인 다음 음절, 앞 음절 받침이 되는 경우(하ㄴ -> 한)
+    """
+    prefix = normalize_prefix(prefix)
+    if not prefix:
+        return []
+
+    head, last = prefix[:-1], prefix[-1]
+    ranges = [_prefix_range(prefix)]
+
+    syllable = _syllable(last)
+    if syllable is not None:
+        jongseong = JONGSEONG[syllable % JONGSEONG_COUNT]
+        if jongseong == " ":
+            ranges[0] = (prefix, head + chr(ord(last) + JONGSEONG_COUNT))
+            return ranges
+
+        remaining, moved = _SPLIT_JONGSEONG.get(jongseong, (" ", jongseong))
+        if moved in CHOSEONG:
+            base = ord(last) - JONGSEONG.index(jongseong) + JONGSEONG.index(remaining)
+            ranges.append(_choseong_range(head + chr(base), moved))
+        return ranges
+
+    if last in CHOSEONG:
+        ranges.append(_choseong_range(head, last))
+
+        previous = _syllable(head[-1]) if head else None
+        if (
+            previous is not None
+            and previous % JONGSEONG_COUNT == 0
+            and last in JONGSEONG
+        ):
+            combined = chr(SYLLABLE_BASE + previous + JONGSEONG.index(last))
+            ranges.append(_prefix_range(head[:-1] + combined))
+
+    return ranges
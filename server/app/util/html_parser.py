@@ -0,0 +1,116 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - selectolax 미설치 시 BeautifulSoup만 사용
+    LexborHTMLParser = None
+
+# 본문 텍스트에서 제외하는 태그 (BeautifulSoup get_text 기본 동작과 동일)
+NON_TEXT_TAGS = ["script", "style", "template"]
+
+
+class HtmlDocument(ABC):
+    """
+    링크 분석에 필요한 조회만 제공하는 파싱된 HTML
+    """
+
+    @abstractmethod
+    def title(self) -> str:
+        """
+        <title> 텍스트 (앞뒤 공백 제거), 없으면 빈 문자열
+        """
+
+    @abstractmethod
+    def meta_property(self, name: str) -> Optional[str]:
+        """
+        <meta property=name>의 content, 태그가 없으면 None
+        """
+
+    @abstractmethod
+    def icon_hrefs(self) -> List[str]:
+        """
+        rel에 icon이 들어간 <link>의 href (문서 순서)
+        """
+
+    @abstractmethod
+    def body_text(self, selectors: Iterable[str]) -> str:
+        """
+        selectors 중 처음 매칭되는 요소의 텍스트 (줄바꿈 구분), 없으면 빈 문자열
+        """
+
+
+class SoupDocument(HtmlDocument):
+    def __init__(self, html: str):
+        self.bs = BeautifulSoup(html, "html.parser")
+
+    def title(self) -> str:
+        title_tag = self.bs.find("title")
+        return title_tag.text.strip() if title_tag else ""
+
+    def meta_property(self, name: str) -> Optional[str]:
+        tag = self.bs.find("meta", property=name)
+        return tag.get("content", "") if tag else None
+
+    def icon_hrefs(self) -> List[str]:
+        links = self.bs.find_all("link", rel=lambda r: r and "icon" in r.lower())
+        return [link.get("href", "") for link in links]
+
+    def body_text(self, selectors: Iterable[str]) -> str:
+        for selector in selectors:
+            element = self.bs.select_one(selector)
+            if element is not None:
+                return element.get_text(separator="\n").strip()
+        return ""
+
+
+class LexborDocument(HtmlDocument):
+    def __init__(self, html: str):
+        self.tree = LexborHTMLParser(html)
+
+    def title(self) -> str:
+        title_tag = self.tree.css_first("title")
+        return title_tag.text().strip() if title_tag else ""
+
+    def meta_property(self, name: str) -> Optional[str]:
+        for tag in self.tree.css("meta[property]"):
+            if tag.attributes.get("property") == name:
+                return tag.attributes.get("content") or ""
+        return None
+
+    def icon_hrefs(self) -> List[str]:
+        return [
+            link.attributes.get("href") or ""
+            for link in self.tree.css("link[rel]")
+            if "icon" in (link.attributes.get("rel") or "").lower()
+        ]
+
+    def body_text(self, selectors: Iterable[str]) -> str:
+        for selector in selectors:
+            element = self.tree.css_first(selector)
+            if element is not None:
+                element.strip_tags(NON_TEXT_TAGS)
+                return element.text(separator="\n").strip()
+        return ""
+
+
+PARSER_BACKENDS: Dict[str, Callable[[str], HtmlDocument]] = {"bs4": SoupDocument}
+if LexborHTMLParser is not None:
+    PARSER_BACKENDS["selectolax"] = LexborDocument
+
+
+def resolve_backend(name: str = "auto") -> str:
+    """
+    auto: selectolax(lexbor, C 구현)가 설치되어 있으면 사용, 없으면 BeautifulSoup
+    """
+    if name == "auto":
+        return "selectolax" if "selectolax" in PARSER_BACKENDS else "bs4"
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unavailable HTML parser backend: {name}")
+    return name
+
+
+def parse_html(html: str, backend: str = "auto") -> HtmlDocument:
+    return PARSER_BACKENDS[resolve_backend(backend)](html)
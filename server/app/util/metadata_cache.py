@@ -0,0 +1,143 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import get_settings
+
+# 같은 페이지를 가리키지만 공유 경로마다 달라지는 추적용 query 파라미터 (utm_* 포함)
+TRACKING_PARAMS = {"fbclid", "gclid"}
+# 해당 사이트(하위 도메인 포함)에서만 추적용인 파라미터, 다른 사이트에서는 페이지를 바꿀 수 있음
+HOST_TRACKING_PARAMS = {
+    "youtube.com": {"si", "feature"},
+    "youtu.be": {"si", "feature"},
+    "instagram.com": {"igshid"},
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    캐시 키용 URL 정규화
+    scheme/host 소문자, 기본 포트/fragment/추적 파라미터(utm_* 등) 제거, query 정렬
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    hostname = (parts.hostname or "").lower()
+    host = hostname
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    tracking = TRACKING_PARAMS.union(
+        *(
+            params
+            for domain, params in HOST_TRACKING_PARAMS.items()
+            if hostname == domain or hostname.endswith(f".{domain}")
+        )
+    )
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in tracking
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def _approx_size(value) -> int:
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _approx_size(key) + _approx_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class MetadataCache:
+    """
+    정규화 URL -> 추출한 메타데이터(dict) TTL + LRU 캐시
+    추정 메모리 합이 max_bytes를 넘으면 오래 안 쓴 항목부터 제거
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, dict, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        만료되지 않은 항목의 복사본 반환, 없으면 None
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return dict(entry[1])
+
+    def put(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        """
+        ttl: 이 항목만 다른 유지 시간(초) 적용 (실패 결과 등)
+        """
+        size = _approx_size(key) + _approx_size(value)
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, dict(value), size)
+        self.size += size
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+settings = get_settings()
+url_metadata_cache = MetadataCache(
+    settings.METADATA_CACHE_TTL, settings.METADATA_CACHE_MAX_BYTES
+)
+# 정규화 URL -> {"url": 최종 URL} 또는 {"status_code", "detail"} (리디렉션 추적 실패)
+redirect_cache = MetadataCache(
+    settings.REDIRECT_CACHE_TTL, settings.REDIRECT_CACHE_MAX_BYTES
+)
@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import desc, literal, tuple_
+from sqlalchemy.sql import Select
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    정렬 키 값들을 클라이언트에게 전달할 opaque cursor 문자열로 변환
+    """
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    cursor 문자열을 정렬 키 값 리스트로 복원, 잘못된 cursor일 시 400 반환
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor length mismatch")
+
+        return [
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(payload, types)
+        ]
+    except (ValueError, TypeError, UnicodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_cursor(
+    stmt: Select, keys: Sequence[Any], cursor: Optional[str], limit: int
+) -> Select:
+    """
+    keys 내림차순 keyset pagination 적용
+    (k1, k2, ...) < cursor 조건이라 페이지 깊이와 무관하게 인덱스 범위 탐색만 수행
+    """
+    if cursor:
+        values = decode_cursor(cursor, [key.type.python_type for key in keys])
+        stmt = stmt.where(
+            tuple_(*keys)
+            < tuple_(*[literal(value, key.type) for key, value in zip(keys, values)])
+        )
+
+    return stmt.order_by(*[desc(key) for key in keys]).limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int, keys: Sequence[Any]) -> Optional[str]:
+    """
+    limit만큼 가득 찬 페이지일 때 마지막 항목 기준으로 다음 cursor 반환
+    """
+    if not items or len(items) < limit:
+        return None
+
+    last = items[-1]
+    return encode_cursor(*[getattr(last, key.key) for key in keys])
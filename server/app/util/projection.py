@@ -0,0 +1,38 @@
+from typing import List, Literal
+
+from app.models.content import Content
+from app.models.video_metadata import VideoMetadata
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+# 목록 응답 형태, summary는 post body 없이 목록 화면에 필요한 컬럼만
+ContentView = Literal["summary", "full"]
+
+
+def content_list_options(view: ContentView = "full") -> List[LoaderOption]:
+    """
+    콘텐츠 목록 조회용 loader option 반환
+    summary는 Content의 목록용 컬럼만 읽고 post_metadata(body) join을 생략
+    """
+    if view == "summary":
+        return [
+            load_only(
+                Content.id,
+                Content.url,
+                Content.title,
+                Content.description,
+                Content.bookmark,
+                Content.thumbnail,
+                Content.favicon,
+                Content.content_type,
+                Content.created_at,
+            ),
+            selectinload(Content.tags),
+            joinedload(Content.video_metadata).load_only(VideoMetadata.video_length),
+        ]
+
+    return [
+        selectinload(Content.tags),
+        joinedload(Content.video_metadata),
+        joinedload(Content.post_metadata),
+    ]
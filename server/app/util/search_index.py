@@ -0,0 +1,237 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Hangul 음절/자모, Hiragana/Katakana, CJK 한자: 공백 없이 이어지므로 n-gram으로 색인
+CJK_CHARS = (
+    r"\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3"  # Hangul
+    r"\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f"  # Hiragana, Katakana
+    r"\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"  # CJK 한자
+)
+_WORD_RE = re.compile(r"[^\W_]+")
+_SEGMENT_RE = re.compile(f"([{CJK_CHARS}]+)|([^{CJK_CHARS}]+)")
+
+# 색인 메모리 사용량 추정치 (token/posting/문서당 대략적인 Python 객체 크기)
+_TOKEN_BYTES = 96
+_DOC_BYTES = 256
+
+
+def _segments(text: str) -> Iterable[Tuple[bool, str]]:
+    """
+    NFKC 정규화 + 소문자 후 (CJK 여부, 연속 문자열) 단위로 분리
+    """
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    for word in _WORD_RE.findall(normalized):
+        for cjk, other in _SEGMENT_RE.findall(word):
+            yield (True, cjk) if cjk else (False, other)
+
+
+def index_tokens(*texts: str) -> Set[str]:
+    """
+    색인용 token: Latin 등은 단어, CJK는 글자(1-gram)와 bigram
+    """
+    tokens = set()
+    for text in texts:
+        for is_cjk, segment in _segments(text):
+            if not is_cjk:
+                tokens.add(segment)
+                continue
+
+            tokens.update(segment)
+            tokens.update(segment[i : i + 2] for i in range(len(segment) - 1))
+    return tokens
+
+
+def query_tokens(keyword: str) -> List[Tuple[str, bool]]:
+    """
+    검색어 token 목록 (token, prefix 매칭 여부)
+    입력 중인 단어도 찾도록 Latin 단어는 prefix, CJK는 bigram(한 글자면 1-gram) 정확히 매칭
+    """
+    tokens = []
+    for is_cjk, segment in _segments(keyword):
+        if not is_cjk:
+            tokens.append((segment, True))
+        elif len(segment) == 1:
+            tokens.append((segment, False))
+        else:
+            tokens.extend((segment[i : i + 2], False) for i in range(len(segment) - 1))
+    return tokens
+
+
+class IndexedTag(NamedTuple):
+    tagname: str
+
+
+class IndexedVideo(NamedTuple):
+    video_length: Optional[int]
+
+
+class IndexedPost(NamedTuple):
+    body: Optional[str]
+
+
+@dataclass
+class IndexedContent:
+    """
+    index에 함께 저장하는 목록용 필드 (Content 대신 content_item으로 바로 직렬화)
+    post body는 저장하지 않으므로 post_metadata는 view=full 검색 시에만 채움
+    """
+
+    id: int
+    url: str
+    title: str
+    description: Optional[str]
+    thumbnail: Optional[str]
+    favicon: Optional[str]
+    bookmark: bool
+    content_type: str
+    created_at: datetime
+    tags: List[IndexedTag]
+    video_metadata: Optional[IndexedVideo] = None
+    post_metadata: Optional[IndexedPost] = None
+
+    @property
+    def approx_bytes(self) -> int:
+        return _DOC_BYTES + sum(
+            len(text or "")
+            for text in (
+                self.url,
+                self.title,
+                self.description,
+                self.thumbnail,
+                self.favicon,
+            )
+        )
+
+
+class UserSearchIndex:
+    """
+    한 유저 라이브러리의 inverted index (token -> content id) + 목록용 필드
+    version은 마지막으로 반영한 library_versions.version, checked_at은 마지막 버전 확인 시각
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self.checked_at = 0.0
+        self.approx_bytes = 0
+        self._postings: Dict[str, Set[int]] = {}
+        # content id -> (token, 목록용 필드)
+        self._docs: Dict[int, Tuple[Set[str], IndexedContent]] = {}
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def get(self, content_id: int) -> Optional[IndexedContent]:
+        doc = self._docs.get(content_id)
+        return doc[1] if doc is not None else None
+
+    def add(self, content: IndexedContent) -> None:
+        self.remove(content.id)
+
+        tokens = index_tokens(
+            content.title,
+            content.description or "",
+            *(tag.tagname for tag in content.tags),
+        )
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                self._vocabulary = None
+            posting.add(content.id)
+
+        self._docs[content.id] = (tokens, content)
+        self.approx_bytes += content.approx_bytes + _TOKEN_BYTES * len(tokens)
+
+    def remove(self, content_id: int) -> None:
+        doc = self._docs.pop(content_id, None)
+        if doc is None:
+            return
+
+        tokens, content = doc
+        for token in tokens:
+            posting = self._postings[token]
+            posting.discard(content_id)
+            if not posting:
+                del self._postings[token]
+                self._vocabulary = None
+        self.approx_bytes -= content.approx_bytes + _TOKEN_BYTES * len(tokens)
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+
+        matches = set()
+        index = bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(
+            prefix
+        ):
+            matches |= self._postings[self._vocabulary[index]]
+            index += 1
+        return matches
+
+    def search(self, keyword: str) -> List[IndexedContent]:
+        """
+        모든 검색어 token을 포함하는 콘텐츠를 최신순(created_at, id 내림차순)으로 반환
+        """
+        tokens = query_tokens(keyword)
+        if not tokens:
+            return []
+
+        result: Optional[Set[int]] = None
+        for token, prefix in sorted(tokens, key=lambda item: item[1]):
+            matches = (
+                self._prefix_matches(token)
+                if prefix
+                else self._postings.get(token, set())
+            )
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+
+        contents = [self._docs[id_][1] for id_ in result]
+        return sorted(
+            contents, key=lambda content: (content.created_at, content.id), reverse=True
+        )
+
+
+class SearchIndexRegistry:
+    """
+    유저별 UserSearchIndex LRU, 추정 메모리 합이 max_bytes를 넘으면 오래 안 쓴 유저부터 제거
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._indexes: "OrderedDict[int, UserSearchIndex]" = OrderedDict()
+
+    @property
+    def approx_bytes(self) -> int:
+        return sum(index.approx_bytes for index in self._indexes.values())
+
+    def get(self, user_id: int) -> Optional[UserSearchIndex]:
+        index = self._indexes.get(user_id)
+        if index is not None:
+            self._indexes.move_to_end(user_id)
+        return index
+
+    def put(self, user_id: int, index: UserSearchIndex) -> None:
+        self._indexes[user_id] = index
+        self._indexes.move_to_end(user_id)
+        self.evict()
+
+    def discard(self, user_id: int) -> None:
+        self._indexes.pop(user_id, None)
+
+    def evict(self) -> None:
+        """
+        메모리 예산 초과 시 LRU 제거, 가장 최근에 쓴 index 하나는 남김
+        """
+        total = self.approx_bytes
+        while total > self.max_bytes and len(self._indexes) > 1:
+            _, evicted = self._indexes.popitem(last=False)
+            total -= evicted.approx_bytes
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Optional, Type
+
+from app.models.article import Article
+from app.models.content import Content, ContentTypeEnum
+from app.schemas.common import ContentResponseModel
+from app.util.projection import ContentView
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def content_item(
+    content: Content, model: Type[ContentResponseModel], view: ContentView = "full"
+) -> dict:
+    """
+    Content row -> model 형태의 dict, pydantic 모델 생성/검증 없이 필요한 필드만 채움
+    metadata는 noload라 join하지 않은 경우 None이므로 model 기본값 사용
+    view=summary는 post_metadata를 읽지 않으므로 body 필드 자체를 생략
+    """
+    item = {
+        "id": content.id,
+        "url": content.url,
+        "title": content.title,
+        "thumbnail": content.thumbnail,
+        "favicon": content.favicon,
+        "description": content.description,
+        "bookmark": content.bookmark,
+        "video_length": (
+            content.video_metadata.video_length
+            if content.video_metadata is not None
+            else 0
+        ),
+        "tags": [tag.tagname for tag in content.tags] if content.tags else [],
+        "created_at": content.created_at,
+    }
+    if view != "summary":
+        item["body"] = (
+            content.post_metadata.body if content.post_metadata is not None else ""
+        )
+    if "type" in model.model_fields:
+        item["type"] = ContentTypeEnum(content.content_type).value
+
+    return item
+
+
+def article_item(article: Article) -> dict:
+    """
+    Article row(user, tags 로드된 상태) -> ArticleModel 형태의 dict
+    """
+    return {
+        "id": article.id,
+        "user_id": article.user.id,
+        "user_name": article.user.username,
+        "user_profile_image": article.user.profile_image,
+        "title": article.title,
+        "body": article.body,
+        "encoded_content": article.encoded_content,
+        "up_count": article.up_count,
+        "down_count": article.down_count,
+        "tags": [tag.tagname for tag in article.tags],
+        "created_at": article.created_at,
+        "updated_at": article.updated_at,
+    }
+
+
+def dump_json(value: Any) -> bytes:
+    """
+    dict/list를 pydantic-core(Rust)로 한 번에 JSON bytes 직렬화 (datetime은 ISO 8601)
+    """
+    return to_json(value)
+
+
+def json_response(value: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    직렬화한 bytes를 그대로 응답으로 반환
+    Response를 반환하므로 FastAPI의 response_model 검증/jsonable_encoder 단계를 건너뜀
+    (response_model은 OpenAPI 문서용으로만 사용)
+    """
+    return Response(dump_json(value), media_type=JSON_MEDIA_TYPE, headers=headers)
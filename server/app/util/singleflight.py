@@ -0,0 +1,39 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    같은 key로 동시에 들어온 호출은 진행 중인 하나의 실행을 함께 기다림
+    결과와 예외 모두 공유하고, 끝나면 바로 제거 (결과를 저장하지 않음)
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights: Dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        -> (결과, 다른 호출의 실행을 공유했는지)
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.shared += 1
+        else:
+            self.calls += 1
+            flight = self._flights[key] = asyncio.ensure_future(func())
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+
+        # 한 호출자가 취소되어도 실행은 계속되고 다른 호출자는 결과를 받음
+        return await asyncio.shield(flight), shared
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
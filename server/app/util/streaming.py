@@ -0,0 +1,39 @@
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from app.db import async_session
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# server-side cursor에서 한 번에 가져올 row 수
+STREAM_BATCH_SIZE = 100
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    """
+    ?stream=1 또는 Accept: application/x-ndjson 요청인지 확인
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    rows: Callable[[AsyncSession], AsyncIterator[Any]],
+    to_item: Callable[[Any], Any],
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    row를 하나씩 직렬화해 한 줄씩 내려보내는 NDJSON 응답 생성
+    get_db 세션은 응답 전송 전에 닫히므로 스트림 전용 세션을 따로 연다
+    """
+
+    async def _iter_lines() -> AsyncIterator[bytes]:
+        async with async_session() as db:
+            async for row in rows(db):
+                yield to_json(to_item(row)) + b"\n"
+
+    return StreamingResponse(
+        _iter_lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers
+    )
@@ -0,0 +1,57 @@
+from typing import List, Optional
+
+import httpx
+from config import Settings, get_settings
+
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+
+
+class YouTubeClient:
+    """
+    YouTube Data API REST client (프로세스 전체에서 하나를 재사용)
+    discovery 문서/service 객체 없이 keep-alive 연결로 바로 호출, event loop를 막지 않음
+    client는 첫 요청 시 현재 event loop에서 생성하고 lifespan 종료 시 닫음
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = settings.YOUTUBE_API_KEY
+        self.timeout = httpx.Timeout(
+            settings.FETCH_TIMEOUT, connect=settings.FETCH_CONNECT_TIMEOUT
+        )
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=YOUTUBE_API_URL,
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def videos_list(self, video_ids: List[str], part: str) -> dict:
+        """
+        videos.list 응답(JSON) 반환, 실패 시 httpx.HTTPError
+        """
+        # api key는 query string 대신 header로 전달 (예외 메시지, access log에 남지 않도록)
+        response = await self.client.get(
+            "/videos",
+            params={"part": part, "id": ",".join(video_ids)},
+            headers={"X-Goog-Api-Key": self.api_key},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+youtube_client = YouTubeClient(get_settings())
@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "test_db"
 
     YOUTUBE_API_KEY: str = "REAL_YOUTUBE_API_KEY"
+    # 영상 조회를 모아 videos.list 한 번으로 보내기 전 대기 시간(초)
+    YOUTUBE_BATCH_WINDOW: float = 0.005
 
     GOOGLE_IOS_CLIENT_ID: str = "GOOGLE_IOS_CLIENT_ID"
     GOOGLE_ANDROID_CLIENT_ID: str = "GOOGLE_ANDROID_CLIENT_ID"
@@ -26,6 +28,57 @@ class Settings(BaseSettings):
     TEST_GOOGLE_ID_TOKEN: str = "TEST_GOOGLE_ID_TOKEN"
     TEST_GOOGLE_OAUTH_ID: str = "TEST_GOOGLE_OAUTH_ID"
 
+    # 응답 압축: 이보다 작은 body는 압축하지 않음, 압축 결과 캐시 최대 크기
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # 콘텐츠 검색 기본 모드 (like, trgm, fts), trgm 모드 기본 word_similarity 기준값
+    # fts는 공백 단위 토큰 매칭이라 한국어 부분 단어 검색이 안 되므로 mode=fts로 지정할 때만 사용
+    SEARCH_DEFAULT_MODE: str = "like"
+    SEARCH_TRGM_THRESHOLD: float = 0.5
+    # memory 검색 모드 유저별 index 메모리 예산(워커당, 추정치)
+    SEARCH_INDEX_MAX_BYTES: int = 64 * 1024 * 1024
+    # memory 검색 시 다른 워커의 변경을 확인(library_versions 조회)하는 최소 간격(초)
+    SEARCH_INDEX_CHECK_INTERVAL: float = 1.0
+    # 시작 시 검색 문서가 없는 콘텐츠의 문서 생성 (전체 스캔, fts 도입 시 워커 1개로 한 번만 실행)
+    SEARCH_BACKFILL_ON_STARTUP: bool = False
+
+    # 링크 분석용 외부 HTTP client: pool 크기, keep-alive, host별 동시 요청 수, timeout(초)
+    FETCH_MAX_CONNECTIONS: int = 100
+    FETCH_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    FETCH_KEEPALIVE_EXPIRY: float = 30.0
+    FETCH_MAX_CONNECTIONS_PER_HOST: int = 6
+    FETCH_TIMEOUT: float = 5.0
+    FETCH_CONNECT_TIMEOUT: float = 3.0
+    # 같은 host 요청 시작 최소 간격(초, 0이면 동시 요청 수만 제한), DNS 조회 결과 유지 시간(초)
+    FETCH_HOST_MIN_INTERVAL: float = 0.0
+    FETCH_DNS_TTL: float = 300.0
+    # body를 쓰지 않는 응답(리디렉션 등)도 이 크기(byte) 이하면 끝까지 읽어 keep-alive 연결 재사용
+    FETCH_DRAIN_MAX_BYTES: int = 64 * 1024
+    # 링크 분석 1건 전체(리디렉션 + 페이지 조회) 제한 시간
+    POST_ANALYZE_DEADLINE: float = 8.0
+    # 본문 없이 메타데이터만 추출할 때 </head>를 못 찾으면 여기까지만 받음 (byte)
+    POST_HEAD_MAX_BYTES: int = 256 * 1024
+    # 링크 분석 HTML parser: auto(selectolax 설치 시 사용, 없으면 bs4), selectolax, bs4
+    HTML_PARSER_BACKEND: str = "auto"
+
+    # 링크 분석 결과(title, thumbnail 등) 캐시 유지 시간(초), 메모리 상한(워커당, 추정치)
+    METADATA_CACHE_TTL: float = 6 * 60 * 60
+    METADATA_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # url_metadata 테이블 결과를 재검증(conditional GET) 없이 쓰는 기간(초)
+    METADATA_STALE_AFTER: float = 24 * 60 * 60
+    # 공유 링크(단축 URL, intent://) -> 최종 URL 캐시 유지 시간(초), 실패는 REDIRECT_NEGATIVE_TTL만 유지
+    REDIRECT_CACHE_TTL: float = 6 * 60 * 60
+    REDIRECT_NEGATIVE_TTL: float = 60.0
+    REDIRECT_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    # 일괄 분석 시 동시에 분석하는 포스트 URL 수 (host별 제한은 FETCH_MAX_CONNECTIONS_PER_HOST)
+    ANALYZE_BATCH_CONCURRENCY: int = 16
+    # 분석 실패 URL/host 재조회 대기: ANALYZE_BACKOFF_BASE * 2^(연속 실패 - 1)초, 최대 ANALYZE_BACKOFF_MAX초
+    # host는 연결 실패/시간 초과가 ANALYZE_HOST_FAILURE_THRESHOLD번 연속일 때부터 적용
+    ANALYZE_BACKOFF_BASE: float = 30.0
+    ANALYZE_BACKOFF_MAX: float = 60 * 60
+    ANALYZE_HOST_FAILURE_THRESHOLD: int = 3
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="allow"
     )